@@ -9,10 +9,13 @@ from app.services.calendar_service import add_calendar_entries, detect_conflicts
 class CalendarIntegrationAgent:
     """Integrates validated dates into the case calendar and checks for conflicts."""
 
-    def integrate(self, db: Session, case_id: str | None, dates: List[ExtractedDate]) -> List[str]:
+    def integrate(
+        self, db: Session, case_id: str | None, dates: List[ExtractedDate], document_id: str | None = None
+    ) -> List[str]:
         if not case_id:
             # Without a case context we cannot write calendar entries
             return []
-        add_calendar_entries(db, case_id, dates)
-        conflicts = detect_conflicts(db, case_id, dates)
+        # Check before writing so new dates are not reported against themselves
+        conflicts = detect_conflicts(db, case_id, dates, source_document=document_id)
+        add_calendar_entries(db, case_id, dates, source_document=document_id)
         return conflicts
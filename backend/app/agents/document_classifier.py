@@ -1,6 +1,5 @@
 from __future__ import annotations
 import os
-import base64
 import logging
 from typing import List, Optional
 
@@ -11,6 +10,11 @@ except Exception:  # pragma: no cover
 
 from app.models.schemas import DocumentClassification
 from app.core.config import settings
+from app.agents.local_classifier import get_local_classifier
+from app.services.llm_cache import cached_chat_completion
+from app.services.llm_client import get_openai_client
+from app.services.previews import as_data_urls
+from app.services.text_window import window_text
 
 ALLOWED_TYPES = [
     "court_order",
@@ -47,69 +51,59 @@ def _unknown_for_escalation() -> DocumentClassification:
     )
 
 
-def _encode_images_as_data_urls(image_paths: List[str], max_images: int = 2) -> List[str]:
-    data_urls: List[str] = []
-    for p in image_paths[:max_images]:
-        try:
-            with open(p, "rb") as f:
-                b64 = base64.b64encode(f.read()).decode("utf-8")
-            # best-effort mime guessing
-            ext = os.path.splitext(p)[1].lower().strip(".")
-            mime = {
-                "png": "image/png",
-                "jpg": "image/jpeg",
-                "jpeg": "image/jpeg",
-                "webp": "image/webp",
-                "tif": "image/tiff",
-                "tiff": "image/tiff",
-                "bmp": "image/bmp",
-            }.get(ext, "image/png")
-            data_urls.append(f"data:{mime};base64,{b64}")
-        except Exception:
-            # skip unreadable images
-            continue
-    return data_urls
-
-
 class DocumentClassificationAgent(Agent):
-    """LLM-backed document classification (escalates on failure, no heuristics).
+    """Document classification: the local n-gram model when confident, else the LLM
+    (escalates on failure, no heuristics).
 
     classify(text, images) -> DocumentClassification
     - text: extracted text from the document (OCR, PDF, DOCX, etc.)
-    - images: optional list of file paths for page images to give the LLM visual context (first N used)
+    - images: optional page previews (data URLs rendered once per document; file paths also accepted), first N used
     """
 
     def __init__(self) -> None:  # type: ignore[no-untyped-def]
-        # Lazy import to avoid hard dependency if not used
+        # Process-wide pooled client; None when no API key is configured
         self._openai_client = None
         try:
-            from openai import OpenAI  # type: ignore
-
-            # Prefer settings (loads from .env) and fall back to real env
-            api_key = settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
-            model = settings.OPENAI_MODEL or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-            if api_key:
-                self._openai_client = OpenAI(api_key=api_key)
-                logger.info(
-                    "DocumentClassifier initialized with OpenAI client | model=%s | api_key_source=%s",
-                    model,
-                    ("settings" if settings.OPENAI_API_KEY else "env"),
-                )
-            else:
+            self._openai_client = get_openai_client()
+            if self._openai_client is None:
                 logger.info("DocumentClassifier: no OPENAI_API_KEY; classification will escalate on use")
         except Exception as e:
             self._openai_client = None
             logger.warning("DocumentClassifier: failed to initialize OpenAI client; classification will escalate on use | error=%r", e)
 
     def classify(self, text: str, images: Optional[List[str]] = None) -> DocumentClassification:
+        # Offline model first; the LLM only sees documents it is unsure about
+        local = get_local_classifier()
+        if local is not None:
+            prediction = local.predict(text)
+            if prediction.confidence >= settings.LOCAL_CLASSIFIER_THRESHOLD and prediction.document_type in ALLOWED_TYPES:
+                logger.info(
+                    "Classifier branch: local | type=%s | confidence=%.2f",
+                    prediction.document_type,
+                    prediction.confidence,
+                )
+                return DocumentClassification(
+                    document_type=prediction.document_type,
+                    confidence_score=prediction.confidence,
+                    sub_type=None,
+                    jurisdiction=None,
+                    parties_involved=[],
+                    source="local",
+                )
+            logger.info(
+                "Classifier: local confidence below threshold -> LLM | type=%s | confidence=%.2f",
+                prediction.document_type,
+                prediction.confidence,
+            )
+
         # If no client or no API key, return unknown to escalate
         if not self._openai_client:
             logger.info("Classifier: no OpenAI client (no API key?) -> escalate")
             return _unknown_for_escalation()
 
         # Build multimodal prompt; keep within reasonable token budget
-        truncated_text = (text or "")[:12000]
-        data_urls = _encode_images_as_data_urls(images or []) if images else []
+        truncated_text = window_text(text, settings.CLASSIFIER_TEXT_TOKENS)
+        data_urls = as_data_urls(images)
         model = settings.OPENAI_MODEL or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
         logger.info(
             "Classifier branch: LLM | model=%s | text_len=%d | images=%d",
@@ -132,7 +126,8 @@ class DocumentClassificationAgent(Agent):
             {"type": "text", "text": (
                 "Task: Determine the document type and extract metadata.\n\n"
                 "Use both the extracted text and any provided page images.\n\n"
-                "Extracted text (may be partial):\n" + truncated_text
+                "Extracted text (may be partial; excerpts are labelled with page and character offsets):\n"
+                + truncated_text
             )}
         ]
         for url in data_urls:
@@ -141,14 +136,14 @@ class DocumentClassificationAgent(Agent):
         # Call OpenAI chat with a JSON-structured answer instruction
         try:
             # Prefer a small multimodal model if available
-            completion = self._openai_client.chat.completions.create(  # type: ignore[attr-defined]
+            content = cached_chat_completion(
+                self._openai_client,
                 model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_parts},
                 ],
             )
-            content = completion.choices[0].message.content or "{}"
             logger.debug("LLM raw response length=%d", len(content))
             logger.debug("LLM raw response: %s", content)
         except Exception as e:
@@ -189,6 +184,7 @@ class DocumentClassificationAgent(Agent):
                 sub_type=sub_type,
                 jurisdiction=jurisdiction,
                 parties_involved=parties,
+                source="llm",
             )
         except Exception as e:
             # Any parsing failure -> escalate
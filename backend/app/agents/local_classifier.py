@@ -0,0 +1,214 @@
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+_lvl_name = os.getenv("DOC_CLS_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_handler)
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9']+")
+DEFAULT_BUCKETS = 1 << 18
+
+
+def hashed_features(text: str, n_buckets: int, max_chars: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Word unigrams and bigrams of the document head, hashed into n_buckets.
+
+    Returns (bucket indices, L2-normalized log-count values). crc32 keeps buckets stable
+    across processes, unlike hash().
+    """
+    tokens = _TOKEN_RE.findall((text or "")[:max_chars].lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    if not grams:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    buckets = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.int64, count=len(grams)) % n_buckets
+    idx, counts = np.unique(buckets, return_counts=True)
+    values = np.log1p(counts).astype(np.float32)
+    values /= np.linalg.norm(values)
+    return idx, values
+
+
+@dataclass(frozen=True)
+class LocalPrediction:
+    document_type: str
+    confidence: float
+
+
+class HashedNgramClassifier:
+    """Multinomial logistic regression over hashed n-gram features (numpy only)."""
+
+    def __init__(
+        self,
+        classes: Sequence[str],
+        n_buckets: int = DEFAULT_BUCKETS,
+        max_chars: int = 6000,
+        weights: Optional[np.ndarray] = None,
+        bias: Optional[np.ndarray] = None,
+    ) -> None:
+        self.classes = list(classes)
+        self.n_buckets = n_buckets
+        self.max_chars = max_chars
+        self.weights = weights if weights is not None else np.zeros((n_buckets, len(self.classes)), dtype=np.float32)
+        self.bias = bias if bias is not None else np.zeros(len(self.classes), dtype=np.float32)
+
+    def _features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        return hashed_features(text, self.n_buckets, self.max_chars)
+
+    def _proba(self, idx: np.ndarray, values: np.ndarray) -> np.ndarray:
+        logits = values @ self.weights[idx] + self.bias
+        logits -= logits.max()
+        exp = np.exp(logits)
+        return exp / exp.sum()
+
+    def predict(self, text: str) -> LocalPrediction:
+        proba = self._proba(*self._features(text))
+        best = int(proba.argmax())
+        return LocalPrediction(self.classes[best], float(proba[best]))
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        n_buckets: int = DEFAULT_BUCKETS,
+        max_chars: int = 6000,
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 0,
+    ) -> "HashedNgramClassifier":
+        """SGD on the softmax loss; features are computed once and reused across epochs."""
+        model = cls(sorted(set(labels)), n_buckets=n_buckets, max_chars=max_chars)
+        index = {c: i for i, c in enumerate(model.classes)}
+        feats = [model._features(t) for t in texts]
+        targets = np.array([index[label] for label in labels])
+        rng = np.random.default_rng(seed)
+        for epoch in range(epochs):
+            lr = learning_rate / (1.0 + epoch)
+            for i in rng.permutation(len(feats)):
+                idx, values = feats[i]
+                grad = model._proba(idx, values)
+                grad[targets[i]] -= 1.0
+                rows = model.weights[idx]
+                model.weights[idx] = rows - lr * (np.outer(values, grad) + l2 * rows)
+                model.bias -= lr * grad
+        return model
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp,
+            classes=np.array(self.classes),
+            n_buckets=self.n_buckets,
+            max_chars=self.max_chars,
+            weights=self.weights,
+            bias=self.bias,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNgramClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                [str(c) for c in data["classes"]],
+                n_buckets=int(data["n_buckets"]),
+                max_chars=int(data["max_chars"]),
+                weights=data["weights"],
+                bias=data["bias"],
+            )
+
+
+def model_path() -> str:
+    return settings.LOCAL_CLASSIFIER_MODEL_PATH or os.path.join(settings.STORAGE_DIR, "local_classifier.npz")
+
+
+_lock = threading.Lock()
+_model: Optional[HashedNgramClassifier] = None
+_model_stamp: Optional[Tuple[str, int]] = None
+_digest: Optional[Tuple[Tuple[str, int, int], str]] = None
+
+
+def _file_digest(path: str) -> str:
+    """SHA-256 of the model file, recomputed only when its path, mtime or size changes."""
+    global _digest
+    st = os.stat(path)
+    stamp = (path, st.st_mtime_ns, st.st_size)
+    with _lock:
+        if _digest is not None and _digest[0] == stamp:
+            return _digest[1]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    with _lock:
+        _digest = (stamp, h.hexdigest())
+        return _digest[1]
+
+
+def model_version() -> str:
+    """Content identity of the deployed model plus threshold; "none" without one.
+
+    Hash-based, so copying, touching or redeploying identical weights keeps the identity.
+    """
+    if not settings.LOCAL_CLASSIFIER_ENABLED:
+        return "none"
+    try:
+        return f"{_file_digest(model_path())[:16]}:{settings.LOCAL_CLASSIFIER_THRESHOLD}"
+    except OSError:
+        return "none"
+
+
+def get_local_classifier() -> Optional[HashedNgramClassifier]:
+    """Process-wide model, reloaded when the file is replaced; None if disabled or untrained."""
+    global _model, _model_stamp
+    if not settings.LOCAL_CLASSIFIER_ENABLED:
+        return None
+    path = model_path()
+    try:
+        stamp = (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return None
+    with _lock:
+        if _model_stamp != stamp:
+            try:
+                _model = HashedNgramClassifier.load(path)
+                logger.info("Local classifier loaded | path=%s | classes=%d", path, len(_model.classes))
+            except Exception as e:
+                logger.warning("Local classifier unavailable: %r", e)
+                _model = None
+            _model_stamp = stamp
+        return _model
+
+
+def evaluate(
+    model: HashedNgramClassifier, texts: Sequence[str], labels: Sequence[str], threshold: float
+) -> dict:
+    """Held-out report: overall accuracy, and the share (and accuracy) of documents the
+    local model would answer without the LLM at `threshold`."""
+    predictions: List[LocalPrediction] = [model.predict(t) for t in texts]
+    total = len(predictions)
+    correct = sum(p.document_type == y for p, y in zip(predictions, labels))
+    accepted = [(p, y) for p, y in zip(predictions, labels) if p.confidence >= threshold]
+    accepted_correct = sum(p.document_type == y for p, y in accepted)
+    return {
+        "documents": total,
+        "threshold": threshold,
+        "accuracy": correct / total if total else 0.0,
+        "llm_calls_avoided": len(accepted),
+        "llm_call_reduction": len(accepted) / total if total else 0.0,
+        "accuracy_when_local": accepted_correct / len(accepted) if accepted else 0.0,
+    }
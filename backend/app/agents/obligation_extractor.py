@@ -1,8 +1,20 @@
 from __future__ import annotations
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 
+from app.core.config import settings
 from app.models.schemas import DocumentClassification, LegalObligation
+from app.services.date_engine import DateMatch, find_dates
+from app.services.keyword_index import keyword_index, register_keywords
+
+
+def _next_date(dates: List[DateMatch], start: int, end: int, max_chars: int) -> Optional[DateMatch]:
+    """First date stated after the phrase. Dates before it are usually the order's own
+    entry/issue date, which would put the deadline in the past."""
+    for d in dates:
+        if d.start >= start and d.start - end <= max_chars:
+            return d
+    return None
 
 
 class ObligationExtractorAgent:
@@ -14,19 +26,35 @@ class ObligationExtractorAgent:
     ]
 
     def extract(self, text: str, classification: DocumentClassification) -> List[LegalObligation]:
-        lower = text.lower()
+        """One obligation per key phrase. The due date is the first date stated after the phrase;
+        otherwise the phrase's default period from the document's first date (or today)."""
+        index = keyword_index(text)
         obligations: List[LegalObligation] = []
-        now = datetime.utcnow()
+        dates: Optional[List[DateMatch]] = None
         for phrase, days, owner in self.KEY_PHRASES:
-            if phrase in lower:
-                obligations.append(
-                    LegalObligation(
-                        description=phrase.title(),
-                        due_date=now + timedelta(days=days),
-                        responsible_party=owner,
-                        priority_level="high" if days <= 10 else "medium",
-                        associated_case="",
-                        source_document=classification.document_type,
-                    )
+            positions = index.positions(phrase)
+            if not positions:
+                continue
+            if dates is None:
+                dates = find_dates(text)
+            start = positions[0]
+            near = _next_date(dates, start, start + len(phrase), settings.OBLIGATION_ANCHOR_CHARS)
+            if near is not None:
+                due = near.value
+            else:
+                due = (dates[0].value if dates else datetime.utcnow()) + timedelta(days=days)
+            obligations.append(
+                LegalObligation(
+                    description=phrase.title(),
+                    due_date=due,
+                    responsible_party=owner,
+                    priority_level="high" if days <= 10 else "medium",
+                    associated_case="",
+                    source_document=classification.document_type,
+                    source_ref=f"chars {start}-{start + len(phrase)}",
                 )
+            )
         return obligations
+
+
+register_keywords(*(phrase for phrase, _, _ in ObligationExtractorAgent.KEY_PHRASES))
@@ -1,15 +1,20 @@
 from __future__ import annotations
 import os
-import re
 import json
-import base64
 import logging
-from datetime import datetime
-from dateutil import parser as dateparser
-from typing import List, Tuple, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional
 
 from app.models.schemas import ExtractedDate, LegalObligation
 from app.core.config import settings
+from app.services.llm_cache import cached_chat_completion
+from app.services.date_engine import parse_date
+from app.services.keyword_index import register_keywords
+from app.services.llm_client import get_openai_client
+from app.services.metrics import with_current_context
+from app.services.previews import as_data_urls
+from app.services.text_window import covered_chars, estimate_tokens, overlapping_chunks, window_text
 
 
 logger = logging.getLogger(__name__)
@@ -21,121 +26,214 @@ _lvl_name = os.getenv("PARSER_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper(
 logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
 
 
-def _encode_images_as_data_urls(image_paths: List[str], max_images: int = 2) -> List[str]:
-    data_urls: List[str] = []
-    for p in image_paths[:max_images]:
-        try:
-            with open(p, "rb") as f:
-                b64 = base64.b64encode(f.read()).decode("utf-8")
-            ext = os.path.splitext(p)[1].lower().strip(".")
-            mime = {
-                "png": "image/png",
-                "jpg": "image/jpeg",
-                "jpeg": "image/jpeg",
-                "webp": "image/webp",
-                "tif": "image/tiff",
-                "tiff": "image/tiff",
-                "bmp": "image/bmp",
-            }.get(ext, "image/png")
-            data_urls.append(f"data:{mime};base64,{b64}")
-        except Exception:
-            continue
-    return data_urls
+def merge_results(
+    results: List[Tuple[List[ExtractedDate], List[LegalObligation]]]
+) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    """Concatenate results, dropping dates/obligations an earlier result already found."""
+    dates: List[ExtractedDate] = []
+    obligations: List[LegalObligation] = []
+    seen_dates = set()
+    seen_obs = set()
+    for ds, obs in results:
+        for d in ds:
+            key = (d.date, d.date_type)
+            if key not in seen_dates:
+                seen_dates.add(key)
+                dates.append(d)
+        for o in obs:
+            key = (o.description.lower(), o.due_date)
+            if key not in seen_obs:
+                seen_obs.add(key)
+                obligations.append(o)
+    return dates, obligations
 
 
 class BaseParser:
     name = "base"
+    # Heuristic subclasses override this; the registry uses it to decide whether a
+    # speculative generic LLM result can stand in for this strategy.
+    uses_llm = True
+    # Heuristic keyword groups, matched through the shared keyword index
+    keywords: Dict[str, Tuple[str, ...]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for phrases in cls.keywords.values():
+            register_keywords(*phrases)
+
+    # LLM path; specialized parsers override the prompts and defaults
+    system_prompt = (
+        "You are a legal document parsing agent. Using the extracted text and any provided page images, "
+        "extract key dates and obligations from any legal document.\n\n"
+        "Return ONLY JSON with fields: \n"
+        "- dates: array of {date_iso (ISO8601), date_type (string), source_text}\n"
+        "- obligations: array of {description, due_date_iso (ISO8601), responsible_party, priority_level}\n\n"
+        "Rules: \n"
+        "- Only include an obligation if a due_date is explicitly present; otherwise omit it.\n"
+        "- Keep types concise (e.g., hearing, trial, deposition, deadline, mediation, appointment).\n"
+        "- Do not hallucinate. If not sure, leave arrays empty.\n"
+    )
+    task_prompt = "Task: Extract dates and obligations, if present."
+    llm_confidence = 0.7
+    default_priority = "medium"
 
     def parse(self, text: str, images: Optional[List[str]] = None) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
         # LLM-first generic extraction
         try:
-            image_urls = _encode_images_as_data_urls(images or []) if images else []
-            system_prompt = (
-                "You are a legal document parsing agent. Using the extracted text and any provided page images, "
-                "extract key dates and obligations from any legal document.\n\n"
-                "Return ONLY JSON with fields: \n"
-                "- dates: array of {date_iso (ISO8601), date_type (string), source_text}\n"
-                "- obligations: array of {description, due_date_iso (ISO8601), responsible_party, priority_level}\n\n"
-                "Rules: \n"
-                "- Only include an obligation if a due_date is explicitly present; otherwise omit it.\n"
-                "- Keep types concise (e.g., hearing, trial, deposition, deadline, mediation, appointment).\n"
-                "- Do not hallucinate. If not sure, leave arrays empty.\n"
-            )
-            user_parts: List[dict] = [
-                {"type": "text", "text": (
-                    "Task: Extract dates and obligations, if present.\n\n"
-                    "Extracted text (may be partial):\n" + (text or "")[:12000]
-                )}
-            ]
-            for url in image_urls:
-                user_parts.append({"type": "image_url", "image_url": {"url": url}})
-
-            data = self._llm_json(system_prompt, user_parts)
-            if data is not None:
-                out_dates: List[ExtractedDate] = []
-                out_obs: List[LegalObligation] = []
-                for d in data.get("dates", []) or []:
-                    try:
-                        when = dateparser.parse(str(d.get("date_iso")), fuzzy=True)
-                        dtype = str(d.get("date_type") or "deadline")
-                        out_dates.append(
-                            ExtractedDate(
-                                date=when,
-                                date_type=dtype,
-                                confidence_score=0.7,
-                                source_text=str(d.get("source_text") or "base parser llm"),
-                                jurisdiction=None,
-                            )
-                        )
-                    except Exception:
-                        continue
-                for o in data.get("obligations", []) or []:
-                    try:
-                        due = dateparser.parse(str(o.get("due_date_iso")), fuzzy=True)
-                    except Exception:
-                        continue
-                    desc = str(o.get("description") or "")
-                    if not desc:
-                        continue
-                    out_obs.append(
-                        LegalObligation(
-                            description=desc,
-                            due_date=due,
-                            responsible_party=str(o.get("responsible_party") or "Attorney"),
-                            priority_level=str(o.get("priority_level") or "medium"),
-                            associated_case="",
-                            source_document=self.name,
-                        )
-                    )
-                logger.info("BaseParser LLM result | dates=%d | obligations=%d", len(out_dates), len(out_obs))
-                return out_dates, out_obs
+            result = self._llm_extract(text, images)
+            if result is not None:
+                logger.info("BaseParser LLM result | dates=%d | obligations=%d", len(result[0]), len(result[1]))
+                return result
         except Exception as e:
             logger.warning("BaseParser: LLM call/parse failed -> escalate | error=%r", e)
         logger.info("BaseParser: returning empty to trigger human escalation")
         return [], []
 
+    def _llm_extract(
+        self, text: str, images: Optional[List[str]] = None
+    ) -> Optional[Tuple[List[ExtractedDate], List[LegalObligation]]]:
+        """Dates and obligations from the LLM, or None when no call succeeded.
+
+        Text beyond PARSER_TEXT_TOKENS is reduced to a relevance-ranked window; with
+        PARSER_MAP_REDUCE on it is instead split into overlapping chunks (at most
+        PARSER_MAX_CHUNKS) that are extracted concurrently and merged.
+        """
+        image_urls = as_data_urls(images)
+        if not settings.PARSER_MAP_REDUCE or estimate_tokens(text or "") <= settings.PARSER_TEXT_TOKENS:
+            excerpt = window_text(text, settings.PARSER_TEXT_TOKENS)
+            data = self._llm_json(self.system_prompt, self._user_parts(excerpt, image_urls))
+            return None if data is None else self._from_llm_data(data)
+        return self._map_reduce(text, image_urls)
+
+    def _map_reduce(
+        self, text: str, image_urls: List[str]
+    ) -> Optional[Tuple[List[ExtractedDate], List[LegalObligation]]]:
+        chunks = overlapping_chunks(text, settings.PARSER_CHUNK_TOKENS, settings.PARSER_CHUNK_OVERLAP_TOKENS)
+        found = len(chunks)
+        skipped_chars = 0
+        if settings.PARSER_MAX_CHUNKS and found > settings.PARSER_MAX_CHUNKS:
+            # Safety cap only: dates in the dropped chunks are lost, so say how much was skipped
+            chunks = overlapping_chunks(
+                text,
+                settings.PARSER_CHUNK_TOKENS,
+                settings.PARSER_CHUNK_OVERLAP_TOKENS,
+                max_chunks=settings.PARSER_MAX_CHUNKS,
+            )
+            skipped_chars = len(text) - covered_chars(chunks)
+            logger.warning(
+                "Parser map-reduce capped | parser=%s | chunks=%d | skipped_chunks=%d | skipped_chars=%d | max_chunks=%d",
+                self.name,
+                found,
+                found - len(chunks),
+                skipped_chars,
+                settings.PARSER_MAX_CHUNKS,
+            )
+        total = len(chunks)
+
+        def _map(index: int) -> Optional[Tuple[List[ExtractedDate], List[LegalObligation]]]:
+            chunk = chunks[index]
+            # Page previews only accompany the chunk that covers the first pages
+            parts = self._user_parts(f"{chunk.header()}\n{chunk.text}", image_urls if index == 0 else [])
+            data = self._llm_json(self.system_prompt, parts)
+            if data is None:
+                return None
+            return self._from_llm_data(data, source_ref=f"chunk {index + 1}/{total} {chunk.header()}")
+
+        started = time.perf_counter()
+        workers = max(1, min(total, settings.PARSER_CHUNK_CONCURRENCY))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.name}-chunk") as pool:
+            mapped = list(pool.map(with_current_context(_map), range(total)))
+        usable = [m for m in mapped if m is not None]
+        logger.info(
+            "Parser map-reduce | parser=%s | chunks=%d | mapped=%d | failed=%d | skipped_chars=%d | workers=%d | elapsed_ms=%.1f",
+            self.name,
+            found,
+            total,
+            total - len(usable),
+            skipped_chars,
+            workers,
+            (time.perf_counter() - started) * 1000,
+        )
+        if not usable:
+            return None
+        # Chunks are in document order, so overlapping duplicates keep the earliest chunk's provenance
+        return merge_results(usable)
+
+    def _user_parts(self, excerpt: str, image_urls: List[str]) -> List[dict]:
+        user_parts: List[dict] = [
+            {"type": "text", "text": (
+                self.task_prompt + "\n\n"
+                "Extracted text (may be partial; excerpts are labelled with page and character offsets):\n"
+                + excerpt
+            )}
+        ]
+        for url in image_urls:
+            user_parts.append({"type": "image_url", "image_url": {"url": url}})
+        return user_parts
+
+    def _from_llm_data(
+        self, data: dict, source_ref: Optional[str] = None
+    ) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+        out_dates: List[ExtractedDate] = []
+        out_obs: List[LegalObligation] = []
+        for d in data.get("dates", []) or []:
+            try:
+                when = parse_date(str(d.get("date_iso")))
+                if when is None:
+                    continue
+                dtype = str(d.get("date_type") or "deadline")
+                out_dates.append(
+                    ExtractedDate(
+                        date=when,
+                        date_type=dtype,
+                        confidence_score=self.llm_confidence,
+                        source_text=str(d.get("source_text") or f"{self.name} parser llm"),
+                        jurisdiction=None,
+                        source_ref=source_ref,
+                    )
+                )
+            except Exception:
+                continue
+        for o in data.get("obligations", []) or []:
+            due = parse_date(str(o.get("due_date_iso")))
+            if due is None:
+                continue
+            desc = str(o.get("description") or "")
+            if not desc:
+                continue
+            out_obs.append(
+                LegalObligation(
+                    description=desc,
+                    due_date=due,
+                    responsible_party=str(o.get("responsible_party") or "Attorney"),
+                    priority_level=str(o.get("priority_level") or self.default_priority),
+                    associated_case="",
+                    source_document=self.name,
+                    source_ref=source_ref,
+                )
+            )
+        return out_dates, out_obs
+
     def _llm_json(self, system_prompt: str, user_parts: List[dict]) -> Optional[dict]:
         """Call OpenAI chat with structured JSON response. Returns dict or None on failure."""
+        model = settings.OPENAI_MODEL or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
         try:
-            from openai import OpenAI  # type: ignore
+            client = get_openai_client()
         except Exception as e:  # pragma: no cover
-            logger.info("Parser LLM unavailable (openai import failed): %r", e)
+            logger.info("Parser LLM unavailable (client init failed): %r", e)
             return None
-
-        api_key = settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
-        model = settings.OPENAI_MODEL or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        if not api_key:
+        if client is None:
             logger.info("Parser LLM not configured (no OPENAI_API_KEY)")
             return None
 
         try:
-            client = OpenAI(api_key=api_key)  # type: ignore
             # diagnostics
             text_part = next((p for p in user_parts if p.get("type") == "text"), None)
             text_len = len(text_part.get("text", "")) if isinstance(text_part, dict) else 0
             img_count = sum(1 for p in user_parts if p.get("type") == "image_url")
             logger.info("Parser LLM call | model=%s | text_len=%d | images=%d", model, text_len, img_count)
-            completion = client.chat.completions.create(
+            content = cached_chat_completion(
+                client,
                 model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -143,7 +241,6 @@ class BaseParser:
                 ],
                 response_format={"type": "json_object"},
             )
-            content = completion.choices[0].message.content or "{}"
             logger.debug("Parser LLM raw response: %s", content)
         except Exception as e:
             logger.warning("Parser LLM call failed: %r", e)
@@ -154,13 +251,3 @@ class BaseParser:
         except Exception as e:
             logger.warning("Parser LLM JSON parse failed: %r", e)
             return None
-
-    @staticmethod
-    def _find_dates(text: str) -> List[datetime]:
-        dates = []
-        for match in re.finditer(r"\b(?:\d{1,2}/\d{1,2}/\d{2,4}|\w+ \d{1,2}, \d{4})\b", text):
-            try:
-                dates.append(dateparser.parse(match.group(0), fuzzy=True))
-            except Exception:
-                continue
-        return dates
@@ -1,29 +1,37 @@
 from __future__ import annotations
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.models.schemas import ExtractedDate, LegalObligation
+from app.services.date_engine import find_dates
+from app.services.keyword_index import keyword_index
 from .base_parser import BaseParser
 
 
 class DiscoveryParser(BaseParser):
     name = "discovery"
+    uses_llm = False
+    keywords = {
+        "deposition": ("deposition",),
+        "requests": ("interrogatories", "requests for production", "admissions"),
+    }
 
-    def parse(self, text: str) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    def parse(self, text: str, images: Optional[List[str]] = None) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
         dates: List[ExtractedDate] = []
         obligations: List[LegalObligation] = []
-        lower = text.lower()
-        for dt in self._find_dates(text):
-            dtype = "deposition" if "deposition" in lower else "production_deadline"
+        index = keyword_index(text)
+        dtype = "deposition" if index.has(*self.keywords["deposition"]) else "production_deadline"
+        for match in find_dates(text):
             dates.append(
                 ExtractedDate(
-                    date=dt,
+                    date=match.value,
                     date_type=dtype,
                     confidence_score=0.6,
                     source_text="discovery parser heuristic",
                     jurisdiction=None,
+                    source_ref=match.span_ref,
                 )
             )
-        if any(k in lower for k in ["interrogatories", "requests for production", "admissions"]) and dates:
+        if index.has(*self.keywords["requests"]) and dates:
             obligations.append(
                 LegalObligation(
                     description="Respond to discovery",
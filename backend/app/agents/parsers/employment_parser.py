@@ -1,29 +1,37 @@
 from __future__ import annotations
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.models.schemas import ExtractedDate, LegalObligation
+from app.services.date_engine import find_dates
+from app.services.keyword_index import keyword_index
 from .base_parser import BaseParser
 
 
 class EmploymentParser(BaseParser):
     name = "employment"
+    uses_llm = False
+    keywords = {
+        "work": ("worked", "shift", "timecard"),
+        "rtw": ("return to work", "rtw"),
+    }
 
-    def parse(self, text: str) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    def parse(self, text: str, images: Optional[List[str]] = None) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
         dates: List[ExtractedDate] = []
         obligations: List[LegalObligation] = []
-        lower = text.lower()
-        for dt in self._find_dates(text):
-            dtype = "work_date" if any(k in lower for k in ["worked", "shift", "timecard"]) else "deadline"
+        index = keyword_index(text)
+        dtype = "work_date" if index.has(*self.keywords["work"]) else "deadline"
+        for match in find_dates(text):
             dates.append(
                 ExtractedDate(
-                    date=dt,
+                    date=match.value,
                     date_type=dtype,
                     confidence_score=0.6,
                     source_text="employment parser heuristic",
                     jurisdiction=None,
+                    source_ref=match.span_ref,
                 )
             )
-        if ("return to work" in lower or "rtw" in lower) and dates:
+        if index.has(*self.keywords["rtw"]) and dates:
             obligations.append(
                 LegalObligation(
                     description="Confirm return-to-work date",
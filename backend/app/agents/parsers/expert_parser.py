@@ -1,29 +1,37 @@
 from __future__ import annotations
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.models.schemas import ExtractedDate, LegalObligation
+from app.services.date_engine import find_dates
+from app.services.keyword_index import keyword_index
 from .base_parser import BaseParser
 
 
 class ExpertParser(BaseParser):
     name = "expert"
+    uses_llm = False
+    keywords = {
+        "report": ("report", "disclosure"),
+        "expert": ("expert", "witness"),
+    }
 
-    def parse(self, text: str) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    def parse(self, text: str, images: Optional[List[str]] = None) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
         dates: List[ExtractedDate] = []
         obligations: List[LegalObligation] = []
-        lower = text.lower()
-        for dt in self._find_dates(text):
-            dtype = "report_deadline" if any(k in lower for k in ["report", "disclosure"]) else "deadline"
+        index = keyword_index(text)
+        dtype = "report_deadline" if index.has(*self.keywords["report"]) else "deadline"
+        for match in find_dates(text):
             dates.append(
                 ExtractedDate(
-                    date=dt,
+                    date=match.value,
                     date_type=dtype,
                     confidence_score=0.6,
                     source_text="expert parser heuristic",
                     jurisdiction=None,
+                    source_ref=match.span_ref,
                 )
             )
-        if any(k in lower for k in ["expert", "witness"]) and dates:
+        if index.has(*self.keywords["expert"]) and dates:
             obligations.append(
                 LegalObligation(
                     description="Serve expert disclosures",
@@ -1,29 +1,38 @@
 from __future__ import annotations
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.models.schemas import ExtractedDate, LegalObligation
+from app.services.date_engine import find_dates
+from app.services.keyword_index import keyword_index
 from .base_parser import BaseParser
 
 
 class InsuranceParser(BaseParser):
     name = "insurance"
+    uses_llm = False
+    keywords = {
+        "response": ("respond", "response"),
+        "policy": ("policy",),
+        "limit": ("limit",),
+    }
 
-    def parse(self, text: str) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    def parse(self, text: str, images: Optional[List[str]] = None) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
         dates = []
         obligations = []
-        lower = text.lower()
-        for dt in self._find_dates(text):
-            dtype = "deadline" if "respond" in lower or "response" in lower else "coverage_date"
+        index = keyword_index(text)
+        dtype = "deadline" if index.has(*self.keywords["response"]) else "coverage_date"
+        for match in find_dates(text):
             dates.append(
                 ExtractedDate(
-                    date=dt,
+                    date=match.value,
                     date_type=dtype,
                     confidence_score=0.6,
                     source_text="insurance parser heuristic",
                     jurisdiction=None,
+                    source_ref=match.span_ref,
                 )
             )
-        if "policy" in lower and "limit" in lower and dates:
+        if index.has(*self.keywords["policy"]) and index.has(*self.keywords["limit"]) and dates:
             obligations.append(
                 LegalObligation(
                     description="Confirm policy limits",
@@ -1,29 +1,37 @@
 from __future__ import annotations
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.models.schemas import ExtractedDate, LegalObligation
+from app.services.date_engine import find_dates
+from app.services.keyword_index import keyword_index
 from .base_parser import BaseParser
 
 
 class MedicalParser(BaseParser):
     name = "medical"
+    uses_llm = False
+    keywords = {
+        "appointment": ("appointment", "visit"),
+        "mmi": ("mmi", "maximum medical improvement"),
+    }
 
-    def parse(self, text: str) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    def parse(self, text: str, images: Optional[List[str]] = None) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
         dates = []
         obligations = []
-        lower = text.lower()
-        for dt in self._find_dates(text):
-            dtype = "appointment" if any(w in lower for w in ["appointment", "visit"]) else "treatment"
+        index = keyword_index(text)
+        dtype = "appointment" if index.has(*self.keywords["appointment"]) else "treatment"
+        for match in find_dates(text):
             dates.append(
                 ExtractedDate(
-                    date=dt,
+                    date=match.value,
                     date_type=dtype,
                     confidence_score=0.6,
                     source_text="medical parser heuristic",
                     jurisdiction=None,
+                    source_ref=match.span_ref,
                 )
             )
-        if ("mmi" in lower or "maximum medical improvement" in lower) and dates:
+        if index.has(*self.keywords["mmi"]) and dates:
             # add a placeholder obligation
             obligations.append(
                 LegalObligation(
@@ -1,29 +1,37 @@
 from __future__ import annotations
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.models.schemas import ExtractedDate, LegalObligation
+from app.services.date_engine import find_dates
+from app.services.keyword_index import keyword_index
 from .base_parser import BaseParser
 
 
 class PoliceParser(BaseParser):
     name = "police"
+    uses_llm = False
+    keywords = {
+        "incident": ("incident", "collision", "accident"),
+        "report": ("police report", "officer", "case number", "citation"),
+    }
 
-    def parse(self, text: str) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    def parse(self, text: str, images: Optional[List[str]] = None) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
         dates: List[ExtractedDate] = []
         obligations: List[LegalObligation] = []
-        lower = text.lower()
-        for dt in self._find_dates(text):
-            dtype = "incident_date" if any(k in lower for k in ["incident", "collision", "accident"]) else "date"
+        index = keyword_index(text)
+        dtype = "incident_date" if index.has(*self.keywords["incident"]) else "date"
+        for match in find_dates(text):
             dates.append(
                 ExtractedDate(
-                    date=dt,
+                    date=match.value,
                     date_type=dtype,
                     confidence_score=0.6,
                     source_text="police parser heuristic",
                     jurisdiction=None,
+                    source_ref=match.span_ref,
                 )
             )
-        if any(k in lower for k in ["police report", "officer", "case number", "citation"]):
+        if index.has(*self.keywords["report"]):
             # Usually review, obtain or authenticate police report
             if dates:
                 obligations.append(
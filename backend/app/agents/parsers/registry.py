@@ -0,0 +1,166 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.models.schemas import ExtractedDate, LegalObligation
+from app.services.metrics import with_current_context
+from .base_parser import BaseParser, merge_results
+from .court_parser import CourtParser
+from .discovery_parser import DiscoveryParser
+from .employment_parser import EmploymentParser
+from .expert_parser import ExpertParser
+from .insurance_parser import InsuranceParser
+from .medical_parser import MedicalParser
+from .police_parser import PoliceParser
+from .settlement_parser import SettlementParser
+
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("PARSER_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+
+@dataclass
+class ParseOutcome:
+    dates: List[ExtractedDate] = field(default_factory=list)
+    obligations: List[LegalObligation] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)  # parser name -> seconds
+
+
+class ParserRegistry:
+    """Maps document types to parser instances (strategies) built once per process.
+
+    Every parser follows the same parse(text, images) contract. When a type has several
+    strategies (e.g. heuristic plus LLM) they run concurrently and their results are merged.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self._parsers: Dict[str, List[BaseParser]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parser")
+
+    def register(self, document_type: str, *parsers: BaseParser) -> None:
+        self._parsers.setdefault(document_type, []).extend(parsers)
+
+    def supports(self, document_type: str) -> bool:
+        return bool(self._parsers.get(document_type))
+
+    def parsers_for(self, document_type: str) -> List[BaseParser]:
+        return list(self._parsers.get(document_type, []))
+
+    def accepts_speculative(self, document_type: str, accept_speculative: bool = False) -> bool:
+        """Whether a speculative generic result would be used for document_type.
+
+        Only types with at least one LLM strategy use it, and every one of those must be
+        replaceable: the generic BaseParser, or any parser with accept_speculative.
+        Unsupported types escalate, and heuristic-only types never call the LLM, so
+        neither uses it.
+        """
+        llm_parsers = [p for p in self.parsers_for(document_type) if p.uses_llm]
+        if not llm_parsers:
+            return False
+        return all(type(p) is BaseParser or accept_speculative for p in llm_parsers)
+
+    def speculation_useful(self, accept_types: Set[str]) -> bool:
+        """Whether any registered type would use a speculative result; when none would,
+        speculating only spends LLM calls."""
+        return any(self.accepts_speculative(t, t in accept_types) for t in self._parsers)
+
+    def _run(self, parser: BaseParser, text: str, images: Optional[List[str]]):
+        started = time.perf_counter()
+        try:
+            dates, obs = parser.parse(text, images=images)
+        except Exception as e:
+            logger.warning("Parser %s failed: %r", parser.name, e)
+            dates, obs = [], []
+        return dates, obs, time.perf_counter() - started
+
+    def parse(
+        self,
+        document_type: str,
+        text: str,
+        images: Optional[List[str]] = None,
+        speculative: Optional[Tuple[List[ExtractedDate], List[LegalObligation]]] = None,
+        accept_speculative: bool = False,
+    ) -> ParseOutcome:
+        """Run the strategies registered for document_type and merge their results.
+
+        `speculative` is a generic LLM result computed while classification was in flight.
+        When accepts_speculative() holds it stands in for the type's LLM strategies and is
+        merged alongside the heuristic ones; otherwise it is dropped. Unsupported types
+        return an empty outcome either way so the document escalates.
+        """
+        parsers = self.parsers_for(document_type)
+        runs: List[Tuple[str, List[ExtractedDate], List[LegalObligation], float]] = []
+        if speculative is not None:
+            if self.accepts_speculative(document_type, accept_speculative):
+                parsers = [p for p in parsers if not p.uses_llm]
+                runs.append(("base(speculative)", speculative[0], speculative[1], 0.0))
+            else:
+                logger.info("Parser: discarding speculative result | type=%s", document_type)
+        if not parsers and not runs:
+            return ParseOutcome()
+
+        if len(parsers) == 1:
+            results = [self._run(parsers[0], text, images)]
+        else:
+            run = with_current_context(self._run)
+            futures = [self._executor.submit(run, p, text, images) for p in parsers]
+            results = [f.result() for f in futures]
+        runs.extend((p.name, d, o, elapsed) for p, (d, o, elapsed) in zip(parsers, results))
+
+        timings: Dict[str, float] = {}
+        for name, dates, obs, elapsed in runs:
+            timings[name] = elapsed
+            logger.info(
+                "Parser result | type=%s | parser=%s | dates=%d | obligations=%d | elapsed_ms=%.1f",
+                document_type,
+                name,
+                len(dates),
+                len(obs),
+                elapsed * 1000,
+            )
+        dates, obligations = merge_results([(d, o) for _, d, o, _ in runs])
+        return ParseOutcome(dates=dates, obligations=obligations, timings=timings)
+
+
+def build_default_registry() -> ParserRegistry:
+    registry = ParserRegistry()
+    registry.register("court_order", CourtParser())
+    registry.register("insurance_correspondence", InsuranceParser())
+    registry.register("medical_records", MedicalParser())
+    registry.register("settlement_communication", SettlementParser())
+    registry.register("discovery_request", DiscoveryParser())
+    registry.register("employment_records", EmploymentParser())
+    registry.register("expert_witness_report", ExpertParser())
+    registry.register("police_report", PoliceParser())
+
+    llm_types = {t.strip() for t in (settings.PARSER_LLM_STRATEGY_TYPES or "").split(",") if t.strip()}
+    if llm_types:
+        generic = BaseParser()
+        for document_type in sorted(llm_types):
+            if registry.supports(document_type):
+                registry.register(document_type, generic)
+    return registry
+
+
+_registry: Optional[ParserRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_parser_registry() -> ParserRegistry:
+    """Process-wide registry; parsers are constructed on first use in each worker."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = build_default_registry()
+        return _registry
@@ -1,29 +1,37 @@
 from __future__ import annotations
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.models.schemas import ExtractedDate, LegalObligation
+from app.services.date_engine import find_dates
+from app.services.keyword_index import keyword_index
 from .base_parser import BaseParser
 
 
 class SettlementParser(BaseParser):
     name = "settlement"
+    uses_llm = False
+    keywords = {
+        "mediation": ("mediation",),
+        "offer": ("offer", "demand"),
+    }
 
-    def parse(self, text: str) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    def parse(self, text: str, images: Optional[List[str]] = None) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
         dates: List[ExtractedDate] = []
         obligations: List[LegalObligation] = []
-        lower = text.lower()
-        for dt in self._find_dates(text):
-            dtype = "mediation" if "mediation" in lower else "deadline"
+        index = keyword_index(text)
+        dtype = "mediation" if index.has(*self.keywords["mediation"]) else "deadline"
+        for match in find_dates(text):
             dates.append(
                 ExtractedDate(
-                    date=dt,
+                    date=match.value,
                     date_type=dtype,
                     confidence_score=0.6,
                     source_text="settlement parser heuristic",
                     jurisdiction=None,
+                    source_ref=match.span_ref,
                 )
             )
-        if ("offer" in lower or "demand" in lower) and dates:
+        if index.has(*self.keywords["offer"]) and dates:
             obligations.append(
                 LegalObligation(
                     description="Evaluate settlement offer",
@@ -1,6 +1,8 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
-from app.models.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.database import AsyncSessionLocal, SessionLocal
 
 
 def get_db() -> Generator:
@@ -9,3 +11,13 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """For long-lived responses (event streams) that open short sessions as they go."""
+    return AsyncSessionLocal
@@ -0,0 +1,79 @@
+from __future__ import annotations
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.exceptions import UploadTooLargeException
+
+# Multipart framing and form fields on top of the file bytes
+_MULTIPART_SLACK = 1024 * 1024
+
+
+def _limit_for(path: str) -> Optional[int]:
+    if path.endswith("/documents/upload"):
+        return settings.UPLOAD_MAX_BYTES + _MULTIPART_SLACK
+    if path.endswith("/documents/batch"):
+        return settings.UPLOAD_MAX_BATCH_BYTES
+    return None
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized upload bodies before the multipart parser spools them.
+
+    A declared Content-Length over the limit is answered with 413 straight away; bodies
+    without one (chunked) are counted as they stream. Once the count passes the limit the
+    app's receive() fails, and whatever the app then answers (the form parser turns the
+    error into a 400) is replaced with the 413.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+        limit = _limit_for(scope.get("path", ""))
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            response = JSONResponse({"detail": f"Upload exceeds the {limit} byte limit"}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+        overflowed = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, overflowed
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    overflowed = True
+                    raise UploadTooLargeException(f"Upload exceeds the {limit} byte limit")
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if overflowed and not response_started:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not overflowed or response_started:
+                raise
+        if overflowed and not response_started:
+            response = JSONResponse({"detail": f"Upload exceeds the {limit} byte limit"}, status_code=413)
+            await response(scope, receive, send)
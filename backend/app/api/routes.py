@@ -1,20 +1,51 @@
 import os
-import shutil
 import uuid
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, Form
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, Form
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.api.dependencies import get_db
+from app.api.dependencies import get_async_db, get_async_sessionmaker, get_db
+from app.api.conditional import is_not_modified, json_payload_response, make_etag, not_modified_response
+from app.api.pagination import decode_cursor, encode_cursor
 from app.core.config import settings
 from app.models import schemas
-from app.models.database import Document, CalendarEvent
-from app.services.document_processor import process_document_task
+from app.models.database import Document, DocumentBatch, CalendarEvent, CaseCalendarVersion
+from app.services.calendar_service import ConflictChecker, bump_calendar_version
+from app.services.document_processor import dispatch_document, dispatch_documents
+from app.services.llm_cache import get_llm_cache
+from app.services.response_cache import calendar_key, get_response_cache, invalidate_document, result_key
+from app.services.status_events import (
+    TERMINAL_STATUSES,
+    batch_channel,
+    case_channel,
+    document_channel,
+    sse_stream,
+)
+from app.services.uploads import StoredUpload, stream_upload
 
 router = APIRouter()
 
 
+async def _store_upload(file: UploadFile, doc_id: str) -> StoredUpload:
+    dest_path = os.path.join(settings.UPLOAD_DIR, f"{doc_id}_{file.filename}")
+    return await stream_upload(file, dest_path, settings.UPLOAD_MAX_BYTES)
+
+
+def _remove_files(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
 @router.post("/documents/upload", response_model=schemas.ProcessingResult)
 async def upload_document(
     file: UploadFile = File(...),
@@ -23,23 +54,24 @@ async def upload_document(
 ):
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
     doc_id = str(uuid.uuid4())
-    dest_path = os.path.join(settings.UPLOAD_DIR, f"{doc_id}_{file.filename}")
-    with open(dest_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    stored = await _store_upload(file, doc_id)
 
     # Create DB record
     db_doc = Document(
         id=doc_id,
         filename=file.filename,
-        path=dest_path,
+        path=stored.path,
         case_id=case_id,
         status="queued",
+        content_sha256=stored.sha256,
+        size_bytes=stored.size,
+        mime_type=stored.mime_type,
     )
     db.add(db_doc)
-    db.commit()
+    await run_in_threadpool(db.commit)
 
-    # Kick off async processing
-    process_document_task.delay(doc_id)
+    # Kick off async processing (runs inline when Celery is eager)
+    await run_in_threadpool(dispatch_document, doc_id)
 
     return schemas.ProcessingResult(
         document_id=doc_id,
@@ -54,39 +86,324 @@ async def upload_document(
     )
 
 
+@router.post("/documents/batch", response_model=schemas.BatchUploadResult)
+async def upload_batch(
+    files: List[UploadFile] = File(...),
+    case_id: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+):
+    if len(files) > settings.BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"Too many files (max {settings.BATCH_MAX_FILES})")
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    batch_id = str(uuid.uuid4())
+    docs: List[Document] = []
+    try:
+        for file in files:
+            doc_id = str(uuid.uuid4())
+            stored = await _store_upload(file, doc_id)
+            docs.append(
+                Document(
+                    id=doc_id,
+                    filename=file.filename,
+                    path=stored.path,
+                    case_id=case_id,
+                    batch_id=batch_id,
+                    status="queued",
+                    content_sha256=stored.sha256,
+                    size_bytes=stored.size,
+                    mime_type=stored.mime_type,
+                )
+            )
+
+        # One transaction for the batch and all of its documents
+        db.add(DocumentBatch(id=batch_id, case_id=case_id, total=len(docs)))
+        db.add_all(docs)
+        await run_in_threadpool(db.commit)
+    except BaseException:
+        # All or nothing: a failed file (e.g. 413) must not leave earlier files orphaned on disk
+        await run_in_threadpool(db.rollback)
+        await run_in_threadpool(_remove_files, [d.path for d in docs])
+        raise
+
+    # One broker publish for the whole batch
+    doc_ids = [d.id for d in docs]
+    await run_in_threadpool(dispatch_documents, doc_ids)
+
+    return schemas.BatchUploadResult(
+        batch_id=batch_id,
+        case_id=case_id,
+        document_ids=doc_ids,
+        total=len(doc_ids),
+        processing_status="queued",
+    )
+
+
+async def _status_counts(db: AsyncSession, column, value: str) -> Dict[str, int]:
+    result = await db.execute(
+        select(Document.status, func.count(Document.id)).where(column == value).group_by(Document.status)
+    )
+    return {status: count for status, count in result.all()}
+
+
+async def _batch_status(db: AsyncSession, batch: DocumentBatch) -> schemas.BatchStatus:
+    counts = await _status_counts(db, Document.batch_id, batch.id)
+    finished = sum(counts.get(s, 0) for s in TERMINAL_STATUSES)
+    return schemas.BatchStatus(
+        batch_id=batch.id,
+        case_id=batch.case_id,
+        total=batch.total,
+        status_counts=counts,
+        finished=finished,
+        done=finished >= batch.total,
+    )
+
+
+@router.get("/batches/{batch_id}", response_model=schemas.BatchStatus)
+async def get_batch_status(batch_id: str, db: AsyncSession = Depends(get_async_db)):
+    batch = await db.get(DocumentBatch, batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return await _batch_status(db, batch)
+
+
+# --- Status streams (server-sent events) ------------------------------------------------
+# Each stream opens with a snapshot read from the database, then relays the stage events
+# the pipeline publishes on Redis, so clients do not need to poll the status endpoints.
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _event_response(channel: str, snapshot, stop_on_terminal: bool = False) -> StreamingResponse:
+    return StreamingResponse(
+        sse_stream(channel, snapshot, stop_on_terminal=stop_on_terminal),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.get("/documents/{document_id}/events")
+async def stream_document_status(
+    document_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    sessions: async_sessionmaker = Depends(get_async_sessionmaker),
+):
+    if not await db.get(Document, document_id):
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    async def snapshot():
+        async with sessions() as s:
+            doc = await s.get(Document, document_id)
+            return {"document_id": document_id, "status": doc.status if doc else "unknown"}
+
+    return _event_response(document_channel(document_id), snapshot, stop_on_terminal=True)
+
+
+@router.get("/batches/{batch_id}/events")
+async def stream_batch_status(
+    batch_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    sessions: async_sessionmaker = Depends(get_async_sessionmaker),
+):
+    if not await db.get(DocumentBatch, batch_id):
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    async def snapshot():
+        async with sessions() as s:
+            batch = await s.get(DocumentBatch, batch_id)
+            return jsonable_encoder(await _batch_status(s, batch))
+
+    return _event_response(batch_channel(batch_id), snapshot)
+
+
+@router.get("/cases/{case_id}/events")
+async def stream_case_status(case_id: str, sessions: async_sessionmaker = Depends(get_async_sessionmaker)):
+    async def snapshot():
+        async with sessions() as s:
+            return {"case_id": case_id, "status_counts": await _status_counts(s, Document.case_id, case_id)}
+
+    return _event_response(case_channel(case_id), snapshot)
+
+
+_UNKNOWN_CLASSIFICATION = {
+    "document_type": "unknown",
+    "confidence_score": 0.0,
+    "sub_type": None,
+    "jurisdiction": None,
+    "parties_involved": [],
+}
+
 @router.get("/documents/{document_id}/status", response_model=dict)
-async def get_status(document_id: str, db: Session = Depends(get_db)):
-    db_doc = db.get(Document, document_id)
+async def get_status(document_id: str, db: AsyncSession = Depends(get_async_db)):
+    db_doc = await db.get(Document, document_id)
     if not db_doc:
         raise HTTPException(status_code=404, detail="Document not found")
     return {"document_id": document_id, "status": db_doc.status}
 
 
 @router.get("/documents/{document_id}/result", response_model=schemas.ProcessingResult)
-async def get_result(document_id: str, db: Session = Depends(get_db)):
-    db_doc = db.get(Document, document_id)
-    if not db_doc:
+async def get_result(document_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Completed result with ETag/Last-Modified from Document.updated_at.
+
+    Validators are checked against a two-column read, so a 304 never loads the JSON columns;
+    the serialized payload is reused from the response cache while the ETag is unchanged.
+    """
+    head = (
+        await db.execute(select(Document.status, Document.updated_at).where(Document.id == document_id))
+    ).first()
+    if not head:
         raise HTTPException(status_code=404, detail="Document not found")
-    if db_doc.status not in ("completed", "needs_review", "failed"):
+    status, updated_at = head
+    if status not in TERMINAL_STATUSES:
         raise HTTPException(status_code=202, detail="Processing not completed")
 
-    return schemas.ProcessingResult(
-        document_id=db_doc.id,
-        classification=db_doc.classification or schemas.DocumentClassification(
-            document_type="unknown", confidence_score=0.0, sub_type=None, jurisdiction=None, parties_involved=[]
-        ),
-        extracted_dates=db_doc.extracted_dates or [],
-        obligations=db_doc.obligations or [],
-        processing_status=db_doc.status,
-        human_review_required=db_doc.human_review_required or False,
-        error_messages=db_doc.error_messages or [],
+    etag = make_etag("result", document_id, status, updated_at.isoformat() if updated_at else None)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified_response(etag, updated_at)
+
+    cache = get_response_cache()
+    payload = cache.get(result_key(document_id), etag) if cache else None
+    if payload is None:
+        db_doc = await db.get(Document, document_id)
+        payload = schemas.ProcessingResult(
+            document_id=db_doc.id,
+            classification=db_doc.classification or schemas.DocumentClassification(**_UNKNOWN_CLASSIFICATION),
+            extracted_dates=db_doc.extracted_dates or [],
+            obligations=db_doc.obligations or [],
+            processing_status=db_doc.status,
+            human_review_required=db_doc.human_review_required or False,
+            error_messages=db_doc.error_messages or [],
+        ).model_dump_json().encode("utf-8")
+        if cache:
+            cache.set(result_key(document_id), etag, payload)
+    return json_payload_response(payload, etag, updated_at)
+
+
+@router.put("/documents/{document_id}/classification", response_model=schemas.DocumentClassification)
+def review_classification(document_id: str, review: schemas.ClassificationReview, db: Session = Depends(get_db)):
+    """Record a reviewer's correction or confirmation. The label becomes source "human",
+    which classifier training trusts as ground truth."""
+    db_doc = db.get(Document, document_id)
+    if not db_doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if db_doc.status not in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail="Document is still processing")
+    current = db_doc.classification or dict(_UNKNOWN_CLASSIFICATION)
+    classification = schemas.DocumentClassification(
+        document_type=review.document_type,
+        confidence_score=1.0,
+        sub_type=review.sub_type if review.sub_type is not None else current.get("sub_type"),
+        jurisdiction=review.jurisdiction if review.jurisdiction is not None else current.get("jurisdiction"),
+        parties_involved=current.get("parties_involved") or [],
+        source="human",
     )
+    db_doc.classification = classification.model_dump()
+    db_doc.document_type = classification.document_type
+    db_doc.confidence_score = classification.confidence_score
+    db_doc.classification_source = "human"
+    db.commit()
+    invalidate_document(document_id)
+    return classification
+
+
+# Selectable bulk fields -> (column, fallback when NULL)
+_BULK_FIELDS = {
+    "processing_status": (Document.status, None),
+    "classification": (Document.classification, _UNKNOWN_CLASSIFICATION),
+    "extracted_dates": (Document.extracted_dates, []),
+    "obligations": (Document.obligations, []),
+    "human_review_required": (Document.human_review_required, False),
+    "error_messages": (Document.error_messages, []),
+    "filename": (Document.filename, None),
+    "case_id": (Document.case_id, None),
+    "created_at": (Document.created_at, None),
+    "updated_at": (Document.updated_at, None),
+    "document_type": (Document.document_type, None),
+    "confidence_score": (Document.confidence_score, None),
+    "date_count": (Document.date_count, 0),
+    "obligation_count": (Document.obligation_count, 0),
+    "timings": (Document.timings, None),
+}
+_BULK_DEFAULT_FIELDS = list(schemas.ProcessingResult.model_fields)
+_BULK_MAX_DOCUMENTS = 1000
+
+
+@router.post("/documents/bulk", response_model=schemas.BulkDocumentsResponse)
+async def get_documents_bulk(req: schemas.BulkDocumentsRequest, db: AsyncSession = Depends(get_async_db)):
+    """Statuses or results for many documents (by id or by case) in one query.
+
+    Only the columns behind the requested fields are read, e.g. fields=["processing_status"]
+    for a status board.
+    """
+    if not req.document_ids and not req.case_id:
+        raise HTTPException(status_code=422, detail="Provide document_ids or case_id")
+    fields = [f for f in (req.fields or _BULK_DEFAULT_FIELDS) if f != "document_id"]
+    unknown = sorted(set(fields) - set(_BULK_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+    ids = list(dict.fromkeys(req.document_ids or []))
+    if len(ids) > _BULK_MAX_DOCUMENTS:
+        raise HTTPException(status_code=422, detail=f"At most {_BULK_MAX_DOCUMENTS} document ids per request")
+
+    q = select(Document.id, *[_BULK_FIELDS[f][0] for f in fields])
+    if ids:
+        q = q.where(Document.id.in_(ids))
+    if req.case_id:
+        q = q.where(Document.case_id == req.case_id)
+    if not ids:
+        q = q.order_by(Document.created_at.desc(), Document.id.desc()).limit(_BULK_MAX_DOCUMENTS)
+    rows = (await db.execute(q)).all()
+
+    found: Dict[str, Dict] = {}
+    for row in rows:
+        item = {"document_id": row[0]}
+        for f, value in zip(fields, row[1:]):
+            item[f] = _BULK_FIELDS[f][1] if value is None else value
+        found[row[0]] = item
+    if ids:
+        # Keep the caller's order
+        return schemas.BulkDocumentsResponse(
+            items=[found[i] for i in ids if i in found], missing=[i for i in ids if i not in found]
+        )
+    return schemas.BulkDocumentsResponse(items=list(found.values()), missing=[])
+
+
+_calendar_adapter = TypeAdapter(List[schemas.CalendarEventOut])
 
 
 @router.get("/cases/{case_id}/calendar", response_model=List[schemas.CalendarEventOut])
-async def get_case_calendar(case_id: str, db: Session = Depends(get_db)):
-    events = db.query(CalendarEvent).filter(CalendarEvent.case_id == case_id).order_by(CalendarEvent.start.asc()).all()
-    return [schemas.CalendarEventOut.from_orm(e) for e in events]
+async def get_case_calendar(case_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Case calendar with an ETag from the case calendar version (bumped by every calendar write)."""
+    row = (
+        await db.execute(
+            select(CaseCalendarVersion.version, CaseCalendarVersion.updated_at).where(
+                CaseCalendarVersion.case_id == case_id
+            )
+        )
+    ).first()
+    version, updated_at = row if row else (0, None)
+    etag = make_etag("calendar", case_id, version)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified_response(etag, updated_at)
+
+    cache = get_response_cache()
+    payload = cache.get(calendar_key(case_id), etag) if cache else None
+    if payload is None:
+        result = await db.execute(
+            select(CalendarEvent).where(CalendarEvent.case_id == case_id).order_by(CalendarEvent.start.asc())
+        )
+        events = result.scalars().all()
+        payload = _calendar_adapter.dump_json([schemas.CalendarEventOut.from_orm(e) for e in events])
+        if cache:
+            cache.set(calendar_key(case_id), etag, payload)
+    return json_payload_response(payload, etag, updated_at)
+
+
+@router.get("/cases/{case_id}/calendar/conflicts", response_model=List[schemas.CalendarConflict])
+async def get_case_calendar_conflicts(case_id: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        select(CalendarEvent).where(CalendarEvent.case_id == case_id).order_by(CalendarEvent.start.asc())
+    )
+    return ConflictChecker.from_settings().sweep(result.scalars().all())
 
 
 @router.post("/cases/{case_id}/calendar/events", response_model=schemas.CalendarEventOut)
@@ -102,23 +419,79 @@ async def create_calendar_event(case_id: str, event: schemas.CalendarEventCreate
         source_document=event.source_document,
     )
     db.add(db_event)
+    bump_calendar_version(db, case_id)
     db.commit()
     db.refresh(db_event)
+    cache = get_response_cache()
+    if cache:
+        cache.invalidate(calendar_key(case_id))
     return schemas.CalendarEventOut.from_orm(db_event)
 
 
-@router.get("/documents", response_model=List[schemas.DocumentListItem])
+# Columns the summary view reads; the JSON result columns are never loaded for it
+_SUMMARY_COLUMNS = (
+    Document.id,
+    Document.filename,
+    Document.case_id,
+    Document.created_at,
+    Document.status,
+    Document.document_type,
+    Document.confidence_score,
+    Document.date_count,
+    Document.obligation_count,
+    Document.human_review_required,
+)
+
+
+@router.get(
+    "/documents",
+    response_model=Union[List[schemas.DocumentListItem], List[schemas.DocumentSummaryItem]],
+)
 async def list_documents(
+    response: Response,
     case_id: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    db: AsyncSession = Depends(get_async_db),
 ):
-    q = db.query(Document)
+    """Newest-first listing. Pass the X-Next-Cursor response header back as `cursor` to page
+    by keyset on (created_at, id); `offset` is kept for existing clients."""
+    limit = max(1, min(limit, 200))
+    q = select(*_SUMMARY_COLUMNS) if view == "summary" else select(Document)
     if case_id:
-        q = q.filter(Document.case_id == case_id)
-    q = q.order_by(Document.created_at.desc()).offset(max(0, offset)).limit(max(1, min(limit, 200)))
-    rows = q.all()
+        q = q.where(Document.case_id == case_id)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        q = q.where(tuple_(Document.created_at, Document.id) < tuple_(created_at, last_id))
+    elif offset:
+        q = q.offset(max(0, offset))
+    q = q.order_by(Document.created_at.desc(), Document.id.desc()).limit(limit)
+    result = await db.execute(q)
+    rows = result.all() if view == "summary" else result.scalars().all()
+
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
+    if view == "summary":
+        return [
+            schemas.DocumentSummaryItem(
+                document_id=r.id,
+                filename=r.filename,
+                case_id=r.case_id,
+                created_at=r.created_at,
+                processing_status=r.status,
+                document_type=r.document_type,
+                confidence_score=r.confidence_score,
+                date_count=r.date_count or 0,
+                obligation_count=r.obligation_count or 0,
+                human_review_required=bool(r.human_review_required),
+            )
+            for r in rows
+        ]
+
     out: List[schemas.DocumentListItem] = []
     for r in rows:
         out.append(
@@ -145,3 +518,12 @@ async def list_documents(
             )
         )
     return out
+
+
+@router.get("/llm/cache/stats", response_model=dict)
+def llm_cache_stats():
+    # Plain def: the sqlite/Redis calls block, so FastAPI runs this in its threadpool
+    cache = get_llm_cache()
+    if not cache:
+        return {"backend": None, "hits": 0, "misses": 0, "hit_ratio": 0.0}
+    return cache.stats()
@@ -16,7 +16,17 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: str = Field(default=os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/2"))
 
     UPLOAD_DIR: str = Field(default=os.getenv("UPLOAD_DIR", "./data/uploads"))
+    BATCH_MAX_FILES: int = Field(default=int(os.getenv("BATCH_MAX_FILES", "500")))
+    # Upload size limits: per file, and per request for batch uploads
+    UPLOAD_MAX_BYTES: int = Field(default=int(os.getenv("UPLOAD_MAX_BYTES", str(200 * 1024 * 1024))))
+    UPLOAD_MAX_BATCH_BYTES: int = Field(default=int(os.getenv("UPLOAD_MAX_BATCH_BYTES", str(2 * 1024 * 1024 * 1024))))
     STORAGE_DIR: str = Field(default=os.getenv("STORAGE_DIR", "./data"))
+    # Intermediate stage artifacts; must be on storage shared by all workers (defaults to STORAGE_DIR/artifacts)
+    ARTIFACT_DIR: str | None = Field(default=os.getenv("ARTIFACT_DIR"))
+
+    # "inline": one process_document_task per document; "staged": chain of stage tasks on
+    # the ocr -> llm -> db queues so CPU and LLM workers can be sized independently
+    PIPELINE_MODE: str = Field(default=os.getenv("PIPELINE_MODE", "inline"))
 
     S3_ENDPOINT: str = Field(default=os.getenv("S3_ENDPOINT", "http://minio:9000"))
     S3_ACCESS_KEY: str = Field(default=os.getenv("S3_ACCESS_KEY", "minioadmin"))
@@ -26,9 +36,116 @@ class Settings(BaseSettings):
     # LLM configuration
     OPENAI_API_KEY: str | None = Field(default=os.getenv("OPENAI_API_KEY"))
     OPENAI_MODEL: str = Field(default=os.getenv("OPENAI_MODEL", "gpt-4o-mini"))
+    # Optional OpenAI-compatible endpoint (proxy, local stub server)
+    OPENAI_BASE_URL: str | None = Field(default=os.getenv("OPENAI_BASE_URL"))
+
+    # Shared per-process LLM HTTP client
+    LLM_MAX_CONNECTIONS: int = Field(default=int(os.getenv("LLM_MAX_CONNECTIONS", "20")))
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10")))
+    LLM_TIMEOUT_SECONDS: float = Field(default=float(os.getenv("LLM_TIMEOUT_SECONDS", "120")))
+    LLM_CONNECT_TIMEOUT_SECONDS: float = Field(default=float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "10")))
+    LLM_MAX_RETRIES: int = Field(default=int(os.getenv("LLM_MAX_RETRIES", "2")))
+    # Max in-flight LLM requests per worker process
+    LLM_MAX_CONCURRENCY: int = Field(default=int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+
+    # LLM response cache: "sqlite" (local file), "redis" or "none"
+    LLM_CACHE_BACKEND: str = Field(default=os.getenv("LLM_CACHE_BACKEND", "sqlite"))
+    LLM_CACHE_TTL_SECONDS: int = Field(default=int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))))
+    LLM_CACHE_MAX_ENTRIES: int = Field(default=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000")))
+    LLM_CACHE_PATH: str | None = Field(default=os.getenv("LLM_CACHE_PATH"))
+    LLM_CACHE_REDIS_URL: str | None = Field(default=os.getenv("LLM_CACHE_REDIS_URL"))
+
+    # Offline hashed n-gram classifier tried before the LLM (python -m app.services.classifier_training);
+    # predictions below the threshold still go to the LLM
+    LOCAL_CLASSIFIER_ENABLED: bool = Field(default=os.getenv("LOCAL_CLASSIFIER_ENABLED", "true").lower() in {"1", "true", "yes"})
+    LOCAL_CLASSIFIER_MODEL_PATH: str | None = Field(default=os.getenv("LOCAL_CLASSIFIER_MODEL_PATH"))
+    LOCAL_CLASSIFIER_THRESHOLD: float = Field(default=float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.85")))
+    LOCAL_CLASSIFIER_MAX_CHARS: int = Field(default=int(os.getenv("LOCAL_CLASSIFIER_MAX_CHARS", "6000")))
+
+    # Approximate token budgets for document text per LLM call; long documents are reduced
+    # to their most relevant excerpts (dates, legal keywords, headings) with page references
+    CLASSIFIER_TEXT_TOKENS: int = Field(default=int(os.getenv("CLASSIFIER_TEXT_TOKENS", "1500")))
+    PARSER_TEXT_TOKENS: int = Field(default=int(os.getenv("PARSER_TEXT_TOKENS", "3000")))
+    # Opt-in map-reduce extraction for text over PARSER_TEXT_TOKENS: overlapping chunks extracted
+    # concurrently (also bounded by LLM_MAX_CONCURRENCY), then merged and de-duplicated. Off,
+    # long text is reduced to one relevance-ranked window and a single call
+    PARSER_MAP_REDUCE: bool = Field(default=os.getenv("PARSER_MAP_REDUCE", "false").lower() in {"1", "true", "yes"})
+    PARSER_CHUNK_TOKENS: int = Field(default=int(os.getenv("PARSER_CHUNK_TOKENS", "3000")))
+    PARSER_CHUNK_OVERLAP_TOKENS: int = Field(default=int(os.getenv("PARSER_CHUNK_OVERLAP_TOKENS", "150")))
+    # Cap on LLM calls per document and parser under map-reduce (0 = map every chunk); above it
+    # only the most relevant chunks are extracted and the skipped chunks/characters are logged
+    PARSER_MAX_CHUNKS: int = Field(default=int(os.getenv("PARSER_MAX_CHUNKS", "8")))
+    PARSER_CHUNK_CONCURRENCY: int = Field(default=int(os.getenv("PARSER_CHUNK_CONCURRENCY", "4")))
+
+    # Distinct date strings memoized by the date engine (per process)
+    DATE_PARSE_CACHE_SIZE: int = Field(default=int(os.getenv("DATE_PARSE_CACHE_SIZE", "4096")))
+
+    # Key-phrase obligations take the first date within this many characters after the phrase as their due date
+    OBLIGATION_ANCHOR_CHARS: int = Field(default=int(os.getenv("OBLIGATION_ANCHOR_CHARS", "300")))
+
+    # Document types (comma-separated) whose heuristic parser also runs the generic LLM parser concurrently
+    PARSER_LLM_STRATEGY_TYPES: str = Field(default=os.getenv("PARSER_LLM_STRATEGY_TYPES", ""))
+
+    # Speculative parsing: start the generic LLM parser while classification is in flight.
+    # Only used for types whose LLM strategies it can replace (generic BaseParser via
+    # PARSER_LLM_STRATEGY_TYPES, or SPECULATIVE_ACCEPT_TYPES); for every other type the
+    # speculative call is wasted, so enabling it costs up to one extra LLM call per document
+    PIPELINE_SPECULATIVE_PARSE: bool = Field(
+        default=os.getenv("PIPELINE_SPECULATIVE_PARSE", "false").lower() in {"1", "true", "yes"}
+    )
+    # Types (comma-separated) whose specialized LLM parser is replaced by the speculative result
+    SPECULATIVE_ACCEPT_TYPES: str = Field(default=os.getenv("SPECULATIVE_ACCEPT_TYPES", ""))
+
+    # Calendar conflict proximity in minutes: default, plus per-type overrides such as
+    # "hearing=240,trial=1440,deadline=0" (a pair uses the larger of its two types)
+    CALENDAR_CONFLICT_MINUTES: int = Field(default=int(os.getenv("CALENDAR_CONFLICT_MINUTES", "60")))
+    CALENDAR_CONFLICT_MINUTES_BY_TYPE: str = Field(default=os.getenv("CALENDAR_CONFLICT_MINUTES_BY_TYPE", ""))
+
+    # Stage-level status events on Redis pub/sub, streamed to clients over SSE
+    STATUS_EVENTS_ENABLED: bool = Field(
+        default=os.getenv("STATUS_EVENTS_ENABLED", "true").lower() in {"1", "true", "yes"}
+    )
+    STATUS_EVENTS_REDIS_URL: str | None = Field(default=os.getenv("STATUS_EVENTS_REDIS_URL"))
+    STATUS_EVENTS_HEARTBEAT_SECONDS: float = Field(default=float(os.getenv("STATUS_EVENTS_HEARTBEAT_SECONDS", "15")))
+
+    # Serialized result/calendar payloads served with ETags: "memory" (per process), "redis" or "none"
+    RESPONSE_CACHE_BACKEND: str = Field(default=os.getenv("RESPONSE_CACHE_BACKEND", "memory"))
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048")))
+    RESPONSE_CACHE_TTL_SECONDS: int = Field(default=int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600")))
+    RESPONSE_CACHE_REDIS_URL: str | None = Field(default=os.getenv("RESPONSE_CACHE_REDIS_URL"))
+
+    # /metrics re-counts documents per status at most this often (seconds)
+    METRICS_STATUS_TTL_SECONDS: float = Field(default=float(os.getenv("METRICS_STATUS_TTL_SECONDS", "30")))
 
     # PDF rendering configuration (pdf2image)
     POPPLER_PATH: str | None = Field(default=os.getenv("POPPLER_PATH"))
+    # Page previews sent to the LLMs: first N pages, fitted into a max_dimension box and encoded once
+    PREVIEW_MAX_PAGES: int = Field(default=int(os.getenv("PREVIEW_MAX_PAGES", "2")))
+    PREVIEW_MAX_DIMENSION: int = Field(default=int(os.getenv("PREVIEW_MAX_DIMENSION", "1024")))
+    PREVIEW_FORMAT: str = Field(default=os.getenv("PREVIEW_FORMAT", "jpeg"))  # jpeg | webp | png
+    PREVIEW_QUALITY: int = Field(default=int(os.getenv("PREVIEW_QUALITY", "70")))
+
+    # PDF text extraction: process pool size (1 = in-process) and pages handed to each worker task
+    PDF_EXTRACT_WORKERS: int = Field(default=int(os.getenv("PDF_EXTRACT_WORKERS", "1")))
+    PDF_PAGES_PER_CHUNK: int = Field(default=int(os.getenv("PDF_PAGES_PER_CHUNK", "25")))
+
+    # Selective OCR for PDF pages without a usable text layer (pdf2image + tesseract)
+    OCR_ENABLED: bool = Field(default=os.getenv("OCR_ENABLED", "true").lower() in {"1", "true", "yes"})
+    OCR_DPI: int = Field(default=int(os.getenv("OCR_DPI", "300")))
+    OCR_WORKERS: int = Field(default=int(os.getenv("OCR_WORKERS", "4")))
+    OCR_MIN_TEXT_CHARS: int = Field(default=int(os.getenv("OCR_MIN_TEXT_CHARS", "20")))
+
+    # Pipeline versioning; bump PIPELINE_VERSION whenever prompts or parsing logic change
+    PIPELINE_VERSION: str = Field(default=os.getenv("PIPELINE_VERSION", "1"))
+
+    # Content-addressed extraction cache (text, classification, parser output)
+    EXTRACTION_CACHE_ENABLED: bool = Field(
+        default=os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() in {"1", "true", "yes"}
+    )
+    EXTRACTION_CACHE_PATH: str | None = Field(default=os.getenv("EXTRACTION_CACHE_PATH"))
+    EXTRACTION_CACHE_MAX_BYTES: int = Field(
+        default=int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    )
 
     # Pydantic v2 settings config
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
@@ -12,3 +12,7 @@ class ProcessingException(AppException):
 
 class ValidationException(AppException):
     pass
+
+
+class UploadTooLargeException(ValidationException):
+    pass
@@ -1,10 +1,18 @@
 import os
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
+from app.api.dependencies import get_db
+from app.api.limits import UploadSizeLimitMiddleware
 from app.api.routes import router as api_router
-from app.models.database import Base, engine
+from app.core.exceptions import UploadTooLargeException
+from app.models.database import Document, engine
+from app.models.migrations import upgrade_schema
 from app.core.config import settings
+from app.services.metrics import cached_status_counts, render_metrics
 
 app = FastAPI(title="Legal Document Processor", version="0.1.0")
 
@@ -14,18 +22,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(UploadSizeLimitMiddleware)
+
+
+@app.exception_handler(UploadTooLargeException)
+async def upload_too_large_handler(request: Request, exc: UploadTooLargeException) -> JSONResponse:
+    return JSONResponse(status_code=413, content={"detail": exc.message})
+
 
 @app.on_event("startup")
 def on_startup() -> None:
     # Ensure storage directories exist
     os.makedirs(settings.STORAGE_DIR, exist_ok=True)
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    # Create tables once database is reachable
-    Base.metadata.create_all(bind=engine)
+    # Create tables once database is reachable, then add columns/indexes introduced since
+    # they were created; serialized across processes starting at the same time
+    upgrade_schema(engine)
 
 @app.get("/health")
 def health() -> dict:
     return {"status": "ok"}
 
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(db: Session = Depends(get_db)) -> Response:
+    """Prometheus scrape: stage/LLM/queue histograms plus documents per status."""
+    # Scrapes arrive every few seconds; the GROUP BY runs at most once per TTL
+    counts = cached_status_counts(
+        lambda: dict(db.execute(select(Document.status, func.count(Document.id)).group_by(Document.status)).all()),
+        settings.METRICS_STATUS_TTL_SECONDS,
+    )
+    body, content_type = render_metrics(counts)
+    return Response(content=body, media_type=content_type)
+
 app.include_router(api_router, prefix="/api/v1")
@@ -3,7 +3,8 @@ import json
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, String, create_engine
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Index, Integer, String, create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
@@ -14,6 +15,23 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def async_database_url(url: str) -> str:
+    """Map the sync DATABASE_URL onto its asyncio driver (asyncpg / aiosqlite)."""
+    if url.startswith("sqlite+aiosqlite:") or "+asyncpg" in url:
+        return url
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+# Async stack for API read paths; Celery workers keep using the sync SessionLocal
+async_engine = create_async_engine(async_database_url(settings.DATABASE_URL), pool_pre_ping=True)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
 class Document(Base):
     __tablename__ = "documents"
 
@@ -21,6 +39,10 @@ class Document(Base):
     filename = Column(String, nullable=False)
     path = Column(String, nullable=False)
     case_id = Column(String, nullable=True, index=True)
+    batch_id = Column(String, nullable=True, index=True)
+    content_sha256 = Column(String, nullable=True, index=True)
+    size_bytes = Column(Integer, nullable=True)
+    mime_type = Column(String, nullable=True)
 
     status = Column(String, default="queued", index=True)
     error_messages = Column(JSON, default=list)
@@ -30,9 +52,34 @@ class Document(Base):
     obligations = Column(JSON, default=list)
     human_review_required = Column(Boolean, default=False)
 
+    # Scalar copies of the JSON results so listings never have to load them
+    document_type = Column(String, nullable=True)
+    # Who produced document_type: "local", "llm" or "human"; training only trusts llm/human labels
+    classification_source = Column(String, nullable=True)
+    confidence_score = Column(Float, nullable=True)
+    date_count = Column(Integer, default=0)
+    obligation_count = Column(Integer, default=0)
+    # Per-stage durations (ms) of the last processing run, e.g. {"extract_ms": 12.5, "total_ms": 840.2}
+    timings = Column(JSON, nullable=True)
+
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Keyset pagination walks (created_at, id) newest first, optionally within a case
+    __table_args__ = (
+        Index("ix_documents_created_id", "created_at", "id"),
+        Index("ix_documents_case_created_id", "case_id", "created_at", "id"),
+    )
+
+
+class DocumentBatch(Base):
+    __tablename__ = "document_batches"
+
+    id = Column(String, primary_key=True)
+    case_id = Column(String, nullable=True, index=True)
+    total = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 
 class CalendarEvent(Base):
     __tablename__ = "calendar_events"
@@ -46,5 +93,18 @@ class CalendarEvent(Base):
     all_day = Column(Boolean, default=False)
     source_document = Column(String, nullable=True)
 
+    # Conflict detection reads only the events of one case inside a time window
+    __table_args__ = (Index("ix_calendar_events_case_start", "case_id", "start"),)
+
+
+class CaseCalendarVersion(Base):
+    """Bumped in the same transaction as any calendar write for the case; drives calendar ETags."""
+
+    __tablename__ = "case_calendar_versions"
+
+    case_id = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 
 # Tables are created during FastAPI startup event to avoid race with DB readiness
@@ -0,0 +1,157 @@
+"""In-place upgrades for databases created by an older version of the schema.
+
+Base.metadata.create_all only creates missing tables, so columns and indexes added to an
+existing table never reach a deployed database. upgrade_schema() runs create_all and then
+adds whatever is missing, at startup or via `python -m app.models.migrations`. Every step
+checks the live schema first, so it is safe to run repeatedly, and the whole run holds a
+database-wide lock so API and worker processes starting together do not race on the same
+DDL (the second one waits, then finds nothing left to do).
+"""
+from __future__ import annotations
+import logging
+import os
+from typing import Iterable
+
+from sqlalchemy import Table, bindparam, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.database import Base, CalendarEvent, Document
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("LOG_LEVEL", "INFO").upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+
+# Columns added to tables that predate them, in the order they were introduced
+_DOCUMENT_COLUMNS = (
+    "batch_id",
+    "content_sha256",
+    "size_bytes",
+    "mime_type",
+    "document_type",
+    "confidence_score",
+    "date_count",
+    "obligation_count",
+    "timings",
+    "classification_source",
+)
+_DOCUMENT_INDEXES = (
+    "ix_documents_batch_id",
+    "ix_documents_content_sha256",
+    "ix_documents_created_id",
+    "ix_documents_case_created_id",
+)
+_CALENDAR_EVENT_INDEXES = ("ix_calendar_events_case_start",)
+_BACKFILL_BATCH = 500
+# Arbitrary application-wide key for the Postgres advisory lock around the upgrade
+_ADVISORY_LOCK_KEY = 7_224_118_301
+# How long a process waits for another one's upgrade to finish on SQLite
+_SQLITE_LOCK_TIMEOUT_MS = 120_000
+
+
+def _acquire_upgrade_lock(conn: Connection) -> None:
+    """Serialize upgrades across processes for the rest of conn's transaction."""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        # Released automatically when the transaction commits or rolls back
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+    elif dialect == "sqlite":
+        # Take the write lock up front instead of on the first DDL statement
+        conn.exec_driver_sql(f"PRAGMA busy_timeout = {_SQLITE_LOCK_TIMEOUT_MS}")
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        logger.warning("Schema upgrade: no cross-process lock for dialect %s", dialect)
+
+
+def _add_missing_columns(conn: Connection, table: Table, names: Iterable[str]) -> None:
+    existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    preparer = conn.dialect.identifier_preparer
+    for name in names:
+        if name in existing:
+            continue
+        column = table.c[name]
+        ddl = (
+            f"ALTER TABLE {preparer.format_table(table)} "
+            f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=conn.dialect)}"
+        )
+        logger.info("Schema upgrade: %s", ddl)
+        conn.execute(text(ddl))
+
+
+def _create_missing_indexes(conn: Connection, table: Table, names: Iterable[str]) -> None:
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(table.name)}
+    by_name = {ix.name: ix for ix in table.indexes}
+    for name in names:
+        if name in existing:
+            continue
+        logger.info("Schema upgrade: CREATE INDEX %s ON %s", name, table.name)
+        by_name[name].create(conn)
+
+
+def _backfill_document_summaries(conn: Connection) -> int:
+    """Copy type, confidence, classification source and result counts out of the JSON columns for rows written
+    before the summary columns existed (date_count is NULL only for those rows)."""
+    documents = Document.__table__
+    stmt = (
+        update(documents)
+        .where(documents.c.id == bindparam("_id"))
+        .values(
+            document_type=bindparam("document_type"),
+            confidence_score=bindparam("confidence_score"),
+            classification_source=bindparam("classification_source"),
+            date_count=bindparam("date_count"),
+            obligation_count=bindparam("obligation_count"),
+        )
+    )
+    total = 0
+    while True:
+        rows = conn.execute(
+            select(documents.c.id, documents.c.classification, documents.c.extracted_dates, documents.c.obligations)
+            .where(documents.c.date_count.is_(None))
+            .limit(_BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            classification = row.classification if isinstance(row.classification, dict) else {}
+            params.append(
+                {
+                    "_id": row.id,
+                    "document_type": classification.get("document_type"),
+                    "confidence_score": classification.get("confidence_score"),
+                    "classification_source": classification.get("source"),
+                    "date_count": len(row.extracted_dates or []),
+                    "obligation_count": len(row.obligations or []),
+                }
+            )
+        conn.execute(stmt, params)
+        total += len(params)
+    if total:
+        logger.info("Schema upgrade: backfilled summary columns for %d documents", total)
+    return total
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Create missing tables and bring existing ones up to the current models."""
+    with engine.begin() as conn:
+        _acquire_upgrade_lock(conn)
+        Base.metadata.create_all(bind=conn)
+        if inspect(conn).has_table(Document.__tablename__):
+            documents = Document.__table__
+            _add_missing_columns(conn, documents, _DOCUMENT_COLUMNS)
+            _create_missing_indexes(conn, documents, _DOCUMENT_INDEXES)
+            _backfill_document_summaries(conn)
+        if inspect(conn).has_table(CalendarEvent.__tablename__):
+            # Conflict detection reads (case_id, start) windows through this index
+            _create_missing_indexes(conn, CalendarEvent.__table__, _CALENDAR_EVENT_INDEXES)
+
+
+if __name__ == "__main__":
+    from app.models.database import engine
+
+    upgrade_schema(engine)
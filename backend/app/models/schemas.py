@@ -1,6 +1,6 @@
 from __future__ import annotations
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 try:
     # pydantic v2
@@ -15,6 +15,8 @@ class ExtractedDate(BaseModel):
     confidence_score: float
     source_text: str
     jurisdiction: Optional[str]
+    # Where in the document the date was found, e.g. "chunk 2/5 [page 3, chars 5265-6800]"
+    source_ref: Optional[str] = None
 
 
 class LegalObligation(BaseModel):
@@ -24,6 +26,7 @@ class LegalObligation(BaseModel):
     priority_level: str
     associated_case: str
     source_document: str
+    source_ref: Optional[str] = None
 
 
 class DocumentClassification(BaseModel):
@@ -32,6 +35,15 @@ class DocumentClassification(BaseModel):
     sub_type: Optional[str]
     jurisdiction: Optional[str]
     parties_involved: List[str] = []
+    # Who produced the label: "local" or "llm" classifier, or "human" after review; None for escalation fallbacks
+    source: Optional[str] = None
+
+
+class ClassificationReview(BaseModel):
+    """A reviewer's correction (or confirmation, with the same type) of a document's classification."""
+    document_type: str
+    sub_type: Optional[str] = None
+    jurisdiction: Optional[str] = None
 
 
 class ProcessingResult(BaseModel):
@@ -45,6 +57,18 @@ class ProcessingResult(BaseModel):
 
 
 # Extra schemas for API I/O
+class BulkDocumentsRequest(BaseModel):
+    document_ids: Optional[List[str]] = None
+    case_id: Optional[str] = None
+    # Subset of ProcessingResult/DocumentSummaryItem fields; defaults to the ProcessingResult fields
+    fields: Optional[List[str]] = None
+
+
+class BulkDocumentsResponse(BaseModel):
+    items: List[Dict[str, Any]]
+    missing: List[str]
+
+
 class CalendarEventCreate(BaseModel):
     title: str
     description: Optional[str] = None
@@ -68,6 +92,14 @@ class CalendarEventOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)  # type: ignore
 
 
+class CalendarConflict(BaseModel):
+    event_id: str
+    other_event_id: str
+    start: datetime
+    other_start: datetime
+    message: str
+
+
 class DocumentListItem(BaseModel):
     document_id: str
     filename: str
@@ -79,3 +111,33 @@ class DocumentListItem(BaseModel):
     obligations: List[LegalObligation]
     human_review_required: bool
     error_messages: List[str]
+
+
+class DocumentSummaryItem(BaseModel):
+    document_id: str
+    filename: str
+    case_id: Optional[str]
+    created_at: datetime
+    processing_status: str
+    document_type: Optional[str]
+    confidence_score: Optional[float]
+    date_count: int
+    obligation_count: int
+    human_review_required: bool
+
+
+class BatchUploadResult(BaseModel):
+    batch_id: str
+    case_id: Optional[str]
+    document_ids: List[str]
+    total: int
+    processing_status: str
+
+
+class BatchStatus(BaseModel):
+    batch_id: str
+    case_id: Optional[str]
+    total: int
+    status_counts: Dict[str, int]
+    finished: int
+    done: bool
@@ -0,0 +1,59 @@
+from __future__ import annotations
+import json
+import os
+import shutil
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+class ArtifactStore:
+    """Filesystem store for intermediate pipeline artifacts shared between stage workers.
+
+    Stages exchange references (paths under the shared data volume) instead of inlining
+    document text, page images or parser output in broker messages.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def dir_for(self, document_id: str) -> str:
+        path = os.path.join(self.root, document_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def path_for(self, document_id: str, name: str) -> str:
+        return os.path.join(self.dir_for(document_id), name)
+
+    def put_text(self, document_id: str, name: str, text: str) -> str:
+        ref = self.path_for(document_id, name)
+        with open(ref, "w", encoding="utf-8") as f:
+            f.write(text)
+        return ref
+
+    def get_text(self, ref: str) -> str:
+        with open(ref, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def put_json(self, document_id: str, name: str, payload: Any) -> str:
+        ref = self.path_for(document_id, name)
+        with open(ref, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        return ref
+
+    def get_json(self, ref: str) -> Any:
+        with open(ref, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def discard(self, document_id: str) -> None:
+        shutil.rmtree(os.path.join(self.root, document_id), ignore_errors=True)
+
+
+_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    global _store
+    if _store is None:
+        _store = ArtifactStore(settings.ARTIFACT_DIR or os.path.join(settings.STORAGE_DIR, "artifacts"))
+    return _store
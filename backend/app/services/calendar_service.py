@@ -1,32 +1,215 @@
 from __future__ import annotations
-from typing import List
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, or_, select
 from sqlalchemy.orm import Session
-from app.models.schemas import ExtractedDate, LegalObligation
-from app.models.database import CalendarEvent
+
+from app.core.config import settings
+from app.models.schemas import CalendarConflict, ExtractedDate, LegalObligation
+from app.models.database import CalendarEvent, CaseCalendarVersion
+
+
+def calendar_event_id(case_id: str, source_document: Optional[str], d: ExtractedDate) -> str:
+    """Deterministic id: re-processing a document updates its own entries in place, and two
+    documents (or two date types) on the same day no longer overwrite each other."""
+    return f"evt-{source_document or case_id}-{_normalize_type(d.date_type)}-{d.date:%Y%m%dT%H%M%S}"
 
 
-def add_calendar_entries(db: Session, case_id: str, dates: List[ExtractedDate]) -> None:
+def _upsert_statement(dialect_name: str, rows: List[Dict]):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    stmt = insert(CalendarEvent).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[CalendarEvent.id],
+        set_={col: stmt.excluded[col] for col in ("title", "description", "start", "end", "all_day", "source_document")},
+    )
+
+
+def add_calendar_entries(
+    db: Session, case_id: str, dates: List[ExtractedDate], source_document: Optional[str] = None
+) -> None:
+    """Upsert one all-day event per date in a single statement.
+
+    With a source_document, that document's earlier events for the case that are not in
+    the new set (e.g. a date corrected on re-processing) are deleted first. Runs in the
+    caller's transaction; nothing is committed here.
+    """
+    rows: Dict[str, Dict] = {}
     for d in dates:
-        title = f"{d.date_type.title()}"
-        event = CalendarEvent(
-            id=f"evt-{case_id}-{d.date.timestamp()}",
+        event_id = calendar_event_id(case_id, source_document, d)
+        rows[event_id] = dict(
+            id=event_id,
             case_id=case_id,
-            title=title,
+            title=f"{d.date_type.title()}",
             description=d.source_text,
             start=d.date,
             end=d.date,
             all_day=True,
-            source_document="auto",
+            source_document=source_document or "auto",
+        )
+    removed = 0
+    if source_document:
+        stale = delete(CalendarEvent).where(
+            CalendarEvent.case_id == case_id, CalendarEvent.source_document == source_document
         )
-        db.merge(event)
-    db.commit()
-
-
-def detect_conflicts(db: Session, case_id: str, new_dates: List[ExtractedDate]) -> List[str]:
-    conflicts = []
-    existing = db.query(CalendarEvent).filter(CalendarEvent.case_id == case_id).all()
-    for nd in new_dates:
-        for ev in existing:
-            if abs((ev.start - nd.date).total_seconds()) < 60 * 60:  # 1 hour proximity
-                conflicts.append(f"Potential conflict: {nd.date_type} near existing event '{ev.title}' at {ev.start}")
-    return conflicts
+        if rows:
+            stale = stale.where(CalendarEvent.id.not_in(list(rows)))
+        removed = db.execute(stale.execution_options(synchronize_session=False)).rowcount or 0
+    if not rows:
+        if removed:
+            bump_calendar_version(db, case_id)
+        return
+    stmt = _upsert_statement(db.get_bind().dialect.name, list(rows.values()))
+    if stmt is None:
+        for row in rows.values():
+            db.merge(CalendarEvent(**row))
+    else:
+        db.execute(stmt)
+    bump_calendar_version(db, case_id)
+
+
+def bump_calendar_version(db: Session, case_id: str) -> None:
+    """Advance the case calendar version in the caller's transaction (calendar ETags)."""
+    now = datetime.utcnow()
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(CaseCalendarVersion).values(case_id=case_id, version=1, updated_at=now)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[CaseCalendarVersion.case_id],
+                set_={"version": CaseCalendarVersion.version + 1, "updated_at": now},
+            )
+        )
+        return
+    row = db.get(CaseCalendarVersion, case_id)
+    if row is None:
+        db.add(CaseCalendarVersion(case_id=case_id, version=1, updated_at=now))
+    else:
+        row.version = (row.version or 0) + 1
+        row.updated_at = now
+
+
+def conflict_proximities(spec: Optional[str] = None, default_minutes: Optional[int] = None) -> Tuple[timedelta, Dict[str, timedelta]]:
+    """Default proximity and per-type overrides parsed from "type=minutes,..."."""
+    default = timedelta(minutes=settings.CALENDAR_CONFLICT_MINUTES if default_minutes is None else default_minutes)
+    by_type: Dict[str, timedelta] = {}
+    for item in (settings.CALENDAR_CONFLICT_MINUTES_BY_TYPE if spec is None else spec).split(","):
+        name, _, minutes = item.partition("=")
+        if name.strip() and minutes.strip().isdigit():
+            by_type[_normalize_type(name)] = timedelta(minutes=int(minutes))
+    return default, by_type
+
+
+def _normalize_type(value: str) -> str:
+    return value.strip().lower().replace(" ", "_")
+
+
+class ConflictChecker:
+    """Proximity rules for calendar conflicts.
+
+    Two entries conflict when their starts are closer than the larger proximity of their
+    two types. Events are typed by title, which the pipeline derives from the date type.
+    """
+
+    def __init__(self, default: timedelta, by_type: Optional[Dict[str, timedelta]] = None) -> None:
+        self.default = default
+        self.by_type = by_type or {}
+        self.max_proximity = max([default, *self.by_type.values()])
+
+    @classmethod
+    def from_settings(cls) -> "ConflictChecker":
+        return cls(*conflict_proximities())
+
+    def proximity(self, event_type: str) -> timedelta:
+        return self.by_type.get(_normalize_type(event_type), self.default)
+
+    def conflicts(self, a_start: datetime, a_type: str, b_start: datetime, b_type: str) -> bool:
+        return abs(a_start - b_start) < max(self.proximity(a_type), self.proximity(b_type))
+
+    def windows(self, starts: Sequence[datetime]) -> List[Tuple[datetime, datetime]]:
+        """Merged [start - max, start + max] ranges that can hold a conflicting event."""
+        merged: List[Tuple[datetime, datetime]] = []
+        for start in sorted(starts):
+            lo, hi = start - self.max_proximity, start + self.max_proximity
+            if merged and lo <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        return merged
+
+    def against(self, new_dates: List[ExtractedDate], existing: Sequence[CalendarEvent]) -> List[str]:
+        """Compare new dates with events already sorted by start, probing only nearby events."""
+        starts = [ev.start for ev in existing]
+        conflicts: List[str] = []
+        for nd in new_dates:
+            lo = bisect_right(starts, nd.date - self.max_proximity)
+            hi = bisect_left(starts, nd.date + self.max_proximity)
+            for ev in existing[lo:hi]:
+                if self.conflicts(nd.date, nd.date_type, ev.start, ev.title):
+                    conflicts.append(f"Potential conflict: {nd.date_type} near existing event '{ev.title}' at {ev.start}")
+        return conflicts
+
+    def sweep(self, events: Sequence[CalendarEvent]) -> List[CalendarConflict]:
+        """All conflicting pairs among events sorted by start, in one forward sweep."""
+        found: List[CalendarConflict] = []
+        for i, ev in enumerate(events):
+            for other in events[i + 1:]:
+                if other.start - ev.start >= self.max_proximity:
+                    break
+                if self.conflicts(ev.start, ev.title, other.start, other.title):
+                    found.append(
+                        CalendarConflict(
+                            event_id=ev.id,
+                            other_event_id=other.id,
+                            start=ev.start,
+                            other_start=other.start,
+                            message=f"'{ev.title}' at {ev.start} is near '{other.title}' at {other.start}",
+                        )
+                    )
+        return found
+
+
+def conflict_window_query(
+    case_id: str, windows: List[Tuple[datetime, datetime]], exclude_source: Optional[str] = None
+):
+    """Events of a case inside any of the windows, ordered by start; served by (case_id, start)."""
+    q = (
+        select(CalendarEvent)
+        .where(CalendarEvent.case_id == case_id)
+        .where(or_(*[and_(CalendarEvent.start > lo, CalendarEvent.start < hi) for lo, hi in windows]))
+    )
+    if exclude_source:
+        # A re-processed document should not conflict with its own earlier entries
+        q = q.where(or_(CalendarEvent.source_document.is_(None), CalendarEvent.source_document != exclude_source))
+    return q.order_by(CalendarEvent.start.asc())
+
+
+def detect_conflicts(
+    db: Session, case_id: str, new_dates: List[ExtractedDate], source_document: Optional[str] = None
+) -> List[str]:
+    if not new_dates:
+        return []
+    checker = ConflictChecker.from_settings()
+    windows = checker.windows([nd.date for nd in new_dates])
+    existing = db.execute(conflict_window_query(case_id, windows, exclude_source=source_document)).scalars().all()
+    return checker.against(new_dates, existing)
+
+
+def detect_case_conflicts(db: Session, case_id: str) -> List[CalendarConflict]:
+    """Batch check of every event in a case against every other."""
+    events = (
+        db.execute(select(CalendarEvent).where(CalendarEvent.case_id == case_id).order_by(CalendarEvent.start.asc()))
+        .scalars()
+        .all()
+    )
+    return ConflictChecker.from_settings().sweep(events)
@@ -11,6 +11,16 @@ celery_app = Celery(
 
 celery_app.conf.update(task_serializer="json", accept_content=["json"], result_serializer="json")
 
+# Staged pipeline (PIPELINE_MODE=staged): CPU-bound extraction, network-bound LLM calls and
+# DB writes run on separate queues, e.g. `celery worker -Q ocr -c 2` and
+# `celery worker -Q llm --pool threads -c 32`. process_document_task stays on the default queue.
+celery_app.conf.task_routes = {
+    "pipeline.extract": {"queue": "ocr"},
+    "pipeline.classify": {"queue": "llm"},
+    "pipeline.parse": {"queue": "llm"},
+    "pipeline.persist": {"queue": "db"},
+}
+
 # In development, run tasks eagerly so Redis/worker are not required
 if settings.ENV == "dev" or os.getenv("CELERY_TASK_ALWAYS_EAGER", "").lower() in {"1", "true", "yes"}:
     celery_app.conf.task_always_eager = True
@@ -0,0 +1,149 @@
+"""Train and evaluate the local document classifier on already-labelled documents.
+
+    python -m app.services.classifier_training --test-fraction 0.2 --threshold 0.85
+
+Labels are the stored document_type of completed documents classified by the LLM or
+confirmed by a person. Labels the local model produced itself are never used, for training
+or for the held-out evaluation, so a retrain cannot reinforce its own mistakes. Text comes
+from the extraction cache when present, otherwise it is re-extracted from the stored file.
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.agents.local_classifier import HashedNgramClassifier, evaluate, model_path
+from app.core.config import settings
+from app.models.database import Document, SessionLocal
+from app.services.extraction_cache import cache_key, get_extraction_cache
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+logger.setLevel(logging.INFO)
+
+
+def _document_text(doc: Document) -> str:
+    cache = get_extraction_cache()
+    if cache and doc.content_sha256:
+        try:
+            payload = cache.get(cache_key(doc.content_sha256))
+            if payload and payload.get("text"):
+                return payload["text"]
+        except Exception as e:
+            logger.info("Extraction cache read failed | doc_id=%s | error=%r", doc.id, e)
+    if doc.path and os.path.exists(doc.path):
+        from app.services.document_processor import extract_text
+
+        return extract_text(doc.path)
+    return ""
+
+
+# Classification sources whose labels are trusted as ground truth
+TRUSTED_SOURCES = ("llm", "human")
+
+
+def load_labelled(
+    db: Session, min_confidence: float = 0.0, include_unattributed: bool = False
+) -> List[Tuple[str, str, str]]:
+    """(document id, text, label) for completed, confidently typed documents, plus every
+    document a reviewer has labelled (whatever its status).
+
+    Only LLM- or human-sourced labels are returned. include_unattributed also admits
+    documents processed before the source was recorded; only use it when no local model
+    was deployed at that time.
+    """
+    trusted = Document.classification_source.in_(TRUSTED_SOURCES)
+    if include_unattributed:
+        trusted = or_(trusted, Document.classification_source.is_(None))
+    q = (
+        select(Document)
+        .where(or_(Document.status == "completed", Document.classification_source == "human"))
+        .where(Document.document_type.is_not(None))
+        .where(Document.document_type != "unknown")
+        .where(trusted)
+    )
+    if min_confidence > 0:
+        q = q.where(Document.confidence_score >= min_confidence)
+    rows: List[Tuple[str, str, str]] = []
+    for doc in db.execute(q.order_by(Document.created_at.asc(), Document.id.asc())).scalars():
+        text = _document_text(doc)
+        if text.strip():
+            rows.append((doc.id, text, doc.document_type))
+    return rows
+
+
+def split(rows: Sequence[Tuple[str, str, str]], test_fraction: float) -> Tuple[list, list]:
+    """Deterministic train/held-out split by document id, so re-runs compare like with like."""
+    cut = int(test_fraction * 1000)
+    train, test = [], []
+    for row in rows:
+        (test if zlib.crc32(row[0].encode("utf-8")) % 1000 < cut else train).append(row)
+    return train, test
+
+
+def run(
+    db: Session,
+    out: Optional[str] = None,
+    test_fraction: float = 0.2,
+    threshold: Optional[float] = None,
+    epochs: int = 10,
+    min_confidence: float = 0.0,
+    include_unattributed: bool = False,
+) -> dict:
+    threshold = settings.LOCAL_CLASSIFIER_THRESHOLD if threshold is None else threshold
+    rows = load_labelled(db, min_confidence, include_unattributed)
+    train, test = split(rows, test_fraction)
+    if not train or len({label for _, _, label in train}) < 2:
+        raise ValueError(f"need labelled documents of at least two types; found {len(train)} for training")
+    model = HashedNgramClassifier.train(
+        [t for _, t, _ in train],
+        [label for _, _, label in train],
+        max_chars=settings.LOCAL_CLASSIFIER_MAX_CHARS,
+        epochs=epochs,
+    )
+    report = {"train_documents": len(train), "classes": model.classes}
+    if test:
+        texts, labels = [t for _, t, _ in test], [label for _, _, label in test]
+        report["held_out"] = evaluate(model, texts, labels, threshold)
+        report["threshold_sweep"] = [evaluate(model, texts, labels, t) for t in (0.5, 0.7, 0.85, 0.95)]
+    out = out or model_path()
+    model.save(out)
+    report["model_path"] = out
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="model file (default: LOCAL_CLASSIFIER_MODEL_PATH)")
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=None)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--min-confidence", type=float, default=0.0, help="only train on labels at least this confident")
+    parser.add_argument(
+        "--include-unattributed",
+        action="store_true",
+        help="also use labels with no recorded classification source (only safe before a local model was deployed)",
+    )
+    args = parser.parse_args(argv)
+    db = SessionLocal()
+    try:
+        report = run(
+            db, args.out, args.test_fraction, args.threshold, args.epochs, args.min_confidence, args.include_unattributed
+        )
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
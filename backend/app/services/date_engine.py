@@ -0,0 +1,207 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from dateutil import parser as dateparser
+from dateutil.relativedelta import relativedelta
+
+from app.core.config import settings
+
+_MONTHS: Dict[str, int] = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3, "apr": 4, "april": 4,
+    "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7, "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9, "oct": 10, "october": 10, "nov": 11, "november": 11,
+    "dec": 12, "december": 12,
+}
+_NUMBER_WORDS: Dict[str, int] = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fourteen": 14, "fifteen": 15,
+    "twenty": 20, "twenty-one": 21, "twenty-eight": 28, "thirty": 30, "forty-five": 45,
+    "sixty": 60, "ninety": 90,
+}
+# Longest names first so "september" is not cut to "sep"
+_MONTH = "(" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\.?"
+_ORD = r"(?:st|nd|rd|th)?"
+
+# One pattern per format. Each is also used on its own (fullmatch) to parse a matched token.
+_PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    # 2025-03-10, 2025-03-10T09:30[:00]
+    "iso": re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2}))?)?", re.IGNORECASE),
+    # 03/10/2025, 3/10/25 (month first, as dateutil reads them)
+    "numeric": re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})"),
+    # March 10, 2025 / Mar. 10th 2025
+    "month_day": re.compile(_MONTH + r"\s+(\d{1,2})" + _ORD + r",?\s+(\d{4})", re.IGNORECASE),
+    # 10 March 2025 / 10th day of March, 2025 / 10th day of March (year from the anchor)
+    "day_month": re.compile(r"(\d{1,2})" + _ORD + r"\s+(day\s+of\s+)?" + _MONTH + r"(?:,?\s+(\d{4}))?", re.IGNORECASE),
+    # within 30 days / within thirty (30) calendar days / in 2 weeks / after 10 business days
+    "relative": re.compile(
+        r"(?:within|in|after)\s+(\d{1,3}|[a-z]+(?:-[a-z]+)?)\s*(?:\(\d{1,3}\)\s*)?"
+        r"((?:business|court|calendar)\s+days?|days?|weeks?|months?)"
+        r"(\s+(?:before|prior\s+to))?",
+        re.IGNORECASE,
+    ),
+    # Unusual layouts handed to dateutil: 10-Mar-2025, 10.03.2025, Mar-10-2025
+    "other": re.compile(r"\d{1,2}[-.][a-z]{3,9}[-.]\d{2,4}|\d{1,2}\.\d{1,2}\.\d{4}|[a-z]{3,9}-\d{1,2}-\d{4}", re.IGNORECASE),
+}
+# All formats in one alternation, scanned once per document; earlier formats win at a position
+_SCANNER = re.compile(
+    "|".join(rf"\b(?P<{kind}>{pattern.pattern})\b" for kind, pattern in _PATTERNS.items()),
+    re.IGNORECASE,
+)
+# Positional groups of each kind are re-numbered inside the scanner, so tokens are re-parsed
+# with their own pattern; the LRU makes that (and dateutil) a one-time cost per distinct string.
+_ANCHORED = {"relative"}
+
+
+@dataclass(frozen=True)
+class DateMatch:
+    value: datetime
+    start: int  # character span of the matched text
+    end: int
+    text: str
+    kind: str  # iso | numeric | month_day | day_month | relative | other
+
+    @property
+    def span_ref(self) -> str:
+        return f"chars {self.start}-{self.end}"
+
+
+def _year(raw: str) -> int:
+    year = int(raw)
+    if year < 100:
+        # Two-digit years: the century that puts the date within 50 years of today
+        year += 2000
+        if year > datetime.utcnow().year + 50:
+            year -= 100
+    return year
+
+
+def _safe(year: int, month: int, day: int, *time: int) -> Optional[datetime]:
+    try:
+        return datetime(year, month, day, *time)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=settings.DATE_PARSE_CACHE_SIZE)
+def _parse_token(kind: str, token: str) -> Tuple[Optional[datetime], bool]:
+    """(value, needs_year) for one absolute date token. Memoized per distinct string."""
+    if kind == "other":
+        return _dateutil(token), False
+    m = _PATTERNS[kind].fullmatch(token)
+    if not m:
+        return None, False
+    g = m.groups()
+    if kind == "iso":
+        time = [int(x) for x in g[3:] if x is not None]
+        return _safe(int(g[0]), int(g[1]), int(g[2]), *time), False
+    if kind == "numeric":
+        month, day = int(g[0]), int(g[1])
+        if month > 12 >= day:
+            month, day = day, month
+        return _safe(_year(g[2]), month, day), False
+    if kind == "month_day":
+        return _safe(int(g[2]), _MONTHS[g[0].lower()], int(g[1])), False
+    if kind == "day_month":
+        if g[3] is None:
+            # Only the formal "10th day of March" is trusted without a year
+            return (_safe(2000, _MONTHS[g[2].lower()], int(g[0])), True) if g[1] else (None, False)
+        return _safe(int(g[3]), _MONTHS[g[2].lower()], int(g[0])), False
+    return None, False
+
+
+def _dateutil(token: str) -> Optional[datetime]:
+    try:
+        return dateparser.parse(token)
+    except (ValueError, OverflowError):
+        return None
+
+
+def _add_business_days(start: datetime, days: int) -> datetime:
+    current = start
+    while days > 0:
+        current += timedelta(days=1)
+        if current.weekday() < 5:
+            days -= 1
+    return current
+
+
+def _resolve_relative(token: str, anchor: datetime) -> Optional[datetime]:
+    m = _PATTERNS["relative"].fullmatch(token)
+    if not m or m.group(3):
+        # "10 days before trial" is relative to an event we cannot place
+        return None
+    raw, unit = m.group(1).lower(), m.group(2).lower()
+    amount = int(raw) if raw.isdigit() else _NUMBER_WORDS.get(raw)
+    if not amount:
+        return None
+    if unit.startswith(("business", "court")):
+        return _add_business_days(anchor, amount)
+    unit = unit.split()[-1]
+    if unit.startswith("day"):
+        return anchor + timedelta(days=amount)
+    if unit.startswith("week"):
+        return anchor + timedelta(weeks=amount)
+    return anchor + relativedelta(months=amount)
+
+
+def find_dates(text: str, reference: Optional[datetime] = None, relative: bool = True) -> List[DateMatch]:
+    """Every date in `text` with its span, in document order, from a single scan.
+
+    Relative phrases ("within 30 days") and year-less "10th day of March" are resolved
+    against `reference`, or else the first absolute date in the text (typically the date of
+    the order or letter); without either they are skipped.
+    """
+    found: List[DateMatch] = []
+    pending: List[Tuple[str, re.Match]] = []
+    for m in _SCANNER.finditer(text or ""):
+        kind = m.lastgroup or ""
+        token = m.group(kind)
+        if kind in _ANCHORED:
+            if relative:
+                pending.append((kind, m))
+            continue
+        value, needs_year = _parse_token(kind, token)
+        if value is None:
+            continue
+        if needs_year:
+            pending.append((kind, m))
+            continue
+        found.append(DateMatch(value, m.start(kind), m.end(kind), token, kind))
+
+    anchor = reference or (found[0].value if found else None)
+    if pending and anchor is not None:
+        for kind, m in pending:
+            token = m.group(kind)
+            if kind == "relative":
+                value = _resolve_relative(token, anchor)
+            else:
+                base, _ = _parse_token(kind, token)
+                value = _safe(anchor.year, base.month, base.day) if base else None
+            if value is not None:
+                found.append(DateMatch(value, m.start(kind), m.end(kind), token, kind))
+        found.sort(key=lambda d: d.start)
+    return found
+
+
+@lru_cache(maxsize=settings.DATE_PARSE_CACHE_SIZE)
+def parse_date(value: str) -> Optional[datetime]:
+    """One date string (e.g. an LLM's date_iso): ISO and the scanner's formats first,
+    dateutil's fuzzy parser only for anything else."""
+    value = (value or "").strip()
+    if not value or value.lower() in {"none", "null"}:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    matches = find_dates(value, relative=False)
+    if matches:
+        return matches[0].value
+    try:
+        return dateparser.parse(value, fuzzy=True)
+    except (ValueError, OverflowError):
+        return None
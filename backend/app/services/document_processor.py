@@ -1,16 +1,23 @@
 from __future__ import annotations
+import functools
 import io
 import json
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import os
-import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import logging
 from sqlalchemy.orm import Session
 from fastapi.encoders import jsonable_encoder
 
+from celery import chain, group
+from celery.canvas import Signature
+
 from app.services.celery_app import celery_app
+from app.services.artifacts import get_artifact_store
 from app.core.config import settings
 from app.models.database import SessionLocal, Document
 from app.models.schemas import (
@@ -19,22 +26,33 @@ from app.models.schemas import (
     LegalObligation,
 )
 from app.agents.document_classifier import DocumentClassificationAgent
-from app.agents.parsers.court_parser import CourtParser
-from app.agents.parsers.insurance_parser import InsuranceParser
-from app.agents.parsers.medical_parser import MedicalParser
-from app.agents.parsers.settlement_parser import SettlementParser
-from app.agents.parsers.discovery_parser import DiscoveryParser
-from app.agents.parsers.employment_parser import EmploymentParser
-from app.agents.parsers.expert_parser import ExpertParser
-from app.agents.parsers.police_parser import PoliceParser
+from app.agents.parsers.base_parser import BaseParser
+from app.agents.parsers.registry import get_parser_registry
 from app.agents.date_validator import DateValidationAgent
 from app.agents.obligation_extractor import ObligationExtractorAgent
 from app.agents.calendar_integrator import CalendarIntegrationAgent
 from app.agents.human_escalation import HumanEscalationAgent
+from app.services.pdf_text import PAGE_BREAK, iter_pdf_pages, iter_pdf_pages_with_ocr, join_pages, ocr_image
+from app.services.previews import render_pdf_previews
+from app.services.extraction_cache import (
+    cache_key,
+    content_digest,
+    get_extraction_cache,
+    local_model_stamp,
+    payload_is_current,
+)
+from app.services.response_cache import invalidate_document
+from app.services.status_events import publish_status
+from app.services.metrics import (
+    current_record,
+    observe_document,
+    observe_queue_wait,
+    span,
+    timing_record,
+    with_current_context,
+)
 
-import pytesseract
 from PIL import Image
-import PyPDF2
 import docx
 
 logger = logging.getLogger(__name__)
@@ -48,13 +66,8 @@ logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
 
 def _extract_text_from_pdf(path: str) -> str:
     try:
-        texts = []
-        with open(path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                txt = page.extract_text() or ""
-                texts.append(txt)
-        return "\n".join(texts)
+        pages = iter_pdf_pages_with_ocr(path) if settings.OCR_ENABLED else iter_pdf_pages(path)
+        return join_pages(pages, sep="\n" + PAGE_BREAK)[0]
     except Exception:
         return ""
 
@@ -70,7 +83,7 @@ def _extract_text_from_docx(path: str) -> str:
 def _extract_text_from_image(path: str) -> str:
     try:
         img = Image.open(path)
-        return pytesseract.image_to_string(img)
+        return ocr_image(img)
     except Exception:
         return ""
 
@@ -91,163 +104,539 @@ def extract_text(path: str) -> str:
         return ""
 
 
-def _render_pdf_preview_images(path: str, max_pages: int = 2) -> List[str]:
-    """Render up to max_pages of a PDF to PNG images and return file paths. Best-effort.
-    Requires poppler for pdf2image; logs and returns [] on failure.
+def _extract(document_id: str, path: str) -> Tuple[str, List[str]]:
+    """Extract text and, for PDFs, render the first pages to in-memory previews.
+
+    Previews are downscaled and base64-encoded once here; the same data URLs are handed
+    to the classifier and every parser.
     """
+    with span("extract"):
+        text = extract_text(path)
+    previews: List[str] = []
+    if path.lower().endswith(".pdf"):
+        logger.info("Pipeline: PDF detected | doc_id=%s | path=%s", document_id, path)
+        with span("render"):
+            previews = [p.data_url for p in render_pdf_previews(path)]
+    else:
+        logger.info("Pipeline: non-PDF document | doc_id=%s | path=%s", document_id, path)
+    return text, previews
+
+
+def _classify(document_id: str, text: str, previews: List[str]) -> DocumentClassification:
+    classifier = DocumentClassificationAgent()
+    with span("classify"):
+        classification = classifier.classify(text, images=previews or None)
+    logger.info(
+        "Pipeline: classification | doc_id=%s | type=%s | confidence=%.2f | images=%d",
+        document_id,
+        getattr(classification, "document_type", "unknown"),
+        float(getattr(classification, "confidence_score", 0.0) or 0.0),
+        len(previews),
+    )
+    return classification
+
+
+_speculation_pool: Optional[ThreadPoolExecutor] = None
+_speculation_lock = threading.Lock()
+_generic_parser = BaseParser()
+
+
+def _speculation_executor() -> ThreadPoolExecutor:
+    global _speculation_pool
+    with _speculation_lock:
+        if _speculation_pool is None:
+            _speculation_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculative")
+        return _speculation_pool
+
+
+def _speculative_accept_types() -> set:
+    return {t.strip() for t in (settings.SPECULATIVE_ACCEPT_TYPES or "").split(",") if t.strip()}
+
+
+def _classify_with_speculation(
+    document_id: str, text: str, previews: List[str]
+) -> Tuple[DocumentClassification, Optional[Tuple[List[ExtractedDate], List[LegalObligation]]]]:
+    """Classify; with PIPELINE_SPECULATIVE_PARSE, run the generic LLM parser concurrently.
+
+    The speculative result is only waited for when the registry will use it for the
+    classified type; otherwise it is cancelled so the specialized parser starts right
+    away. A call that has already started cannot be cancelled and is still paid for, so
+    nothing is submitted unless some registered type could use the result.
+    """
+    if not settings.PIPELINE_SPECULATIVE_PARSE or not get_parser_registry().speculation_useful(
+        _speculative_accept_types()
+    ):
+        return _classify(document_id, text, previews), None
+    future = _speculation_executor().submit(with_current_context(_generic_parser.parse), text, previews or None)
+    classification = _classify(document_id, text, previews)
+    document_type = classification.document_type
+    if not get_parser_registry().accepts_speculative(document_type, document_type in _speculative_accept_types()):
+        future.cancel()
+        logger.info("Pipeline: speculative parse not used | doc_id=%s | type=%s", document_id, document_type)
+        return classification, None
     try:
-        from pdf2image import convert_from_path  # type: ignore
+        speculative = future.result()
     except Exception as e:
-        logger.info("pdf2image not available; skipping PDF image previews: %r", e)
-        return []
+        logger.warning("Pipeline: speculative parse failed | doc_id=%s | error=%r", document_id, e)
+        speculative = None
+    return classification, speculative
 
-    out_paths: List[str] = []
-    try:
-        tmp_dir = tempfile.mkdtemp(prefix="pdf_preview_", dir=settings.STORAGE_DIR)
-    except Exception:
-        tmp_dir = tempfile.mkdtemp(prefix="pdf_preview_")
-    try:
-        poppler_path = settings.POPPLER_PATH
+
+def _parse(
+    document_id: str,
+    classification: DocumentClassification,
+    text: str,
+    previews: List[str],
+    speculative: Optional[Tuple[List[ExtractedDate], List[LegalObligation]]] = None,
+) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    with span("parse"):
+        return _run_parsers(document_id, classification, text, previews, speculative)
+
+
+def _run_parsers(
+    document_id: str,
+    classification: DocumentClassification,
+    text: str,
+    previews: List[str],
+    speculative: Optional[Tuple[List[ExtractedDate], List[LegalObligation]]] = None,
+) -> Tuple[List[ExtractedDate], List[LegalObligation]]:
+    registry = get_parser_registry()
+    if not registry.supports(classification.document_type):
+        # Unknown or unsupported classification: escalate (no parser run, speculative result dropped)
+        logger.info(
+            "Pipeline: classification unsupported/unknown -> skipping parsers to trigger escalation | doc_id=%s",
+            document_id,
+        )
+        return [], []
+    if speculative is not None:
+        outcome = registry.parse(
+            classification.document_type,
+            text,
+            images=previews or None,
+            speculative=speculative,
+            accept_speculative=classification.document_type in _speculative_accept_types(),
+        )
         logger.info(
-            "PDF preview: rendering | file=%s | max_pages=%d | poppler_path=%s",
-            path,
-            max_pages,
-            poppler_path or "(default)",
+            "Pipeline: parser result (speculative) | doc_id=%s | dates=%d | obligations=%d | timings_ms=%s",
+            document_id,
+            len(outcome.dates),
+            len(outcome.obligations),
+            {name: round(sec * 1000, 1) for name, sec in outcome.timings.items()},
         )
-        kwargs = dict(first_page=1, last_page=max_pages)
-        if poppler_path:
-            kwargs["poppler_path"] = poppler_path
-        images = convert_from_path(path, **kwargs)
-        for idx, img in enumerate(images, start=1):
-            out_path = os.path.join(tmp_dir, f"page_{idx}.png")
-            img.save(out_path, format="PNG")
-            out_paths.append(out_path)
-        logger.info("PDF preview: rendered %d image(s) at %s", len(out_paths), tmp_dir)
+        return outcome.dates, outcome.obligations
+    logger.info(
+        "Pipeline: invoking parsers | doc_id=%s | parsers=%s | images=%d",
+        document_id,
+        ",".join(p.name for p in registry.parsers_for(classification.document_type)),
+        len(previews),
+    )
+    outcome = registry.parse(classification.document_type, text, images=previews or None)
+    logger.info(
+        "Pipeline: parser result | doc_id=%s | dates=%d | obligations=%d | timings_ms=%s",
+        document_id,
+        len(outcome.dates),
+        len(outcome.obligations),
+        {name: round(sec * 1000, 1) for name, sec in outcome.timings.items()},
+    )
+    return outcome.dates, outcome.obligations
+
+
+def _status_ref(doc: Document) -> dict:
+    return {"document_id": doc.id, "batch_id": doc.batch_id, "case_id": doc.case_id}
+
+
+def _publish(ref: Optional[dict], status: str, stage: Optional[str] = None) -> None:
+    """Stage transition event for SSE subscribers; `ref` is a status ref or stage ctx."""
+    if ref:
+        publish_status(ref["document_id"], status, stage=stage, batch_id=ref.get("batch_id"), case_id=ref.get("case_id"))
+
+
+def _extract_classify_parse(
+    document_id: str, path: str, ref: Optional[dict] = None
+) -> Tuple[str, DocumentClassification, List[ExtractedDate], List[LegalObligation]]:
+    """Case-independent part of the pipeline: text extraction, previews, classification and parsing."""
+    text, previews = _extract(document_id, path)
+    _publish(ref, "processing", "classify")
+    classification, speculative = _classify_with_speculation(document_id, text, previews)
+    _publish(ref, "processing", "parse")
+    dates, obs = _parse(document_id, classification, text, previews, speculative=speculative)
+    return text, classification, dates, obs
+
+
+def _lookup_extraction_cache(
+    document_id: str, path: str, digest: Optional[str] = None
+) -> Tuple[Optional[str], Optional[dict]]:
+    """Identical bytes under the same pipeline version reuse the case-independent results.
+    `digest` is the SHA-256 computed at upload time, if any; otherwise the file is hashed here.
+    """
+    cache = get_extraction_cache()
+    if not cache:
+        return None, None
+    try:
+        key = cache_key(digest or content_digest(path))
+        payload = cache.get(key)
+        if payload is not None and not payload_is_current(payload):
+            # Classified by a local model that has since been replaced
+            cache.invalidate(key)
+            return key, None
+        return key, payload
+    except Exception as e:
+        logger.warning("Pipeline: extraction cache lookup failed | doc_id=%s | error=%r", document_id, e)
+        return None, None
+
+
+def _store_extraction_cache(
+    document_id: str,
+    key: Optional[str],
+    text: str,
+    classification: DocumentClassification,
+    dates: List[ExtractedDate],
+    obs: List[LegalObligation],
+) -> None:
+    cache = get_extraction_cache()
+    # Escalation fallbacks (no LLM, failed call) are not worth pinning in the cache
+    if not cache or not key or classification.document_type == "unknown":
+        return
+    try:
+        cache.put(key, _extraction_payload(text, classification, dates, obs))
     except Exception as e:
-        logger.info("PDF preview: rendering failed; continuing without images: %r", e)
-    return out_paths
+        logger.warning("Pipeline: extraction cache store failed | doc_id=%s | error=%r", document_id, e)
+
+
+def _extraction_payload(
+    text: str, classification: DocumentClassification, dates: List[ExtractedDate], obs: List[LegalObligation]
+) -> dict:
+    return {
+        "text": text,
+        "classification": jsonable_encoder(classification),
+        "dates": jsonable_encoder(dates),
+        "obligations": jsonable_encoder(obs),
+        "local_model": local_model_stamp(classification.source),
+    }
+
+
+def _load_cached_extraction(
+    payload: dict,
+) -> Tuple[str, DocumentClassification, List[ExtractedDate], List[LegalObligation]]:
+    return (
+        payload.get("text") or "",
+        DocumentClassification(**payload["classification"]),
+        [ExtractedDate(**d) for d in payload.get("dates") or []],
+        [LegalObligation(**o) for o in payload.get("obligations") or []],
+    )
+
+
+def _validate_and_collect_obligations(
+    text: str, classification: DocumentClassification, dates: List[ExtractedDate], obs: List[LegalObligation]
+) -> Tuple[List[ExtractedDate], List[str], List[LegalObligation]]:
+    with span("validate"):
+        validator = DateValidationAgent()
+        valid_dates, warnings = validator.validate(dates)
+
+        obligation_agent = ObligationExtractorAgent()
+        extracted_obligations = obligation_agent.extract(text, classification)
+    return valid_dates, warnings, obs + extracted_obligations
+
+
+def _integrate_and_persist(
+    db: Session,
+    doc: Document,
+    classification: DocumentClassification,
+    valid_dates: List[ExtractedDate],
+    obligations: List[LegalObligation],
+    warnings: List[str],
+) -> None:
+    calendar_agent = CalendarIntegrationAgent()
+    with span("calendar"):
+        conflicts = calendar_agent.integrate(db, doc.case_id, valid_dates, document_id=doc.id)
+    for conflict in conflicts:
+        logger.info("Pipeline: calendar conflict | doc_id=%s | case_id=%s | %s", doc.id, doc.case_id, conflict)
+
+    # decide if human review is needed
+    human_agent = HumanEscalationAgent()
+    needs_review, review_msgs = human_agent.evaluate(classification, valid_dates, obligations, warnings)
+    # Conflicts are reported with the results but do not by themselves require review
+    review_msgs = review_msgs + conflicts
+
+    # Persist results
+    persist_started = time.perf_counter()
+    doc.classification = jsonable_encoder(classification)
+    doc.extracted_dates = jsonable_encoder(valid_dates)
+    doc.obligations = jsonable_encoder(obligations)
+    doc.document_type = classification.document_type
+    doc.classification_source = classification.source
+    doc.confidence_score = classification.confidence_score
+    doc.date_count = len(valid_dates)
+    doc.obligation_count = len(obligations)
+    doc.human_review_required = needs_review
+    doc.error_messages = review_msgs
+    doc.status = "needs_review" if needs_review else "completed"
+    record = current_record()
+    if record is not None:
+        # Stored with the results, so persist_ms here covers the work up to the commit;
+        # the commit itself is in the stage histogram
+        doc.timings = _finish_record(record, doc.status, time.perf_counter() - persist_started)
+    with span("persist"):
+        db.commit()
+    invalidate_document(doc.id, doc.case_id)
+    _publish(_status_ref(doc), doc.status)
+
+
+def _finish_record(record: dict, status: str, persist_seconds: float = 0.0) -> dict:
+    if persist_seconds:
+        record["persist_ms"] = round(record.get("persist_ms", 0.0) + persist_seconds * 1000.0, 1)
+    observe_document(status, record)
+    return dict(record)
+
+
+def _timed_task(fn):
+    """Give a pipeline task a per-document timing record. Staged tasks continue the record
+    carried in their ctx, so the persisted record spans every stage."""
+
+    @functools.wraps(fn)
+    def wrapper(arg):
+        initial = arg.get("timings") if isinstance(arg, dict) else None
+        with timing_record(initial):
+            return fn(arg)
+
+    return wrapper
+
+
+def _observe_queue_wait(doc: Document) -> None:
+    queued_at = doc.updated_at or doc.created_at
+    if doc.status == "queued" and queued_at is not None:
+        observe_queue_wait((datetime.utcnow() - queued_at).total_seconds())
+
+
+def _mark_failed(db: Session, document_id: str, e: Exception) -> None:
+    logger.exception("Processing failed: %s", e)
+    try:
+        db.rollback()
+        doc = db.get(Document, document_id)
+        if doc:
+            doc.status = "failed"
+            doc.error_messages = [str(e)]
+            record = current_record()
+            if record is not None:
+                doc.timings = _finish_record(record, "failed")
+            db.commit()
+            invalidate_document(doc.id)
+            _publish(_status_ref(doc), "failed")
+    except Exception:  # pragma: no cover
+        pass
 
 
 @celery_app.task(name="process_document_task")
+@_timed_task
 def process_document_task(document_id: str) -> None:
     db: Session = SessionLocal()
-    preview_paths: List[str] = []
     try:
         doc: Document = db.get(Document, document_id)
         if not doc:
             logger.error("Document not found: %s", document_id)
             return
+        _observe_queue_wait(doc)
         doc.status = "processing"
         db.commit()
+        ref = _status_ref(doc)
+        _publish(ref, "processing", "extract")
 
-        # Extract text
-        text = extract_text(doc.path)
-        # For PDFs, also render first pages to images
-        if doc.path.lower().endswith(".pdf"):
-            logger.info("Pipeline: PDF detected | doc_id=%s | path=%s", document_id, doc.path)
-            preview_paths = _render_pdf_preview_images(doc.path, max_pages=2)
+        key, cached = _lookup_extraction_cache(document_id, doc.path, doc.content_sha256)
+        if cached:
+            logger.info("Pipeline: extraction cache hit | doc_id=%s", document_id)
+            text, classification, dates, obs = _load_cached_extraction(cached)
         else:
-            logger.info("Pipeline: non-PDF document | doc_id=%s | path=%s", document_id, doc.path)
+            text, classification, dates, obs = _extract_classify_parse(document_id, doc.path, ref)
+            _store_extraction_cache(document_id, key, text, classification, dates, obs)
+        _publish(ref, "processing", "persist")
 
-        # Agents pipeline
-        classifier = DocumentClassificationAgent()
-        classification = classifier.classify(text, images=preview_paths or None)
-        logger.info(
-            "Pipeline: classification | doc_id=%s | type=%s | confidence=%.2f | images=%d",
-            document_id,
-            getattr(classification, "document_type", "unknown"),
-            float(getattr(classification, "confidence_score", 0.0) or 0.0),
-            len(preview_paths),
-        )
+        valid_dates, warnings, obligations = _validate_and_collect_obligations(text, classification, dates, obs)
+        _integrate_and_persist(db, doc, classification, valid_dates, obligations, warnings)
+    except Exception as e:
+        _mark_failed(db, document_id, e)
+    finally:
+        db.close()
 
-        parser_dates: List[ExtractedDate] = []
-        obligations: List[LegalObligation] = []
 
-        if classification.document_type == "court_order":
-            logger.info(
-                "Pipeline: invoking parser | doc_id=%s | parser=CourtParser | images=%d",
-                document_id,
-                len(preview_paths),
-            )
-            dates, obs = CourtParser().parse(text, images=preview_paths or None)
-            logger.info(
-                "Pipeline: parser result | parser=CourtParser | dates=%d | obligations=%d",
-                len(dates),
-                len(obs),
+# --- Staged pipeline -------------------------------------------------------------------
+# Each stage receives a small context of ids and artifact references and returns it
+# extended for the next stage. A failed stage marks the document failed and returns None,
+# which the remaining stages pass through. Queue routing lives in celery_app.
+
+
+def _load_previews(store, ctx: dict) -> List[str]:
+    return store.get_json(ctx["previews"]) if ctx.get("previews") else []
+
+
+def _fail_stage(document_id: str, stage: str, e: Exception) -> None:
+    logger.warning("Pipeline: stage %s failed | doc_id=%s", stage, document_id)
+    db: Session = SessionLocal()
+    try:
+        _mark_failed(db, document_id, e)
+    finally:
+        db.close()
+    get_artifact_store().discard(document_id)
+
+
+@celery_app.task(name="pipeline.extract")
+@_timed_task
+def extract_stage(document_id: str) -> Optional[dict]:
+    store = get_artifact_store()
+    db: Session = SessionLocal()
+    try:
+        doc: Document = db.get(Document, document_id)
+        if not doc:
+            logger.error("Document not found: %s", document_id)
+            return None
+        _observe_queue_wait(doc)
+        doc.status = "processing"
+        db.commit()
+        path = doc.path
+        digest = doc.content_sha256
+        ref = _status_ref(doc)
+    except Exception as e:
+        _mark_failed(db, document_id, e)
+        return None
+    finally:
+        db.close()
+
+    _publish(ref, "processing", "extract")
+    try:
+        ctx: dict = dict(ref)
+        ctx["timings"] = current_record()
+        key, cached = _lookup_extraction_cache(document_id, path, digest)
+        ctx["cache_key"] = key
+        if cached:
+            logger.info("Pipeline: extraction cache hit | doc_id=%s", document_id)
+            ctx["text"] = store.put_text(document_id, "text.txt", cached.get("text") or "")
+            ctx["classification"] = store.put_json(document_id, "classification.json", cached["classification"])
+            ctx["parsed"] = store.put_json(
+                document_id, "parsed.json", {"dates": cached.get("dates") or [], "obligations": cached.get("obligations") or []}
             )
-        elif classification.document_type == "insurance_correspondence":
-            logger.info("Pipeline: invoking parser | doc_id=%s | parser=InsuranceParser", document_id)
-            dates, obs = InsuranceParser().parse(text)
-            logger.info("Pipeline: parser result | parser=InsuranceParser | dates=%d | obligations=%d", len(dates), len(obs))
-        elif classification.document_type == "medical_records":
-            logger.info("Pipeline: invoking parser | doc_id=%s | parser=MedicalParser", document_id)
-            dates, obs = MedicalParser().parse(text)
-            logger.info("Pipeline: parser result | parser=MedicalParser | dates=%d | obligations=%d", len(dates), len(obs))
-        elif classification.document_type == "settlement_communication":
-            logger.info("Pipeline: invoking parser | doc_id=%s | parser=SettlementParser", document_id)
-            dates, obs = SettlementParser().parse(text)
-            logger.info("Pipeline: parser result | parser=SettlementParser | dates=%d | obligations=%d", len(dates), len(obs))
-        elif classification.document_type == "discovery_request":
-            logger.info("Pipeline: invoking parser | doc_id=%s | parser=DiscoveryParser", document_id)
-            dates, obs = DiscoveryParser().parse(text)
-            logger.info("Pipeline: parser result | parser=DiscoveryParser | dates=%d | obligations=%d", len(dates), len(obs))
-        elif classification.document_type == "employment_records":
-            logger.info("Pipeline: invoking parser | doc_id=%s | parser=EmploymentParser", document_id)
-            dates, obs = EmploymentParser().parse(text)
-            logger.info("Pipeline: parser result | parser=EmploymentParser | dates=%d | obligations=%d", len(dates), len(obs))
-        elif classification.document_type == "expert_witness_report":
-            logger.info("Pipeline: invoking parser | doc_id=%s | parser=ExpertParser", document_id)
-            dates, obs = ExpertParser().parse(text)
-            logger.info("Pipeline: parser result | parser=ExpertParser | dates=%d | obligations=%d", len(dates), len(obs))
-        elif classification.document_type == "police_report":
-            logger.info("Pipeline: invoking parser | doc_id=%s | parser=PoliceParser", document_id)
-            dates, obs = PoliceParser().parse(text)
-            logger.info("Pipeline: parser result | parser=PoliceParser | dates=%d | obligations=%d", len(dates), len(obs))
-        else:
-            # Unknown or unsupported classification: escalate (no parser run)
-            logger.info(
-                "Pipeline: classification unsupported/unknown -> skipping parsers to trigger escalation | doc_id=%s",
+            ctx["cached"] = True
+            ctx["previews"] = None
+            return ctx
+        text, previews = _extract(document_id, path)
+        ctx["text"] = store.put_text(document_id, "text.txt", text)
+        ctx["previews"] = store.put_json(document_id, "previews.json", previews) if previews else None
+        return ctx
+    except Exception as e:
+        _fail_stage(document_id, "extract", e)
+        return None
+
+
+@celery_app.task(name="pipeline.classify")
+@_timed_task
+def classify_stage(ctx: Optional[dict]) -> Optional[dict]:
+    if not ctx or ctx.get("classification"):
+        return ctx
+    store = get_artifact_store()
+    document_id = ctx["document_id"]
+    _publish(ctx, "processing", "classify")
+    try:
+        text = store.get_text(ctx["text"])
+        classification, speculative = _classify_with_speculation(document_id, text, _load_previews(store, ctx))
+        ctx["classification"] = store.put_json(document_id, "classification.json", jsonable_encoder(classification))
+        if speculative is not None:
+            ctx["speculative"] = store.put_json(
                 document_id,
+                "speculative.json",
+                {"dates": jsonable_encoder(speculative[0]), "obligations": jsonable_encoder(speculative[1])},
             )
-            dates, obs = [], []
+        return ctx
+    except Exception as e:
+        _fail_stage(document_id, "classify", e)
+        return None
 
-        validator = DateValidationAgent()
-        valid_dates, warnings = validator.validate(dates)
 
-        obligation_agent = ObligationExtractorAgent()
-        extracted_obligations = obligation_agent.extract(text, classification)
-        obligations = obs + extracted_obligations
-
-        calendar_agent = CalendarIntegrationAgent()
-        calendar_agent.integrate(db, doc.case_id, valid_dates)
-
-        # decide if human review is needed
-        human_agent = HumanEscalationAgent()
-        needs_review, review_msgs = human_agent.evaluate(classification, valid_dates, obligations, warnings)
-
-        # Persist results
-        doc.classification = jsonable_encoder(classification)
-        doc.extracted_dates = jsonable_encoder(valid_dates)
-        doc.obligations = jsonable_encoder(obligations)
-        doc.human_review_required = needs_review
-        doc.error_messages = review_msgs
-        doc.status = "needs_review" if needs_review else "completed"
-        db.commit()
+@celery_app.task(name="pipeline.parse")
+@_timed_task
+def parse_stage(ctx: Optional[dict]) -> Optional[dict]:
+    if not ctx:
+        return ctx
+    store = get_artifact_store()
+    document_id = ctx["document_id"]
+    _publish(ctx, "processing", "parse")
+    try:
+        text = store.get_text(ctx["text"])
+        classification = DocumentClassification(**store.get_json(ctx["classification"]))
+        if ctx.get("parsed"):
+            parsed = store.get_json(ctx["parsed"])
+            dates = [ExtractedDate(**d) for d in parsed.get("dates") or []]
+            obs = [LegalObligation(**o) for o in parsed.get("obligations") or []]
+        else:
+            speculative = None
+            if ctx.get("speculative"):
+                raw = store.get_json(ctx["speculative"])
+                speculative = (
+                    [ExtractedDate(**d) for d in raw.get("dates") or []],
+                    [LegalObligation(**o) for o in raw.get("obligations") or []],
+                )
+            dates, obs = _parse(document_id, classification, text, _load_previews(store, ctx), speculative=speculative)
+            _store_extraction_cache(document_id, ctx.get("cache_key"), text, classification, dates, obs)
+
+        valid_dates, warnings, obligations = _validate_and_collect_obligations(text, classification, dates, obs)
+        ctx["results"] = store.put_json(
+            document_id,
+            "results.json",
+            {
+                "valid_dates": jsonable_encoder(valid_dates),
+                "warnings": warnings,
+                "obligations": jsonable_encoder(obligations),
+            },
+        )
+        return ctx
+    except Exception as e:
+        _fail_stage(document_id, "parse", e)
+        return None
+
+
+@celery_app.task(name="pipeline.persist")
+@_timed_task
+def persist_stage(ctx: Optional[dict]) -> None:
+    if not ctx:
+        return None
+    store = get_artifact_store()
+    document_id = ctx["document_id"]
+    _publish(ctx, "processing", "persist")
+    db: Session = SessionLocal()
+    try:
+        doc: Document = db.get(Document, document_id)
+        if not doc:
+            logger.error("Document not found: %s", document_id)
+            return None
+        classification = DocumentClassification(**store.get_json(ctx["classification"]))
+        results = store.get_json(ctx["results"])
+        valid_dates = [ExtractedDate(**d) for d in results.get("valid_dates") or []]
+        obligations = [LegalObligation(**o) for o in results.get("obligations") or []]
+        _integrate_and_persist(db, doc, classification, valid_dates, obligations, results.get("warnings") or [])
+        store.discard(document_id)
     except Exception as e:
-        logger.exception("Processing failed: %s", e)
-        try:
-            doc = db.get(Document, document_id)
-            if doc:
-                doc.status = "failed"
-                doc.error_messages = [str(e)]
-                db.commit()
-        except Exception:  # pragma: no cover
-            pass
+        _mark_failed(db, document_id, e)
+        store.discard(document_id)
     finally:
         db.close()
-        # cleanup preview images
-        for p in preview_paths:
-            try:
-                os.remove(p)
-            except Exception:
-                pass
+    return None
+
+
+def document_pipeline(document_id: str) -> Signature:
+    """Celery signature that processes one document according to PIPELINE_MODE."""
+    if (settings.PIPELINE_MODE or "inline").lower() == "staged":
+        return chain(
+            extract_stage.si(document_id),
+            classify_stage.s(),
+            parse_stage.s(),
+            persist_stage.s(),
+        )
+    return process_document_task.si(document_id)
+
+
+def dispatch_document(document_id: str) -> None:
+    document_pipeline(document_id).apply_async()
+
+
+def dispatch_documents(document_ids: List[str]) -> None:
+    """Dispatch many documents with a single group publish."""
+    if not document_ids:
+        return
+    group(document_pipeline(doc_id) for doc_id in document_ids).apply_async()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.core.config import settings
+from app.agents.local_classifier import model_version as local_classifier_version
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("PIPELINE_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+# Bump when extract_text / preview rendering changes in a way that alters its output
+EXTRACTOR_VERSION = "4"
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def content_digest(path: str) -> str:
+    """SHA-256 of the file bytes, streamed so large uploads are not loaded into memory."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def pipeline_fingerprint() -> str:
+    """Everything besides the document bytes that determines the cached output.
+
+    The local classifier is not part of it: only entries it classified depend on the
+    model, and those are checked against the deployed model on read (payload_is_current).
+    """
+    return (
+        f"{EXTRACTOR_VERSION}|{settings.PIPELINE_VERSION}|{settings.OPENAI_MODEL}"
+        f"|{settings.PREVIEW_MAX_PAGES}:{settings.PREVIEW_MAX_DIMENSION}:{settings.PREVIEW_FORMAT}:{settings.PREVIEW_QUALITY}"
+        f"|ocr:{settings.OCR_ENABLED}:{settings.OCR_DPI}:{settings.OCR_MIN_TEXT_CHARS}"
+        f"|tokens:{settings.CLASSIFIER_TEXT_TOKENS}:{settings.PARSER_TEXT_TOKENS}"
+        f"|chunks:{settings.PARSER_MAP_REDUCE}:{settings.PARSER_CHUNK_TOKENS}:{settings.PARSER_CHUNK_OVERLAP_TOKENS}"
+        f":{settings.PARSER_MAX_CHUNKS}"
+        f"|strategies:{settings.PARSER_LLM_STRATEGY_TYPES}"
+        f"|speculative:{settings.PIPELINE_SPECULATIVE_PARSE}:{settings.SPECULATIVE_ACCEPT_TYPES}"
+    )
+
+
+def local_model_stamp(classification_source: Optional[str]) -> Optional[str]:
+    """Model identity to store with an entry, for entries the local classifier produced."""
+    return local_classifier_version() if classification_source == "local" else None
+
+
+def payload_is_current(payload: dict) -> bool:
+    """False for entries classified by a local model other than the deployed one."""
+    source = (payload.get("classification") or {}).get("source")
+    return source != "local" or payload.get("local_model") == local_classifier_version()
+
+
+def cache_key(digest: str) -> str:
+    return hashlib.sha256(f"{digest}|{pipeline_fingerprint()}".encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """SQLite-backed, size-bounded cache of per-document extraction results.
+
+    Entries are keyed by content digest plus pipeline fingerprint, so a prompt/model
+    change never serves stale output; `purge_stale` reclaims the space those entries use.
+    Eviction is least-recently-used once the stored payloads exceed `max_bytes`.
+    """
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS extraction_cache ("
+                " key TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_extraction_cache_access ON extraction_cache (last_access)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload FROM extraction_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE extraction_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+        try:
+            return json.loads(row[0])
+        except Exception:
+            return None
+
+    def put(self, key: str, payload: dict) -> None:
+        data = json.dumps(payload)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extraction_cache (key, fingerprint, payload, size, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, pipeline_fingerprint(), data, len(data), now, now),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extraction_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        removed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM extraction_cache ORDER BY last_access ASC"):
+            victims.append((key,))
+            removed += size
+            if removed >= excess:
+                break
+        conn.executemany("DELETE FROM extraction_cache WHERE key = ?", victims)
+        logger.info("Extraction cache: evicted %d entr(ies) | freed_bytes=%d", len(victims), removed)
+
+    def purge_stale(self) -> int:
+        """Drop entries written under a different pipeline fingerprint (old prompts/models)."""
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM extraction_cache WHERE fingerprint != ?", (pipeline_fingerprint(),))
+            return cur.rowcount
+
+    def invalidate(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM extraction_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM extraction_cache")
+
+
+_cache: Optional[ExtractionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Process-wide cache instance, or None when disabled or unusable."""
+    global _cache
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            path = settings.EXTRACTION_CACHE_PATH or os.path.join(settings.STORAGE_DIR, "extraction_cache.sqlite3")
+            try:
+                _cache = ExtractionCache(path, settings.EXTRACTION_CACHE_MAX_BYTES)
+                purged = _cache.purge_stale()
+                if purged:
+                    logger.info("Extraction cache: purged %d stale entr(ies)", purged)
+            except Exception as e:
+                logger.warning("Extraction cache unavailable; continuing without it: %r", e)
+                return None
+        return _cache
@@ -0,0 +1,124 @@
+from __future__ import annotations
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+_lock = threading.Lock()
+_vocabulary: Set[str] = set()
+_automaton: Optional["_Automaton"] = None
+
+
+class KeywordIndex:
+    """Start offsets of every registered phrase found in one text (case-insensitive)."""
+
+    def __init__(self, hits: Dict[str, List[int]], vocabulary: FrozenSet[str]) -> None:
+        self.hits = hits
+        self.vocabulary = vocabulary
+
+    def _check(self, phrase: str) -> str:
+        if phrase not in self.vocabulary:
+            raise ValueError(f"keyword not registered: {phrase!r}")
+        return phrase
+
+    def has(self, *phrases: str) -> bool:
+        return any(self._check(p) in self.hits for p in phrases)
+
+    def positions(self, phrase: str) -> List[int]:
+        return self.hits.get(self._check(phrase), [])
+
+
+class _Automaton:
+    """All phrases in one compiled regex, factored as a trie so each offset costs one
+    character-class test, scanned once over the lowercased text. Phrases match as substrings, like the parsers' `in lower` checks.
+
+    A match hides phrases inside it, so each phrase carries the phrases it contains, and
+    the scan resumes early only where a longer phrase could start inside the match.
+    """
+
+    def __init__(self, phrases: Iterable[str]) -> None:
+        self.vocabulary = frozenset(phrases)
+        ordered = sorted(self.vocabulary, key=lambda p: (-len(p), p))
+        self.pattern = re.compile(_trie_pattern(ordered)) if ordered else None
+        self.contained: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        self.resume: Dict[str, int] = {}
+        for p in ordered:
+            self.contained[p] = tuple(
+                (q, off) for q in ordered for off in _occurrences(p, q) if off + len(q) <= len(p)
+            )
+            self.resume[p] = next(
+                (off for off in range(1, len(p)) if any(len(q) > len(p) - off and q.startswith(p[off:]) for q in ordered)),
+                len(p),
+            )
+
+    def scan(self, text: str) -> KeywordIndex:
+        if self.pattern is None:
+            return KeywordIndex({}, self.vocabulary)
+        lower = text.lower()
+        found: Dict[str, Set[int]] = {}
+        search = self.pattern.search
+        pos = 0
+        while True:
+            m = search(lower, pos)
+            if m is None:
+                break
+            start, phrase = m.start(), m.group()
+            for q, off in self.contained[phrase]:
+                found.setdefault(q, set()).add(start + off)
+            pos = start + self.resume[phrase]
+        return KeywordIndex({q: sorted(v) for q, v in found.items()}, self.vocabulary)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching the longest of `words` at a position: "resp(?:ond(?: within)?|onse)"."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _occurrences(haystack: str, needle: str) -> List[int]:
+    out: List[int] = []
+    i = haystack.find(needle)
+    while i != -1:
+        out.append(i)
+        i = haystack.find(needle, i + 1)
+    return out
+
+
+def register_keywords(*phrases: str) -> None:
+    """Add phrases to the shared automaton. Agents call this at import with their tables."""
+    global _automaton
+    new = {p.lower() for p in phrases if p} - _vocabulary
+    if not new:
+        return
+    with _lock:
+        _vocabulary.update(new)
+        _automaton = None
+    keyword_index.cache_clear()
+
+
+def _get_automaton() -> _Automaton:
+    global _automaton
+    with _lock:
+        if _automaton is None:
+            _automaton = _Automaton(_vocabulary)
+        return _automaton
+
+
+@lru_cache(maxsize=4)
+def keyword_index(text: str) -> KeywordIndex:
+    """Scan `text` once. The parser and the obligation extractor receive the same string
+    object, so the second lookup is a cache hit (str hashes are cached on the object)."""
+    return _get_automaton().scan(text or "")
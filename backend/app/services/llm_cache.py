@@ -0,0 +1,293 @@
+from __future__ import annotations
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+from app.services.llm_client import llm_slot
+from app.services.metrics import observe_llm_call
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("PIPELINE_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+
+def _normalize_part(part: Any) -> Any:
+    """Replace inline image payloads by their digest so keys stay small and stable."""
+    if isinstance(part, dict) and part.get("type") == "image_url":
+        url = str((part.get("image_url") or {}).get("url") or "")
+        if url.startswith("data:"):
+            url = "sha256:" + hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return {"type": "image_url", "image_url": {"url": url}}
+    return part
+
+
+def make_cache_key(model: str, messages: List[dict], **params: Any) -> str:
+    """Hash of model, request parameters, system prompt, user text and image digests."""
+    normalized = []
+    for msg in messages:
+        content = msg.get("content")
+        if isinstance(content, list):
+            content = [_normalize_part(p) for p in content]
+        normalized.append({"role": msg.get("role"), "content": content})
+    blob = json.dumps({"model": model, "params": params, "messages": normalized}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SQLiteLLMCacheBackend:
+    """Local file backend with TTL expiry and LRU eviction beyond `max_entries`.
+
+    Hits are read-only: last_access is only rewritten once it is `touch_interval` seconds
+    old, so concurrent workers serving hits rarely contend for the write lock.
+    """
+
+    def __init__(self, path: str, max_entries: int, touch_interval: float = 300.0) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_access ON llm_cache (last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS llm_cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at, last_access FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            if now - row[2] >= self.touch_interval:
+                conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO llm_cache_stats (name, value) VALUES (?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, amount),
+            )
+
+    def counters(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            return {name: value for name, value in conn.execute("SELECT name, value FROM llm_cache_stats")}
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache")
+            conn.execute("DELETE FROM llm_cache_stats")
+
+
+class RedisLLMCacheBackend:
+    """Redis backend; entries expire via TTL and LRU is delegated to Redis' maxmemory-policy."""
+
+    prefix = "llmcache:"
+
+    def __init__(self, url: str) -> None:
+        import redis  # type: ignore
+
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._redis.get(self.prefix + key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self._redis.set(self.prefix + key, value, ex=ttl)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        self._redis.hincrby(self.prefix + "stats", name, amount)
+
+    def counters(self) -> Dict[str, int]:
+        raw = self._redis.hgetall(self.prefix + "stats") or {}
+        return {k.decode("utf-8"): int(v) for k, v in raw.items()}
+
+    def clear(self) -> None:
+        keys = list(self._redis.scan_iter(self.prefix + "*"))
+        if keys:
+            self._redis.delete(*keys)
+
+
+class LLMCache:
+    """Response cache in front of chat completions, with hit/miss counters.
+
+    Counters are kept per process and added to the backend in batches (every
+    `flush_every` lookups or `flush_seconds`, and before stats are read), so the API
+    process can report totals for work done in Celery workers without a backend write
+    on every lookup.
+    """
+
+    def __init__(self, backend: Any, ttl: int, flush_every: int = 100, flush_seconds: float = 30.0) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[str, int] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning("LLM cache get failed: %r", e)
+            value = None
+        self._record("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            logger.warning("LLM cache set failed: %r", e)
+
+    def _record(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+            self._pending[name] = self._pending.get(name, 0) + 1
+            due = (
+                sum(self._pending.values()) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Add this process's pending counter deltas to the shared backend counters."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        for name, amount in pending.items():
+            try:
+                self.backend.incr(name, amount)
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        self.flush()
+        try:
+            shared = self.backend.counters()
+        except Exception:
+            shared = {}
+        hits = int(shared.get("hits", 0))
+        misses = int(shared.get("misses", 0))
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": (hits / total) if total else 0.0,
+            "process_hits": self.hits,
+            "process_misses": self.misses,
+        }
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide cache instance per LLM_CACHE_BACKEND, or None when disabled/unavailable."""
+    global _cache
+    kind = (settings.LLM_CACHE_BACKEND or "none").lower()
+    if kind in {"", "none", "off", "false", "0"}:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                if kind == "redis":
+                    backend: Any = RedisLLMCacheBackend(settings.LLM_CACHE_REDIS_URL or settings.REDIS_URL)
+                elif kind == "sqlite":
+                    path = settings.LLM_CACHE_PATH or os.path.join(settings.STORAGE_DIR, "llm_cache.sqlite3")
+                    backend = SQLiteLLMCacheBackend(path, settings.LLM_CACHE_MAX_ENTRIES)
+                else:
+                    logger.warning("Unknown LLM_CACHE_BACKEND=%r; LLM cache disabled", kind)
+                    return None
+                _cache = LLMCache(backend, settings.LLM_CACHE_TTL_SECONDS)
+                atexit.register(_cache.flush)
+                logger.info("LLM cache initialized | backend=%s | ttl=%ds", kind, settings.LLM_CACHE_TTL_SECONDS)
+            except Exception as e:
+                logger.warning("LLM cache unavailable; calling the LLM directly: %r", e)
+                return None
+        return _cache
+
+
+def _is_json(content: str) -> bool:
+    try:
+        json.loads(content)
+        return True
+    except Exception:
+        return False
+
+
+def cached_chat_completion(client: Any, model: str, messages: List[dict], **params: Any) -> str:
+    """Return the message content of a chat completion, served from the cache when possible.
+
+    Only responses that parse as JSON are stored; every caller asks for JSON and a
+    malformed answer should be retried rather than pinned.
+    """
+    cache = get_llm_cache()
+    key = make_cache_key(model, messages, **params) if cache else None
+    if cache and key:
+        hit = cache.get(key)
+        if hit is not None:
+            logger.info("LLM cache hit | model=%s | key=%s", model, key[:12])
+            return hit
+
+    with llm_slot():
+        started = time.perf_counter()
+        try:
+            completion = client.chat.completions.create(model=model, messages=messages, **params)
+        except Exception:
+            observe_llm_call(model, time.perf_counter() - started, "error")
+            raise
+        observe_llm_call(model, time.perf_counter() - started, "ok", getattr(completion, "usage", None))
+    content = completion.choices[0].message.content or "{}"
+    if cache and key and _is_json(content):
+        cache.set(key, content)
+    return content
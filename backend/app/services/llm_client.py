@@ -0,0 +1,91 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("PIPELINE_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+_lock = threading.Lock()
+_client: Any = None
+_client_pid: Optional[int] = None
+_semaphore = threading.BoundedSemaphore(max(1, settings.LLM_MAX_CONCURRENCY))
+
+
+def get_openai_client() -> Any:
+    """Shared OpenAI client for this process, or None when no API key is configured.
+
+    One keep-alive connection pool per worker process; rebuilt after a fork so children
+    never share sockets with their parent.
+    """
+    global _client, _client_pid, _semaphore
+    api_key = settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            return _client
+        try:
+            import httpx
+            from openai import OpenAI  # type: ignore
+        except Exception as e:  # pragma: no cover
+            logger.info("LLM client unavailable (openai import failed): %r", e)
+            return None
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS),
+        )
+        _client = OpenAI(
+            api_key=api_key,
+            base_url=settings.OPENAI_BASE_URL or None,
+            http_client=http_client,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+        if _client_pid is not None:
+            _semaphore = threading.BoundedSemaphore(max(1, settings.LLM_MAX_CONCURRENCY))
+        _client_pid = os.getpid()
+        logger.info(
+            "LLM client initialized | pid=%d | base_url=%s | max_connections=%d | max_in_flight=%d",
+            _client_pid,
+            settings.OPENAI_BASE_URL or "(default)",
+            settings.LLM_MAX_CONNECTIONS,
+            settings.LLM_MAX_CONCURRENCY,
+        )
+        return _client
+
+
+def reset_openai_client() -> None:
+    """Drop the shared client (e.g. after changing settings in tests)."""
+    global _client, _client_pid, _semaphore
+    with _lock:
+        if _client is not None:
+            try:
+                _client.close()
+            except Exception:
+                pass
+        _client = None
+        _client_pid = None
+        _semaphore = threading.BoundedSemaphore(max(1, settings.LLM_MAX_CONCURRENCY))
+
+
+@contextmanager
+def llm_slot() -> Iterator[None]:
+    """Hold one of LLM_MAX_CONCURRENCY in-flight request slots for this process."""
+    sem = _semaphore
+    sem.acquire()
+    try:
+        yield
+    finally:
+        sem.release()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("PIPELINE_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+# Pipeline stages: extract, render, classify, parse, validate, calendar, persist
+STAGE_SECONDS = Histogram(
+    "docproc_stage_duration_seconds",
+    "Time spent in each pipeline stage",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+DOCUMENT_SECONDS = Histogram(
+    "docproc_document_duration_seconds",
+    "End-to-end processing time per document, excluding queue wait",
+    ["status"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "docproc_queue_wait_seconds",
+    "Time between a document being queued and a worker starting it",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600),
+)
+LLM_SECONDS = Histogram(
+    "docproc_llm_request_duration_seconds",
+    "Latency of LLM chat completion calls (cache hits excluded)",
+    ["model", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120),
+)
+LLM_TOKENS = Histogram(
+    "docproc_llm_tokens",
+    "Tokens per LLM call",
+    ["model", "kind"],
+    buckets=(100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000),
+)
+
+# Per-document timing record (milliseconds by stage) for the task running in this context
+_record: ContextVar[Optional[Dict[str, float]]] = ContextVar("timing_record", default=None)
+# Parser and map-reduce threads add to the same record concurrently
+_record_lock = threading.Lock()
+# Nested inside classify/parse, so not added to total_ms
+_NESTED_KEYS = ("queue_wait_ms", "llm_ms", "total_ms")
+
+
+def current_record() -> Optional[Dict[str, float]]:
+    return _record.get()
+
+
+def _add(record: Dict[str, float], key: str, amount: float, ndigits: int = 1) -> None:
+    with _record_lock:
+        record[key] = round(record.get(key, 0) + amount, ndigits)
+
+
+def with_current_context(fn: Callable) -> Callable:
+    """Wrap fn for a thread pool so it runs in (a copy of) the caller's context, and
+    spans and LLM calls in the worker thread land in the caller's timing record."""
+    context = copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def timing_record(initial: Optional[Dict[str, float]] = None) -> Iterator[Dict[str, float]]:
+    """Collect span durations into one dict. Staged tasks pass the record carried in their
+    ctx, which is then updated in place and travels on to the next stage."""
+    record: Dict[str, float] = initial if initial is not None else {}
+    token = _record.set(record)
+    try:
+        yield record
+    finally:
+        _record.reset(token)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time one stage: observed in the stage histogram and added to the current record."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.labels(stage=stage).observe(elapsed)
+        record = _record.get()
+        if record is not None:
+            _add(record, f"{stage}_ms", elapsed * 1000.0)
+        logger.debug("span | stage=%s | ms=%.1f", stage, elapsed * 1000.0)
+
+
+def observe_queue_wait(seconds: float) -> None:
+    seconds = max(0.0, seconds)
+    QUEUE_WAIT_SECONDS.observe(seconds)
+    record = _record.get()
+    if record is not None:
+        record["queue_wait_ms"] = round(seconds * 1000.0, 1)
+
+
+def observe_document(status: str, record: Dict[str, float]) -> None:
+    """Close a record: total of its stage spans, observed per final status."""
+    total_ms = sum(v for k, v in record.items() if k.endswith("_ms") and k not in _NESTED_KEYS)
+    record["total_ms"] = round(total_ms, 1)
+    DOCUMENT_SECONDS.labels(status=status).observe(total_ms / 1000.0)
+
+
+def observe_llm_call(model: str, seconds: float, outcome: str, usage: Any = None) -> None:
+    """One LLM round trip: histograms, plus llm_ms / llm_calls / token totals in the current
+    record. llm_ms sums concurrent calls, so it can exceed the wall-clock of its stage."""
+    LLM_SECONDS.labels(model=model, outcome=outcome).observe(seconds)
+    record = _record.get()
+    if record is not None:
+        _add(record, "llm_ms", seconds * 1000.0)
+        _add(record, "llm_calls", 1, 0)
+    for kind in ("prompt_tokens", "completion_tokens"):
+        value = getattr(usage, kind, None) if usage is not None else None
+        if isinstance(value, int):
+            LLM_TOKENS.labels(model=model, kind=kind.split("_")[0]).observe(value)
+            if record is not None:
+                _add(record, f"llm_{kind}", value, 0)
+
+
+class _StatusCollector:
+    def __init__(self, counts: Dict[str, int]) -> None:
+        self.counts = counts
+
+    def collect(self):
+        family = GaugeMetricFamily("docproc_documents", "Documents by processing status", labels=["status"])
+        for status, count in sorted(self.counts.items()):
+            family.add_metric([status or "unknown"], count)
+        yield family
+
+
+_status_lock = threading.Lock()
+_status_cache: Optional[Tuple[float, Dict[str, int]]] = None
+
+
+def cached_status_counts(load: Callable[[], Dict[str, int]], ttl: float) -> Dict[str, int]:
+    """Documents per status, re-counted at most once per `ttl` seconds across scrapes."""
+    global _status_cache
+    with _status_lock:
+        now = time.monotonic()
+        if _status_cache is None or ttl <= 0 or now - _status_cache[0] >= ttl:
+            _status_cache = (now, load())
+        return _status_cache[1]
+
+
+def render_metrics(status_counts: Dict[str, int]) -> Tuple[bytes, str]:
+    """Exposition text: this process's metrics (or all processes sharing
+    PROMETHEUS_MULTIPROC_DIR, e.g. API and Celery workers on one host) plus status counts."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    statuses = CollectorRegistry()
+    statuses.register(_StatusCollector(status_counts))
+    return generate_latest(registry) + generate_latest(statuses), CONTENT_TYPE_LATEST
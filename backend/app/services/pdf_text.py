@@ -0,0 +1,202 @@
+from __future__ import annotations
+import bisect
+import logging
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+import PyPDF2
+import pytesseract
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("PIPELINE_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+
+# Form feed between pages of extracted PDF text, so page numbers survive as a plain string
+PAGE_BREAK = "\f"
+
+@dataclass(frozen=True)
+class PageText:
+    page_number: int  # 1-based, as printed on citations
+    text: str
+    ocr: bool = False  # text came from OCR rather than the PDF text layer
+
+
+def pdf_page_count(path: str) -> int:
+    with open(path, "rb") as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def _extract_page_range(path: str, first_page: int, last_page: int) -> List[Tuple[int, str]]:
+    """Extract pages first_page..last_page (1-based, inclusive). Runs inside pool workers."""
+    out: List[Tuple[int, str]] = []
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for number in range(first_page, last_page + 1):
+            try:
+                txt = reader.pages[number - 1].extract_text() or ""
+            except Exception:
+                txt = ""
+            out.append((number, txt))
+    return out
+
+
+def _page_ranges(page_count: int, chunk: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + chunk - 1, page_count)) for start in range(1, page_count + 1, chunk)]
+
+
+def _iter_sequential(path: str) -> Iterator[PageText]:
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for number, page in enumerate(reader.pages, start=1):
+            try:
+                txt = page.extract_text() or ""
+            except Exception:
+                txt = ""
+            yield PageText(page_number=number, text=txt)
+
+
+def iter_pdf_pages(
+    path: str, workers: Optional[int] = None, pages_per_chunk: Optional[int] = None
+) -> Iterator[PageText]:
+    """Yield the text of every page in order.
+
+    With more than one worker, page ranges are extracted in a process pool and yielded as
+    each range completes (still in page order). Falls back to in-process extraction when a
+    pool cannot be started, e.g. inside daemonic Celery prefork children.
+    """
+    workers = workers or settings.PDF_EXTRACT_WORKERS
+    chunk = max(1, pages_per_chunk or settings.PDF_PAGES_PER_CHUNK)
+    if workers <= 1:
+        yield from _iter_sequential(path)
+        return
+
+    page_count = pdf_page_count(path)
+    ranges = _page_ranges(page_count, chunk)
+    if len(ranges) <= 1:
+        yield from _iter_sequential(path)
+        return
+
+    try:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
+    except Exception as e:
+        logger.info("PDF text: process pool unavailable; extracting in-process: %r", e)
+        yield from _iter_sequential(path)
+        return
+
+    logger.info("PDF text: parallel extraction | file=%s | pages=%d | workers=%d", path, page_count, workers)
+    last_yielded = 0
+    with executor:
+        try:
+            results = executor.map(
+                _extract_page_range,
+                [path] * len(ranges),
+                [r[0] for r in ranges],
+                [r[1] for r in ranges],
+            )
+            for page_chunk in results:
+                for number, txt in page_chunk:
+                    yield PageText(page_number=number, text=txt)
+                    last_yielded = number
+        except Exception as e:
+            # Resume in-process after the last page already handed out
+            logger.info("PDF text: process pool failed; extracting in-process from page %d: %r", last_yielded + 1, e)
+            for page in _iter_sequential(path):
+                if page.page_number > last_yielded:
+                    yield page
+
+
+def ocr_image(img) -> str:
+    return pytesseract.image_to_string(img)
+
+
+def page_needs_ocr(text: str, min_chars: Optional[int] = None) -> bool:
+    """True when a page has no usable text layer (scanned image or empty page)."""
+    threshold = settings.OCR_MIN_TEXT_CHARS if min_chars is None else min_chars
+    return sum(1 for ch in text if ch.isalnum()) < threshold
+
+
+def _ocr_pdf_page(path: str, page_number: int, dpi: int) -> str:
+    """Rasterize a single page and OCR it. Requires poppler for pdf2image."""
+    from pdf2image import convert_from_path  # type: ignore
+
+    kwargs = dict(dpi=dpi, first_page=page_number, last_page=page_number)
+    if settings.POPPLER_PATH:
+        kwargs["poppler_path"] = settings.POPPLER_PATH
+    images = convert_from_path(path, **kwargs)
+    return "\n".join(ocr_image(img) for img in images)
+
+
+def iter_pdf_pages_with_ocr(
+    path: str, dpi: Optional[int] = None, workers: Optional[int] = None
+) -> Iterator[PageText]:
+    """Like iter_pdf_pages, but pages without a text layer are rasterized and OCR'd.
+
+    Only the pages that need it are rendered. OCR runs in a thread pool (pdftoppm and
+    tesseract are subprocesses) while text-layer pages keep streaming; output stays in
+    page order and a page keeps its original text if OCR fails or yields nothing.
+    """
+    dpi = dpi or settings.OCR_DPI
+    workers = max(1, workers or settings.OCR_WORKERS)
+    try:
+        import pdf2image  # type: ignore  # noqa: F401
+    except Exception as e:
+        logger.info("pdf2image not available; skipping OCR of scanned pages: %r", e)
+        yield from iter_pdf_pages(path)
+        return
+
+    def _resolve(page: PageText, fut: Optional[Future]) -> PageText:
+        if fut is None:
+            return page
+        try:
+            txt = fut.result()
+        except Exception as e:
+            logger.info("OCR: page %d failed; keeping text layer: %r", page.page_number, e)
+            return page
+        if not txt.strip():
+            return page
+        return PageText(page_number=page.page_number, text=txt, ocr=True)
+
+    ocr_pages = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Tuple[PageText, Optional[Future]]] = deque()
+        for page in iter_pdf_pages(path):
+            fut = None
+            if page_needs_ocr(page.text):
+                fut = pool.submit(_ocr_pdf_page, path, page.page_number, dpi)
+                ocr_pages += 1
+            pending.append((page, fut))
+            while pending and (pending[0][1] is None or pending[0][1].done()):
+                yield _resolve(*pending.popleft())
+        while pending:
+            yield _resolve(*pending.popleft())
+    if ocr_pages:
+        logger.info("OCR: processed %d scanned page(s) | file=%s | dpi=%d", ocr_pages, path, dpi)
+
+
+def join_pages(pages: Iterable[PageText], sep: str = "\n") -> Tuple[str, List[int]]:
+    """Join page texts and return the character offset at which each page starts."""
+    texts: List[str] = []
+    offsets: List[int] = []
+    pos = 0
+    for page in pages:
+        offsets.append(pos)
+        texts.append(page.text)
+        pos += len(page.text) + len(sep)
+    return sep.join(texts), offsets
+
+
+def page_for_offset(offsets: List[int], offset: int) -> int:
+    """1-based page number containing the character offset of a joined document."""
+    if not offsets:
+        return 1
+    return max(1, bisect.bisect_right(offsets, offset))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import base64
+import io
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("PIPELINE_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+_FORMATS = {"jpeg": ("JPEG", "image/jpeg"), "jpg": ("JPEG", "image/jpeg"), "webp": ("WEBP", "image/webp"), "png": ("PNG", "image/png")}
+_EXT_MIME = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "tif": "image/tiff",
+    "tiff": "image/tiff",
+    "bmp": "image/bmp",
+}
+
+
+@dataclass(frozen=True)
+class PagePreview:
+    """One rendered page, already downscaled, encoded and base64'd for LLM image inputs."""
+
+    page_number: int
+    width: int
+    height: int
+    data_url: str
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data_url)
+
+
+def encode_preview(img: Any, page_number: int, max_dimension: Optional[int] = None, fmt: Optional[str] = None, quality: Optional[int] = None) -> PagePreview:
+    """Downscale a PIL image to fit max_dimension and encode it once as a data URL."""
+    max_dimension = max_dimension or settings.PREVIEW_MAX_DIMENSION
+    pil_format, mime = _FORMATS.get((fmt or settings.PREVIEW_FORMAT).lower(), _FORMATS["jpeg"])
+    quality = quality or settings.PREVIEW_QUALITY
+
+    if max(img.size) > max_dimension:
+        img = img.copy()
+        img.thumbnail((max_dimension, max_dimension))
+    if pil_format == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    save_kwargs = {"optimize": True} if pil_format == "PNG" else {"quality": quality}
+    img.save(buf, format=pil_format, **save_kwargs)
+    b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+    return PagePreview(page_number=page_number, width=img.size[0], height=img.size[1], data_url=f"data:{mime};base64,{b64}")
+
+
+def render_pdf_previews(path: str, max_pages: Optional[int] = None) -> List[PagePreview]:
+    """Render the first pages of a PDF in memory (no temp files). Best-effort: [] on failure.
+
+    pdftoppm scales pages into the max_dimension box while rasterizing, so full-resolution
+    bitmaps are never produced.
+    """
+    max_pages = max_pages or settings.PREVIEW_MAX_PAGES
+    try:
+        from pdf2image import convert_from_path  # type: ignore
+    except Exception as e:
+        logger.info("pdf2image not available; skipping PDF image previews: %r", e)
+        return []
+    try:
+        kwargs = dict(first_page=1, last_page=max_pages, size=settings.PREVIEW_MAX_DIMENSION)
+        if settings.POPPLER_PATH:
+            kwargs["poppler_path"] = settings.POPPLER_PATH
+        images = convert_from_path(path, **kwargs)
+        previews = [encode_preview(img, idx) for idx, img in enumerate(images, start=1)]
+        logger.info(
+            "PDF preview: rendered %d page(s) | file=%s | format=%s | bytes=%d",
+            len(previews),
+            path,
+            settings.PREVIEW_FORMAT,
+            sum(p.size_bytes for p in previews),
+        )
+        return previews
+    except Exception as e:
+        logger.info("PDF preview: rendering failed; continuing without images: %r", e)
+        return []
+
+
+def _file_data_url(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            b64 = base64.b64encode(f.read()).decode("utf-8")
+    except Exception:
+        return None
+    mime = _EXT_MIME.get(os.path.splitext(path)[1].lower().strip("."), "image/png")
+    return f"data:{mime};base64,{b64}"
+
+
+def as_data_urls(images: Optional[Iterable[Any]], max_images: Optional[int] = None) -> List[str]:
+    """Image inputs for LLM calls: previews and data URLs pass through; file paths are read."""
+    max_images = max_images or settings.PREVIEW_MAX_PAGES
+    urls: List[str] = []
+    for item in list(images or [])[:max_images]:
+        if isinstance(item, PagePreview):
+            urls.append(item.data_url)
+        elif isinstance(item, str) and item.startswith("data:"):
+            urls.append(item)
+        elif isinstance(item, str):
+            url = _file_data_url(item)
+            if url:
+                urls.append(url)
+    return urls
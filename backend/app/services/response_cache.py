@@ -0,0 +1,147 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("PIPELINE_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+
+def result_key(document_id: str) -> str:
+    return f"result:{document_id}"
+
+
+def calendar_key(case_id: str) -> str:
+    return f"calendar:{case_id}"
+
+
+class MemoryResponseBackend:
+    """Per-process LRU. Invalidations from workers cannot reach it; entries are checked
+    against the current ETag on every read, so a stale payload is never served."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(1, max_entries)
+        self._data: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, etag: str, payload: bytes, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (etag, payload)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisResponseBackend:
+    """Shared across API processes; pipeline workers delete entries when they write."""
+
+    prefix = "respcache:"
+
+    def __init__(self, url: str) -> None:
+        import redis  # type: ignore
+
+        self._redis = redis.Redis.from_url(url, socket_connect_timeout=0.5, socket_timeout=1.0)
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        raw = self._redis.hmget(self.prefix + key, "etag", "payload")
+        if not raw or raw[0] is None or raw[1] is None:
+            return None
+        return raw[0].decode("utf-8"), raw[1]
+
+    def set(self, key: str, etag: str, payload: bytes, ttl: int) -> None:
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(self.prefix + key, mapping={"etag": etag, "payload": payload})
+        pipe.expire(self.prefix + key, ttl)
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self._redis.delete(self.prefix + key)
+
+
+class ResponseCache:
+    """Serialized API payloads keyed by resource, valid only for the ETag they were built for."""
+
+    def __init__(self, backend: Any, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self, key: str, etag: str) -> Optional[bytes]:
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            logger.warning("Response cache get failed: %r", e)
+            return None
+        if entry is None or entry[0] != etag:
+            return None
+        return entry[1]
+
+    def set(self, key: str, etag: str, payload: bytes) -> None:
+        try:
+            self.backend.set(key, etag, payload, self.ttl)
+        except Exception as e:
+            logger.warning("Response cache set failed: %r", e)
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            try:
+                self.backend.delete(key)
+            except Exception as e:
+                logger.warning("Response cache invalidate failed | key=%s | error=%r", key, e)
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache per RESPONSE_CACHE_BACKEND, or None when disabled/unavailable."""
+    global _cache
+    kind = (settings.RESPONSE_CACHE_BACKEND or "none").lower()
+    if kind in {"", "none", "off", "false", "0"}:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                if kind == "redis":
+                    backend: Any = RedisResponseBackend(settings.RESPONSE_CACHE_REDIS_URL or settings.REDIS_URL)
+                elif kind == "memory":
+                    backend = MemoryResponseBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+                else:
+                    logger.warning("Unknown RESPONSE_CACHE_BACKEND=%r; response cache disabled", kind)
+                    return None
+                _cache = ResponseCache(backend, settings.RESPONSE_CACHE_TTL_SECONDS)
+            except Exception as e:
+                logger.warning("Response cache unavailable: %r", e)
+                return None
+        return _cache
+
+
+def invalidate_document(document_id: str, case_id: Optional[str] = None) -> None:
+    """Called after the pipeline commits a document (and its calendar entries)."""
+    cache = get_response_cache()
+    if not cache:
+        return
+    keys = [result_key(document_id)]
+    if case_id:
+        keys.append(calendar_key(case_id))
+    cache.invalidate(*keys)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_h)
+_lvl_name = os.getenv("PIPELINE_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+logger.setLevel(getattr(logging, _lvl_name, logging.INFO))
+
+CHANNEL_PREFIX = "docstatus:"
+TERMINAL_STATUSES = {"completed", "needs_review", "failed"}
+# After a failed publish, stay quiet for this long instead of paying a connect timeout per event
+_RETRY_AFTER_SECONDS = 30.0
+
+_lock = threading.Lock()
+_client: Any = None
+_client_pid: Optional[int] = None
+_disabled_until = 0.0
+
+
+def document_channel(document_id: str) -> str:
+    return f"{CHANNEL_PREFIX}doc:{document_id}"
+
+
+def batch_channel(batch_id: str) -> str:
+    return f"{CHANNEL_PREFIX}batch:{batch_id}"
+
+
+def case_channel(case_id: str) -> str:
+    return f"{CHANNEL_PREFIX}case:{case_id}"
+
+
+def channels_for(document_id: str, batch_id: Optional[str] = None, case_id: Optional[str] = None) -> List[str]:
+    channels = [document_channel(document_id)]
+    if batch_id:
+        channels.append(batch_channel(batch_id))
+    if case_id:
+        channels.append(case_channel(case_id))
+    return channels
+
+
+def _redis_url() -> str:
+    return settings.STATUS_EVENTS_REDIS_URL or settings.REDIS_URL
+
+
+def _get_client() -> Any:
+    global _client, _client_pid
+    with _lock:
+        if _client is None or _client_pid != os.getpid():
+            import redis  # type: ignore
+
+            _client = redis.Redis.from_url(_redis_url(), socket_connect_timeout=0.5, socket_timeout=1.0)
+            _client_pid = os.getpid()
+        return _client
+
+
+def publish_status(
+    document_id: str,
+    status: str,
+    stage: Optional[str] = None,
+    batch_id: Optional[str] = None,
+    case_id: Optional[str] = None,
+    **extra: Any,
+) -> Optional[Dict[str, Any]]:
+    """Best-effort status event on the document, batch and case channels.
+
+    Never raises: progress notifications must not fail the pipeline. Returns the event
+    when it was published.
+    """
+    global _disabled_until
+    if not settings.STATUS_EVENTS_ENABLED or time.monotonic() < _disabled_until:
+        return None
+    event: Dict[str, Any] = {
+        "document_id": document_id,
+        "status": status,
+        "stage": stage,
+        "batch_id": batch_id,
+        "case_id": case_id,
+        "ts": time.time(),
+    }
+    event.update(extra)
+    try:
+        client = _get_client()
+        payload = json.dumps(event, default=str)
+        pipe = client.pipeline(transaction=False)
+        for channel in channels_for(document_id, batch_id, case_id):
+            pipe.publish(channel, payload)
+        pipe.execute()
+        return event
+    except Exception as e:
+        _disabled_until = time.monotonic() + _RETRY_AFTER_SECONDS
+        logger.info("Status events unavailable for %ds | error=%r", int(_RETRY_AFTER_SECONDS), e)
+        return None
+
+
+async def subscribe(channel: str, ready: Optional[asyncio.Event] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield status events published on `channel` until the consumer stops iterating.
+
+    `ready` is set once the subscription is active.
+    """
+    import redis.asyncio as aioredis  # type: ignore
+
+    client = aioredis.Redis.from_url(_redis_url())
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(channel)
+        if ready is not None:
+            ready.set()
+        async for message in pubsub.listen():
+            if message.get("type") != "message":
+                continue
+            try:
+                yield json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+    finally:
+        try:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await client.aclose()
+        except Exception:
+            pass
+
+
+def format_sse(event: Dict[str, Any], name: str = "status") -> str:
+    return f"event: {name}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def sse_stream(
+    channel: str,
+    snapshot: Optional[Callable[[], Awaitable[Optional[Dict[str, Any]]]]] = None,
+    stop_on_terminal: bool = False,
+    heartbeat_seconds: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """Server-sent events for one channel: a snapshot first, then live events.
+
+    The snapshot is read after subscribing so no transition falls between the two. A comment
+    line is sent every heartbeat_seconds so proxies keep the connection open. With
+    stop_on_terminal the stream ends once the document reaches a final status.
+    """
+    heartbeat = heartbeat_seconds or settings.STATUS_EVENTS_HEARTBEAT_SECONDS
+    queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+    ready = asyncio.Event()
+
+    async def _pump() -> None:
+        try:
+            async for event in subscribe(channel, ready):
+                await queue.put(event)
+        except Exception as e:
+            logger.info("Status stream subscription ended | channel=%s | error=%r", channel, e)
+        finally:
+            ready.set()
+            await queue.put(None)
+
+    reader = asyncio.create_task(_pump())
+    try:
+        await ready.wait()
+        if snapshot is not None:
+            current = await snapshot()
+            if current is not None:
+                yield format_sse(current, "snapshot")
+                if stop_on_terminal and current.get("status") in TERMINAL_STATUSES:
+                    return
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield format_sse(event)
+            if stop_on_terminal and event.get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        reader.cancel()
@@ -0,0 +1,187 @@
+from __future__ import annotations
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.services.pdf_text import PAGE_BREAK
+
+# Rough chars-per-token for English prose; budgets are approximate by design
+CHARS_PER_TOKEN = 4
+
+_DATE_RE = re.compile(
+    r"\b(?:\d{1,2}/\d{1,2}/\d{2,4}"
+    r"|\d{4}-\d{2}-\d{2}"
+    r"|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.? \d{1,2}(?:st|nd|rd|th)?,? \d{4}"
+    r"|\d{1,2}(?:st|nd|rd|th)? (?:day of )?(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*,? \d{4})\b",
+    re.IGNORECASE,
+)
+_KEYWORD_RE = re.compile(
+    r"\b(?:deadline|due|hearing|trial|conference|deposition|mediation|arbitration|appointment"
+    r"|shall|must|within \d+ days|no later than|on or before|ordered|motion|discovery|response"
+    r"|settlement|expires?|statute of limitations|served?|filed?|scheduling)\b",
+    re.IGNORECASE,
+)
+# ALL-CAPS lines, "Section 3", "3.", "IV." and "ORDER"-style captions
+_HEADING_RE = re.compile(r"^(?:[A-Z][A-Z0-9 ,.&'()-]{3,80}|(?:section|article)\s+\w+.*|[IVX]+\.\s+\S.*|\d+\.\s+[A-Z].{0,80})$", re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class TextChunk:
+    start: int  # character offsets into the full document text
+    end: int
+    page: int  # 1-based; PDFs mark page boundaries with PAGE_BREAK
+    text: str
+    score: float = 0.0
+
+    def header(self) -> str:
+        return f"[page {self.page}, chars {self.start}-{self.end}]"
+
+
+@dataclass
+class TextWindow:
+    chunks: List[TextChunk] = field(default_factory=list)
+    total_chars: int = 0
+
+    @property
+    def truncated(self) -> bool:
+        return sum(len(c.text) for c in self.chunks) < self.total_chars
+
+    def render(self) -> str:
+        """Selected excerpts in document order, each labelled with its page and offsets."""
+        if not self.truncated and len(self.chunks) <= 1:
+            return self.chunks[0].text if self.chunks else ""
+        return "\n\n".join(f"{c.header()}\n{c.text.strip()}" for c in self.chunks)
+
+
+def _page_starts(text: str) -> List[int]:
+    starts = [0]
+    pos = text.find(PAGE_BREAK)
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = text.find(PAGE_BREAK, pos + 1)
+    return starts
+
+
+def split_chunks(text: str, chunk_chars: int) -> List[TextChunk]:
+    """Split on paragraph/line boundaries into chunks of about chunk_chars, never across pages."""
+    page_starts = _page_starts(text)
+    chunks: List[TextChunk] = []
+    start = 0
+    n = len(text)
+    while start < n:
+        page_idx = bisect_right(page_starts, start)
+        page_end = page_starts[page_idx] if page_idx < len(page_starts) else n
+        end = min(start + chunk_chars, page_end)
+        if end < page_end:
+            # Prefer a paragraph break, then a line break, then a space, in the back half of the chunk
+            cut = -1
+            for sep in ("\n\n", "\n", " "):
+                cut = text.rfind(sep, start + chunk_chars // 2, end)
+                if cut != -1:
+                    break
+            if cut != -1:
+                end = cut + 1
+        if text[start:end].strip():
+            chunks.append(TextChunk(start=start, end=end, page=page_idx, text=text[start:end]))
+        start = end
+    return chunks
+
+
+def overlapping_chunks(text: str, chunk_tokens: int, overlap_tokens: int = 0, max_chunks: Optional[int] = None) -> List[TextChunk]:
+    """Chunks of about chunk_tokens, each extended back by overlap_tokens so a deadline that
+    straddles a boundary appears whole in at least one chunk.
+
+    With max_chunks, only the most relevant chunks are kept (in document order); callers
+    that cap should report what was dropped (see covered_chars).
+    """
+    text = text or ""
+    overlap = max(0, overlap_tokens) * CHARS_PER_TOKEN
+    chunks = split_chunks(text, max(1, chunk_tokens) * CHARS_PER_TOKEN)
+    if max_chunks and len(chunks) > max_chunks:
+        for c in chunks:
+            c.score = score_chunk(c)
+        keep = sorted(chunks[1:], key=lambda c: (-c.score, c.start))[: max_chunks - 1]
+        chunks = [chunks[0]] + sorted(keep, key=lambda c: c.start)
+    out: List[TextChunk] = []
+    for c in chunks:
+        start = max(0, c.start - overlap) if overlap else c.start
+        out.append(TextChunk(start=start, end=c.end, page=c.page, text=text[start:c.end], score=c.score))
+    return out
+
+
+def covered_chars(chunks: List[TextChunk]) -> int:
+    """Characters of the document covered by at least one chunk (overlaps counted once)."""
+    covered = 0
+    reach = 0
+    for c in sorted(chunks, key=lambda c: c.start):
+        start = max(c.start, reach)
+        if c.end > start:
+            covered += c.end - start
+        reach = max(reach, c.end)
+    return covered
+
+
+def score_chunk(chunk: TextChunk) -> float:
+    """Relevance for date/obligation extraction: date density, legal keywords, headings."""
+    size = max(len(chunk.text), 1)
+    dates = len(_DATE_RE.findall(chunk.text))
+    keywords = len(_KEYWORD_RE.findall(chunk.text))
+    headings = len(_HEADING_RE.findall(chunk.text))
+    # Densities per 1000 chars so short and long chunks compare fairly
+    return (3.0 * dates + 1.0 * keywords + 0.5 * headings) * 1000.0 / size
+
+
+def select_window(
+    text: str, max_tokens: int, chunk_chars: int = 1600, lead_chunks: int = 1
+) -> TextWindow:
+    """Pack the highest-scoring chunks of `text` into max_tokens.
+
+    The first `lead_chunks` chunks (caption, parties, document title) are always kept when
+    they fit. Text already within budget is returned whole.
+    """
+    text = text or ""
+    if estimate_tokens(text) <= max_tokens:
+        return TextWindow(chunks=[TextChunk(0, len(text), 1, text)] if text else [], total_chars=len(text))
+
+    chunks = split_chunks(text, chunk_chars)
+    for c in chunks:
+        c.score = score_chunk(c)
+    budget = max_tokens
+    chosen: List[TextChunk] = []
+    # Header lines cost a few tokens per excerpt
+    overhead = 10
+
+    def _take(c: TextChunk) -> bool:
+        nonlocal budget
+        cost = estimate_tokens(c.text) + overhead
+        if cost > budget:
+            return False
+        chosen.append(c)
+        budget -= cost
+        return True
+
+    for c in chunks[:lead_chunks]:
+        _take(c)
+    ranked = sorted(chunks[lead_chunks:], key=lambda c: (-c.score, c.start))
+    for c in ranked:
+        if c.score <= 0 and chosen:
+            break
+        _take(c)
+    if not chosen and chunks:
+        first = chunks[0]
+        keep = max(0, max_tokens * CHARS_PER_TOKEN)
+        chosen.append(TextChunk(first.start, first.start + keep, first.page, first.text[:keep]))
+    chosen.sort(key=lambda c: c.start)
+    return TextWindow(chunks=chosen, total_chars=len(text))
+
+
+def window_text(text: str, max_tokens: Optional[int], **kwargs) -> str:
+    """Convenience for prompts: the rendered window, or the text as-is without a budget."""
+    if not max_tokens:
+        return text or ""
+    return select_window(text, max_tokens, **kwargs).render()
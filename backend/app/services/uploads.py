@@ -0,0 +1,76 @@
+from __future__ import annotations
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.exceptions import UploadTooLargeException
+
+CHUNK_SIZE = 1024 * 1024
+_SNIFF_BYTES = 16
+
+_DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    size: int
+    sha256: str
+    mime_type: str
+
+
+def sniff_mime(head: bytes, filename: Optional[str] = None) -> str:
+    """Best-effort MIME type from the leading bytes, falling back to the filename."""
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"II*\x00") or head.startswith(b"MM\x00*"):
+        return "image/tiff"
+    if head.startswith(b"PK\x03\x04"):
+        # DOCX is a zip container; only the name tells it apart from other zips
+        return _DOCX_MIME if (filename or "").lower().endswith(".docx") else "application/zip"
+    try:
+        head.decode("utf-8")
+        return "text/plain"
+    except UnicodeDecodeError:
+        return "application/octet-stream"
+
+
+async def stream_upload(file: UploadFile, dest_path: str, max_bytes: int) -> StoredUpload:
+    """Copy an upload to dest_path chunk by chunk without blocking the event loop.
+
+    The SHA-256, byte count and MIME type are computed while streaming. Exceeding
+    max_bytes removes the partial file and raises UploadTooLargeException.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    out = await run_in_threadpool(open, dest_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeException(f"File exceeds the {max_bytes} byte upload limit")
+            if len(head) < _SNIFF_BYTES:
+                head += chunk[: _SNIFF_BYTES - len(head)]
+            digest.update(chunk)
+            await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        await run_in_threadpool(out.close)
+        try:
+            os.remove(dest_path)
+        except OSError:
+            pass
+        raise
+    await run_in_threadpool(out.close)
+    return StoredUpload(path=dest_path, size=size, sha256=digest.hexdigest(), mime_type=sniff_mime(head, file.filename))
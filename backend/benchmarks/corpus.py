@@ -0,0 +1,200 @@
+"""Synthetic documents for benchmarks: every document type as PDF, DOCX, scanned-style
+image and plain text, with a configurable number of pages.
+
+Text is deterministic for a given seed. PDFs are written directly (text layer, Helvetica),
+so no PDF library beyond the app's own requirements is needed.
+"""
+from __future__ import annotations
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Sequence
+
+FORMATS = ("pdf", "docx", "image", "text")
+LINES_PER_PAGE = 46
+
+_TITLES: Dict[str, str] = {
+    "court_order": "IN THE SUPERIOR COURT OF THE STATE - SCHEDULING ORDER",
+    "insurance_correspondence": "Claim correspondence - policy limits and coverage",
+    "medical_records": "Medical records - patient visit and treatment summary",
+    "settlement_communication": "Settlement demand and offer - confidential",
+    "discovery_request": "Plaintiff's first set of interrogatories and requests for production",
+    "employment_records": "Employment records - timecard and return to work",
+    "expert_witness_report": "Expert witness report and disclosure",
+    "police_report": "Police report - traffic collision, case number 24-1187",
+    "unknown": "Memorandum",
+}
+_PHRASES: Dict[str, List[str]] = {
+    "court_order": [
+        "It is hereby ordered that the hearing is set for {date}.",
+        "Plaintiff shall file response to the motion within thirty (30) days.",
+        "The final pretrial conference will be held on {date}; trial is set for {date}.",
+        "Discovery shall close on {date}. The parties shall attend mediation before {date}.",
+    ],
+    "insurance_correspondence": [
+        "Please respond to this letter by {date} regarding the policy limit of $100,000.",
+        "Coverage under the policy was in effect on {date}.",
+        "We request your response within 14 days of {date}.",
+    ],
+    "medical_records": [
+        "Patient seen for follow-up appointment on {date}; reports reduced lumbar pain.",
+        "Physical therapy visit {date}. Maximum medical improvement not yet reached.",
+        "MRI performed {date}. Plan: continue treatment, next visit {date}.",
+    ],
+    "settlement_communication": [
+        "Our client's demand of $250,000 remains open until {date}.",
+        "The offer will be withdrawn if not accepted by {date}. Mediation is scheduled {date}.",
+    ],
+    "discovery_request": [
+        "Answer each of the following interrogatories within 30 days of service on {date}.",
+        "Produce documents responsive to requests for production by {date}.",
+        "The deposition of the plaintiff is noticed for {date}. Requests for admissions attached.",
+    ],
+    "employment_records": [
+        "Employee worked a 10-hour shift on {date}; timecard attached.",
+        "Return to work authorized effective {date} with restrictions (RTW light duty).",
+    ],
+    "expert_witness_report": [
+        "The expert report is due {date}; disclosure of rebuttal witnesses by {date}.",
+        "Opinions herein are held to a reasonable degree of certainty as of {date}.",
+    ],
+    "police_report": [
+        "Officer responded to a collision at Main St and 3rd Ave on {date}.",
+        "Citation issued to driver of vehicle 2. Incident time 14:32 on {date}.",
+    ],
+    "unknown": ["Notes recorded on {date}.", "Follow up as needed after {date}."],
+}
+_FILLER = (
+    "The parties acknowledge the foregoing and reserve all rights. Counsel conferred in good faith "
+    "regarding the matters described above and will supplement as additional information becomes available."
+).split()
+
+
+@dataclass
+class SyntheticDocument:
+    path: str
+    document_type: str
+    fmt: str
+    pages: int
+
+
+def _date_text(rng: random.Random) -> str:
+    d = datetime(2026, 1, 5) + timedelta(days=rng.randint(0, 500))
+    return rng.choice([
+        d.strftime("%B %d, %Y"),
+        d.strftime("%m/%d/%Y"),
+        d.strftime("%Y-%m-%d"),
+        f"{d.day}th day of {d:%B}, {d.year}",
+    ])
+
+
+def page_lines(document_type: str, page: int, rng: random.Random) -> List[str]:
+    lines: List[str] = []
+    if page == 0:
+        lines += [_TITLES[document_type], f"Dated {_date_text(rng)}", ""]
+    while len(lines) < LINES_PER_PAGE:
+        if rng.random() < 0.25:
+            lines.append(rng.choice(_PHRASES[document_type]).replace("{date}", "{}").format(
+                *[_date_text(rng) for _ in range(3)]
+            ))
+        else:
+            lines.append(" ".join(rng.choice(_FILLER) for _ in range(rng.randint(8, 14))).capitalize() + ".")
+    return lines
+
+
+def _pdf_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, pages: Sequence[Sequence[str]]) -> None:
+    """Minimal PDF 1.4 with one Helvetica text stream per page."""
+    objects: List[bytes] = []
+    n_pages = len(pages)
+    page_ids = [4 + 2 * i for i in range(n_pages)]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {n_pages} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, lines in enumerate(pages):
+        body = "BT /F1 10 Tf 14 TL 50 800 Td " + " ".join(f"({_pdf_escape(line)}) ' " for line in lines) + "ET"
+        stream = body.encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {page_ids[i] + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(path: str, pages: Sequence[Sequence[str]]) -> None:
+    import docx
+    from docx.enum.text import WD_BREAK
+
+    d = docx.Document()
+    for i, lines in enumerate(pages):
+        for line in lines:
+            d.add_paragraph(line)
+        if i < len(pages) - 1:
+            d.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+    d.save(path)
+
+
+def write_image(path: str, lines: Sequence[str], rng: random.Random) -> None:
+    """One scanned-looking page: black text on off-white, speckle noise, slight skew."""
+    from PIL import Image, ImageDraw
+
+    img = Image.new("L", (1275, 1650), color=245)
+    draw = ImageDraw.Draw(img)
+    for row, line in enumerate(lines):
+        draw.text((80, 80 + row * 32), line, fill=20)
+    for _ in range(4000):
+        draw.point((rng.randrange(img.width), rng.randrange(img.height)), fill=rng.randint(0, 160))
+    img.rotate(rng.uniform(-1.0, 1.0), fillcolor=245).save(path)
+
+
+def generate_corpus(
+    out_dir: str,
+    document_types: Iterable[str],
+    page_counts: Sequence[int] = (1, 5),
+    formats: Sequence[str] = FORMATS,
+    seed: int = 7,
+) -> List[SyntheticDocument]:
+    """Write one document per (type, format, page count). Image documents are single pages,
+    as scans arrive one image per page."""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    docs: List[SyntheticDocument] = []
+    for document_type in document_types:
+        for n_pages in page_counts:
+            pages = [page_lines(document_type, p, rng) for p in range(n_pages)]
+            for fmt in formats:
+                stem = os.path.join(out_dir, f"{document_type}-{n_pages}p")
+                if fmt == "pdf":
+                    path = stem + ".pdf"
+                    write_pdf(path, pages)
+                elif fmt == "docx":
+                    path = stem + ".docx"
+                    write_docx(path, pages)
+                elif fmt == "image":
+                    if n_pages != page_counts[0]:
+                        continue
+                    path = stem + ".png"
+                    write_image(path, pages[0], rng)
+                elif fmt == "text":
+                    path = stem + ".txt"
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write("\n\f".join("\n".join(lines) for lines in pages))
+                else:
+                    raise ValueError(f"unknown format: {fmt}")
+                docs.append(SyntheticDocument(path, document_type, fmt, 1 if fmt == "image" else n_pages))
+    return docs
@@ -0,0 +1,311 @@
+"""Per-stage pipeline benchmark on a synthetic corpus with a stubbed LLM.
+
+    cd backend && python -m benchmarks.run --pages 1,10,50 --rounds 3 --out benchmarks/results/latest.json
+    python -m benchmarks.run --baseline benchmarks/results/baseline.json --fail-on-regression
+
+Stages: extract (extract_text), previews (render_pdf_previews), classify, parse (parser
+registry), validate (DateValidationAgent), obligations (ObligationExtractorAgent) and
+calendar (conflict check + upsert). Reports latency percentiles per stage, documents and
+pages per second, and peak RSS. The result JSON doubles as a baseline for later runs.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from benchmarks.corpus import FORMATS, SyntheticDocument, generate_corpus
+
+STAGES = ("extract", "previews", "classify", "parse", "validate", "obligations", "calendar")
+_DATE_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}/\d{4}\b")
+
+
+class StubLLM:
+    """Stands in for the OpenAI client: answers classifier and parser prompts with JSON
+    derived from the prompt text, after an optional simulated latency."""
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self.latency = latency_ms / 1000.0
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model: str, messages: List[dict], **params) -> SimpleNamespace:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        system = messages[0]["content"]
+        text = next(p["text"] for p in messages[1]["content"] if p.get("type") == "text")
+        if "classification agent" in system:
+            from benchmarks.corpus import _TITLES
+
+            lowered = text.lower()
+            dtype = next((t for t, title in _TITLES.items() if title.lower() in lowered), "unknown")
+            content = {"document_type": dtype, "confidence_score": 0.9, "parties_involved": []}
+        else:
+            dates = _DATE_RE.findall(text)[:5]
+            content = {
+                "dates": [{"date_iso": d, "date_type": "deadline", "source_text": d} for d in dates],
+                "obligations": [{"description": "File response", "due_date_iso": d} for d in dates[:1]],
+            }
+        message = SimpleNamespace(content=json.dumps(content))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@contextmanager
+def stubbed_pipeline(llm: StubLLM) -> Iterator[None]:
+    """Route every LLM call to the stub and turn off caches that would hide repeat work."""
+    from app.agents import document_classifier
+    from app.agents.parsers import base_parser
+    from app.core.config import settings
+
+    overrides = {
+        "LLM_CACHE_BACKEND": "none",
+        "LOCAL_CLASSIFIER_ENABLED": False,
+        "STATUS_EVENTS_ENABLED": False,
+    }
+    saved_settings = {k: getattr(settings, k) for k in overrides}
+    saved_clients = (document_classifier.get_openai_client, base_parser.get_openai_client)
+    for k, v in overrides.items():
+        setattr(settings, k, v)
+    document_classifier.get_openai_client = lambda: llm
+    base_parser.get_openai_client = lambda: llm
+    try:
+        yield
+    finally:
+        for k, v in saved_settings.items():
+            setattr(settings, k, v)
+        document_classifier.get_openai_client, base_parser.get_openai_client = saved_clients
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(q / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {s: [] for s in STAGES}
+        self.rss_growth: Dict[str, float] = {s: 0.0 for s in STAGES}
+        self.errors: Dict[str, int] = {s: 0 for s in STAGES}
+
+    def run(self, stage: str, fn: Callable, *args, **kwargs):
+        """Time one call. Failed calls are counted as errors, not latency samples, so a
+        stage that starts failing fast cannot pass for a speed-up."""
+        rss_before = _peak_rss_mb()
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.errors[stage] += 1
+            return None
+        else:
+            self.samples[stage].append((time.perf_counter() - started) * 1000.0)
+            return result
+        finally:
+            self.rss_growth[stage] += _peak_rss_mb() - rss_before
+
+    def summary(self) -> Dict[str, dict]:
+        out: Dict[str, dict] = {}
+        for stage, values in self.samples.items():
+            ordered = sorted(values)
+            out[stage] = {
+                "count": len(ordered),
+                "errors": self.errors[stage],
+                "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+                "p50_ms": percentile(ordered, 50),
+                "p90_ms": percentile(ordered, 90),
+                "p99_ms": percentile(ordered, 99),
+                "max_ms": ordered[-1] if ordered else 0.0,
+                "peak_rss_growth_mb": round(self.rss_growth[stage], 2),
+            }
+        return out
+
+
+def _process(doc: SyntheticDocument, timer: StageTimer, db, case_id: str) -> bool:
+    """Run one document through the stages; False when extraction produced no text, in
+    which case the downstream stages are skipped rather than timing the escalation path."""
+    from app.agents.date_validator import DateValidationAgent
+    from app.agents.document_classifier import DocumentClassificationAgent
+    from app.agents.obligation_extractor import ObligationExtractorAgent
+    from app.agents.parsers.registry import get_parser_registry
+    from app.services.calendar_service import add_calendar_entries, detect_conflicts
+    from app.services.document_processor import extract_text
+    from app.services.previews import render_pdf_previews
+
+    text = timer.run("extract", extract_text, doc.path) or ""
+    previews = timer.run("previews", render_pdf_previews, doc.path) if doc.fmt == "pdf" else []
+    if not text.strip():
+        return False
+    urls = [p.data_url for p in previews or []]
+    classification = timer.run("classify", DocumentClassificationAgent().classify, text, urls or None)
+    document_type = classification.document_type if classification else doc.document_type
+    outcome = timer.run("parse", get_parser_registry().parse, document_type, text, urls or None)
+    dates = outcome.dates if outcome else []
+    validated = timer.run("validate", DateValidationAgent().validate, dates)
+    valid_dates = validated[0] if validated else []
+    if classification is not None:
+        timer.run("obligations", ObligationExtractorAgent().extract, text, classification)
+
+    def _calendar() -> None:
+        detect_conflicts(db, case_id, valid_dates, source_document=doc.path)
+        add_calendar_entries(db, case_id, valid_dates, source_document=doc.path)
+        db.commit()
+
+    timer.run("calendar", _calendar)
+    return True
+
+
+def run_benchmark(
+    page_counts: Sequence[int] = (1, 5),
+    formats: Sequence[str] = FORMATS,
+    rounds: int = 1,
+    llm_latency_ms: float = 0.0,
+    work_dir: Optional[str] = None,
+    seed: int = 7,
+) -> dict:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.agents.document_classifier import ALLOWED_TYPES
+    from app.models.database import Base
+
+    work_dir = work_dir or tempfile.mkdtemp(prefix="ldp-bench-")
+    corpus = generate_corpus(os.path.join(work_dir, "corpus"), ALLOWED_TYPES, page_counts, formats, seed)
+    engine = create_engine(f"sqlite:///{os.path.join(work_dir, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    llm = StubLLM(llm_latency_ms)
+    timer = StageTimer()
+    no_text: Dict[str, int] = {}
+    started = time.perf_counter()
+    try:
+        with stubbed_pipeline(llm):
+            for round_no in range(rounds):
+                for doc in corpus:
+                    if not _process(doc, timer, db, case_id=f"bench-{doc.document_type}-{round_no}"):
+                        no_text[doc.fmt] = no_text.get(doc.fmt, 0) + 1
+    finally:
+        db.close()
+        engine.dispose()
+    elapsed = time.perf_counter() - started
+
+    documents = len(corpus) * rounds
+    pages = sum(d.pages for d in corpus) * rounds
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "page_counts": list(page_counts),
+            "formats": list(formats),
+            "rounds": rounds,
+            "llm_latency_ms": llm_latency_ms,
+            "seed": seed,
+        },
+        "documents": documents,
+        "pages": pages,
+        "llm_calls": llm.calls,
+        "elapsed_s": elapsed,
+        "throughput": {"documents_per_s": documents / elapsed, "pages_per_s": pages / elapsed},
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        # Documents per format whose extraction yielded no text (e.g. images without tesseract);
+        # they were timed for extract/previews only
+        "no_text": no_text,
+        "stages": timer.summary(),
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25, floor_ms: float = 1.0) -> List[str]:
+    """Stages with more errors than the baseline, or whose p50 or p90 grew by more than
+    `tolerance` (and at least floor_ms)."""
+    regressions: List[str] = []
+    for stage, now in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before:
+            continue
+        if now.get("errors", 0) > before.get("errors", 0):
+            regressions.append(f"{stage} errors: {before.get('errors', 0)} -> {now['errors']}")
+        for key in ("p50_ms", "p90_ms"):
+            old, new = before[key], now[key]
+            if new - old > floor_ms and new > old * (1 + tolerance):
+                regressions.append(f"{stage} {key}: {old:.2f} -> {new:.2f} ms (x{new / old if old else float('inf'):.2f})")
+    return regressions
+
+
+def _print_table(report: dict) -> None:
+    print(f"{'stage':<12}{'n':>6}{'err':>5}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'rss+ MB':>9}")
+    for stage, s in report["stages"].items():
+        print(
+            f"{stage:<12}{s['count']:>6}{s['errors']:>5}{s['p50_ms']:>10.2f}{s['p90_ms']:>10.2f}"
+            f"{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}{s['peak_rss_growth_mb']:>9.1f}"
+        )
+    for fmt, count in sorted(report.get("no_text", {}).items()):
+        print(f"WARNING {fmt}: {count} document(s) yielded no text; only extract/previews were timed")
+    t = report["throughput"]
+    print(
+        f"documents={report['documents']} pages={report['pages']} llm_calls={report['llm_calls']} "
+        f"docs/s={t['documents_per_s']:.2f} pages/s={t['pages_per_s']:.2f} peak_rss={report['peak_rss_mb']} MB"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", default="1,5", help="comma-separated page counts per document")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="simulated LLM round trip")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--work-dir", help="where the corpus and scratch database go (default: temp dir)")
+    parser.add_argument("--out", default="benchmarks/results/latest.json")
+    parser.add_argument("--baseline", help="earlier result JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        page_counts=[int(p) for p in args.pages.split(",") if p.strip()],
+        formats=[f.strip() for f in args.formats.split(",") if f.strip()],
+        rounds=args.rounds,
+        llm_latency_ms=args.llm_latency_ms,
+        work_dir=args.work_dir,
+        seed=args.seed,
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    _print_table(report)
+    print(f"saved {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if not regressions:
+            print("no regressions against baseline")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,44 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.dependencies import get_async_db, get_async_sessionmaker, get_db
+from app.core.config import settings
+from app.main import app
+from app.models.database import Base
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def api_client(session_factory, tmp_path, monkeypatch):
+    def _db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def _async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    app.dependency_overrides[get_db] = _db
+    app.dependency_overrides[get_async_db] = _async_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: AsyncSession
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
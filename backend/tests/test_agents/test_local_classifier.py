@@ -0,0 +1,85 @@
+import time
+
+from app.agents import local_classifier
+from app.agents.document_classifier import DocumentClassificationAgent
+from app.core.config import settings
+from app.models.database import Document
+from app.services import classifier_training
+
+_SAMPLES = {
+    "police_report": "Police report. Officer {n} responded to the collision at Main St. Case number {n}. Citation issued.",
+    "medical_records": "Patient visit {n}. Diagnosis and treatment plan; physical therapy twice weekly. MRI of lumbar spine.",
+    "court_order": "IN THE SUPERIOR COURT. Scheduling order {n}: it is hereby ordered that the hearing is set. So ordered, Judge.",
+}
+
+
+def _corpus(per_class=12):
+    return [(f"{label}-{n}", text.format(n=n), label) for label, text in _SAMPLES.items() for n in range(per_class)]
+
+
+def test_train_predict_and_reload(tmp_path):
+    rows = _corpus()
+    model = local_classifier.HashedNgramClassifier.train([t for _, t, _ in rows], [y for _, _, y in rows], n_buckets=1 << 12)
+    prediction = model.predict("Officer responded to a collision; citation issued, case number 77.")
+    assert prediction.document_type == "police_report" and prediction.confidence > 0.5
+
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    again = local_classifier.HashedNgramClassifier.load(path)
+    assert again.predict("Patient visit for MRI and physical therapy.").document_type == "medical_records"
+
+    started = time.perf_counter()
+    for _ in range(100):
+        again.predict(_SAMPLES["court_order"].format(n=1) * 20)
+    assert (time.perf_counter() - started) / 100 < 0.005
+
+
+def test_training_command_and_local_first_classification(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXTRACTION_CACHE_ENABLED", False)
+    db = session_factory()
+    for doc_id, text, label in _corpus(per_class=20):
+        path = tmp_path / f"{doc_id}.txt"
+        path.write_text(text)
+        db.add(
+            Document(
+                id=doc_id,
+                filename=path.name,
+                path=str(path),
+                status="completed",
+                document_type=label,
+                classification_source="llm",
+            )
+        )
+    db.add(Document(id="u", filename="u.txt", path=str(tmp_path / "missing.txt"), status="completed", document_type="unknown"))
+    # The local model's own (here wrong) labels are never trained or evaluated on
+    for n in range(10):
+        path = tmp_path / f"local-{n}.txt"
+        path.write_text(_SAMPLES["police_report"].format(n=n))
+        db.add(
+            Document(
+                id=f"local-{n}",
+                filename=path.name,
+                path=str(path),
+                status="completed",
+                document_type="medical_records",
+                classification_source="local",
+            )
+        )
+    db.commit()
+    assert not {row[0] for row in classifier_training.load_labelled(db)} & {f"local-{n}" for n in range(10)}
+
+    out = str(tmp_path / "local.npz")
+    report = classifier_training.run(db, out=out, test_fraction=0.3, threshold=0.5)
+    db.close()
+    assert report["train_documents"] + report["held_out"]["documents"] == 60
+    assert report["held_out"]["accuracy"] == 1.0
+    assert 0.0 < report["held_out"]["llm_call_reduction"] <= 1.0
+
+    monkeypatch.setattr(settings, "LOCAL_CLASSIFIER_MODEL_PATH", out)
+    monkeypatch.setattr(settings, "LOCAL_CLASSIFIER_THRESHOLD", 0.5)
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", None)
+    result = DocumentClassificationAgent().classify("Officer report: collision, citation issued, case number 9.")
+    assert result.document_type == "police_report" and result.source == "local"
+    # Below the threshold the LLM decides; without one configured that means escalation
+    monkeypatch.setattr(settings, "LOCAL_CLASSIFIER_THRESHOLD", 1.01)
+    assert DocumentClassificationAgent().classify("Officer report: collision.").document_type == "unknown"
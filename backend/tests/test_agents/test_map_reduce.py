@@ -0,0 +1,90 @@
+import threading
+
+from app.agents.parsers.base_parser import BaseParser
+from app.core.config import settings
+
+
+def test_long_text_is_extracted_per_chunk_and_merged(monkeypatch):
+    monkeypatch.setattr(settings, "PARSER_MAP_REDUCE", True)
+    monkeypatch.setattr(settings, "PARSER_TEXT_TOKENS", 200)
+    monkeypatch.setattr(settings, "PARSER_CHUNK_TOKENS", 150)
+    monkeypatch.setattr(settings, "PARSER_CHUNK_OVERLAP_TOKENS", 20)
+    monkeypatch.setattr(settings, "PARSER_MAX_CHUNKS", 16)
+    monkeypatch.setattr(settings, "PARSER_CHUNK_CONCURRENCY", 3)
+
+    calls = []
+    lock = threading.Lock()
+
+    def fake_llm_json(self, system_prompt, user_parts):
+        with lock:
+            calls.append(user_parts)
+        # Every chunk "finds" the same hearing; each also finds one unique deadline
+        n = len(calls)
+        return {
+            "dates": [
+                {"date_iso": "2026-03-10", "date_type": "hearing", "source_text": "hearing"},
+                {"date_iso": f"2026-04-{n:02d}", "date_type": "deadline", "source_text": "deadline"},
+            ],
+            "obligations": [{"description": "File brief", "due_date_iso": "2026-03-01"}],
+        }
+
+    monkeypatch.setattr(BaseParser, "_llm_json", fake_llm_json)
+    text = "\n\n".join(f"Paragraph {i}: the motion shall be filed on or before the deadline." * 3 for i in range(40))
+    dates, obligations = BaseParser().parse(text)
+
+    assert len(calls) > 1
+    hearings = [d for d in dates if d.date_type == "hearing"]
+    assert len(hearings) == 1 and hearings[0].source_ref.startswith("chunk 1/")
+    assert len([d for d in dates if d.date_type == "deadline"]) == len(calls)
+    assert len(obligations) == 1 and obligations[0].source_ref
+
+
+def test_short_text_uses_a_single_call(monkeypatch):
+    calls = []
+    monkeypatch.setattr(BaseParser, "_llm_json", lambda self, s, parts: calls.append(parts) or {"dates": []})
+    assert BaseParser().parse("Hearing set for 03/10/2026.") == ([], [])
+    assert len(calls) == 1
+
+
+def test_every_chunk_is_mapped_unless_capped(monkeypatch, caplog):
+    from app.services.text_window import overlapping_chunks
+
+    monkeypatch.setattr(settings, "PARSER_MAP_REDUCE", True)
+    monkeypatch.setattr(settings, "PARSER_TEXT_TOKENS", 100)
+    monkeypatch.setattr(settings, "PARSER_CHUNK_TOKENS", 100)
+    monkeypatch.setattr(settings, "PARSER_CHUNK_OVERLAP_TOKENS", 0)
+    calls = []
+    lock = threading.Lock()
+
+    def fake_llm_json(self, system_prompt, user_parts):
+        with lock:
+            calls.append(user_parts)
+        return {"dates": []}
+
+    monkeypatch.setattr(BaseParser, "_llm_json", fake_llm_json)
+    text = "\n\n".join(f"Page {i} of the scheduling order lists the remaining deadlines." for i in range(200))
+    expected = len(overlapping_chunks(text, 100))
+    assert expected > 16
+
+    monkeypatch.setattr(settings, "PARSER_MAX_CHUNKS", 0)
+    BaseParser().parse(text)
+    assert len(calls) == expected
+
+    calls.clear()
+    monkeypatch.setattr(settings, "PARSER_MAX_CHUNKS", 4)
+    with caplog.at_level("WARNING"):
+        BaseParser().parse(text)
+    assert len(calls) == 4
+    assert f"skipped_chunks={expected - 4}" in caplog.text
+
+
+def test_long_text_is_windowed_into_one_call_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "PARSER_MAP_REDUCE", False)
+    monkeypatch.setattr(settings, "PARSER_TEXT_TOKENS", 100)
+    calls = []
+    monkeypatch.setattr(BaseParser, "_llm_json", lambda self, s, parts: calls.append(parts) or {"dates": []})
+    text = "\n\n".join(f"Page {i} of the scheduling order lists the remaining deadlines." for i in range(200))
+
+    BaseParser().parse(text)
+    assert len(calls) == 1
+    assert len(str(calls[0])) < len(text)
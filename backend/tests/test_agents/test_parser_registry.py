@@ -0,0 +1,65 @@
+from app.agents.parsers.base_parser import BaseParser
+from app.agents.parsers.police_parser import PoliceParser
+from app.agents.parsers.registry import ParserRegistry, get_parser_registry
+
+
+class _StubLLMParser(BaseParser):
+    name = "stub_llm"
+
+    def parse(self, text, images=None):
+        return PoliceParser().parse(text, images=images)[0][:1], []
+
+
+def test_registry_reuses_instances_and_merges_strategies():
+    assert get_parser_registry() is get_parser_registry()
+    assert get_parser_registry().supports("police_report")
+    assert not get_parser_registry().supports("unknown")
+
+    registry = ParserRegistry()
+    registry.register("police_report", PoliceParser(), _StubLLMParser())
+    outcome = registry.parse("police_report", "Officer responded to the collision on 03/04/2025.")
+    assert len(outcome.dates) == 1  # duplicate date from the second strategy is merged away
+    assert len(outcome.obligations) == 1
+    assert set(outcome.timings) == {"police", "stub_llm"}
+
+
+def test_speculative_result_kept_or_replaced_by_type():
+    from datetime import datetime
+
+    from app.agents.parsers.court_parser import CourtParser
+    from app.models.schemas import ExtractedDate
+
+    guess = ExtractedDate(
+        date=datetime(2026, 3, 3), date_type="hearing", confidence_score=0.7, source_text="x", jurisdiction=None
+    )
+    registry = ParserRegistry()
+    registry.register("court_order", CourtParser())
+    # Unsupported type: dropped, so the document escalates as without speculation
+    assert registry.parse("unknown", "", speculative=([guess], [])).dates == []
+    assert not registry.accepts_speculative("unknown")
+    assert not registry.accepts_speculative("court_order")
+    # Accepted for the type: it stands in for the specialized LLM parser
+    outcome = registry.parse("court_order", "", speculative=([guess], []), accept_speculative=True)
+    assert outcome.dates == [guess] and "court" not in outcome.timings
+
+
+def test_heuristic_only_types_never_take_speculation():
+    from datetime import datetime
+
+    from app.agents.parsers.court_parser import CourtParser
+    from app.models.schemas import ExtractedDate
+
+    guess = ExtractedDate(
+        date=datetime(2026, 3, 3), date_type="hearing", confidence_score=0.7, source_text="x", jurisdiction=None
+    )
+    registry = ParserRegistry()
+    registry.register("police_report", PoliceParser())
+    assert not registry.accepts_speculative("police_report", True)
+    assert guess not in registry.parse("police_report", "No dates here.", speculative=([guess], [])).dates
+    assert not registry.speculation_useful({"police_report"})
+
+    registry.register("court_order", CourtParser())
+    assert not registry.speculation_useful(set())
+    assert registry.speculation_useful({"court_order"})
+    registry.register("police_report", BaseParser())
+    assert registry.speculation_useful(set())
@@ -0,0 +1,40 @@
+from app.api import routes
+
+
+def test_batch_upload_inserts_and_dispatches_once(api_client, monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(routes, "dispatch_documents", lambda ids: dispatched.append(list(ids)))
+
+    files = [("files", (f"doc{i}.txt", b"Hearing set for 01/10/2026", "text/plain")) for i in range(3)]
+    resp = api_client.post("/api/v1/documents/batch", files=files, data={"case_id": "case-1"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 3
+    assert dispatched == [body["document_ids"]]
+
+    status = api_client.get(f"/api/v1/batches/{body['batch_id']}").json()
+    assert status["status_counts"] == {"queued": 3}
+    assert status["done"] is False
+    assert api_client.get("/api/v1/batches/missing").status_code == 404
+
+
+def test_batch_upload_failure_removes_files_already_stored(api_client, session_factory, monkeypatch):
+    import os
+
+    from app.core.config import settings
+    from app.models.database import Document, DocumentBatch
+
+    dispatched = []
+    monkeypatch.setattr(routes, "dispatch_documents", lambda ids: dispatched.append(list(ids)))
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 64)
+
+    files = [
+        ("files", ("a.txt", b"Hearing set for 01/10/2026", "text/plain")),
+        ("files", ("b.txt", b"x" * 1000, "text/plain")),
+    ]
+    resp = api_client.post("/api/v1/documents/batch", files=files)
+    assert resp.status_code == 413
+    assert os.listdir(settings.UPLOAD_DIR) == []
+    assert dispatched == []
+    with session_factory() as db:
+        assert db.query(Document).count() == 0 and db.query(DocumentBatch).count() == 0
@@ -0,0 +1,42 @@
+from app.models.database import Document
+
+
+def _seed(session_factory):
+    with session_factory() as db:
+        db.add(Document(id="d-1", filename="a.txt", path="/a", case_id="c-1", status="completed", date_count=2))
+        db.add(Document(id="d-2", filename="b.txt", path="/b", case_id="c-1", status="processing"))
+        db.add(Document(id="d-3", filename="c.txt", path="/c", case_id="c-2", status="queued"))
+        db.commit()
+
+
+def test_bulk_by_ids_keeps_order_and_reports_missing(api_client, session_factory):
+    _seed(session_factory)
+    body = api_client.post(
+        "/api/v1/documents/bulk", json={"document_ids": ["d-2", "nope", "d-1"], "fields": ["processing_status"]}
+    ).json()
+    assert body["items"] == [
+        {"document_id": "d-2", "processing_status": "processing"},
+        {"document_id": "d-1", "processing_status": "completed"},
+    ]
+    assert body["missing"] == ["nope"]
+
+
+def test_bulk_by_case_defaults_to_result_fields(api_client, session_factory):
+    _seed(session_factory)
+    items = api_client.post("/api/v1/documents/bulk", json={"case_id": "c-1"}).json()["items"]
+    assert sorted(i["document_id"] for i in items) == ["d-1", "d-2"]
+    assert items[0]["classification"]["document_type"] == "unknown"
+    assert set(items[0]) == {
+        "document_id",
+        "classification",
+        "extracted_dates",
+        "obligations",
+        "processing_status",
+        "human_review_required",
+        "error_messages",
+    }
+
+
+def test_bulk_rejects_unknown_fields_and_empty_selector(api_client):
+    assert api_client.post("/api/v1/documents/bulk", json={"case_id": "c", "fields": ["path"]}).status_code == 422
+    assert api_client.post("/api/v1/documents/bulk", json={}).status_code == 422
@@ -0,0 +1,44 @@
+from app.models.database import Document
+from app.services.classifier_training import load_labelled
+
+
+def _doc(db, tmp_path, doc_id, status):
+    path = tmp_path / f"{doc_id}.txt"
+    path.write_text("Motion to compel discovery responses.")
+    db.add(
+        Document(
+            id=doc_id,
+            filename=path.name,
+            path=str(path),
+            status=status,
+            classification={"document_type": "court_order", "confidence_score": 0.55, "sub_type": None,
+                            "jurisdiction": "CA", "parties_involved": [], "source": "local"},
+            document_type="court_order",
+            confidence_score=0.55,
+            classification_source="local",
+        )
+    )
+    db.commit()
+
+
+def test_reviewed_classification_is_human_sourced_and_trained_on(api_client, session_factory, tmp_path):
+    with session_factory() as db:
+        _doc(db, tmp_path, "d-1", "needs_review")
+        assert load_labelled(db) == []
+
+    resp = api_client.put("/api/v1/documents/d-1/classification", json={"document_type": "motion"})
+    assert resp.status_code == 200
+    assert resp.json()["source"] == "human" and resp.json()["jurisdiction"] == "CA"
+
+    with session_factory() as db:
+        doc = db.get(Document, "d-1")
+        assert (doc.document_type, doc.classification_source, doc.confidence_score) == ("motion", "human", 1.0)
+        assert [(row[0], row[2]) for row in load_labelled(db)] == [("d-1", "motion")]
+    assert api_client.get("/api/v1/documents/d-1/result").json()["classification"]["source"] == "human"
+
+
+def test_review_waits_for_processing_to_finish(api_client, session_factory, tmp_path):
+    with session_factory() as db:
+        _doc(db, tmp_path, "d-2", "queued")
+    assert api_client.put("/api/v1/documents/d-2/classification", json={"document_type": "motion"}).status_code == 409
+    assert api_client.put("/api/v1/documents/nope/classification", json={"document_type": "motion"}).status_code == 404
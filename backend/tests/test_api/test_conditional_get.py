@@ -0,0 +1,38 @@
+from app.models.database import Document
+
+
+def test_result_etag_and_last_modified_revalidate(api_client, session_factory):
+    with session_factory() as db:
+        db.add(Document(id="d-1", filename="a.txt", path="/a", status="completed"))
+        db.commit()
+
+    first = api_client.get("/api/v1/documents/d-1/result")
+    assert first.status_code == 200 and first.json()["processing_status"] == "completed"
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    assert api_client.get("/api/v1/documents/d-1/result", headers={"If-None-Match": etag}).status_code == 304
+    assert api_client.get("/api/v1/documents/d-1/result", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    with session_factory() as db:
+        db.get(Document, "d-1").status = "needs_review"
+        db.commit()
+
+    changed = api_client.get("/api/v1/documents/d-1/result", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["processing_status"] == "needs_review"
+    assert changed.headers["etag"] != etag
+
+
+def test_calendar_etag_changes_when_an_event_is_added(api_client):
+    empty = api_client.get("/api/v1/cases/c-1/calendar")
+    assert empty.json() == []
+    etag = empty.headers["etag"]
+    assert api_client.get("/api/v1/cases/c-1/calendar", headers={"If-None-Match": etag}).status_code == 304
+
+    api_client.post(
+        "/api/v1/cases/c-1/calendar/events",
+        json={"title": "Hearing", "start": "2024-05-01T09:00:00", "end": "2024-05-01T10:00:00"},
+    )
+    after = api_client.get("/api/v1/cases/c-1/calendar", headers={"If-None-Match": etag})
+    assert after.status_code == 200 and [e["title"] for e in after.json()] == ["Hearing"]
+    assert api_client.get("/api/v1/cases/c-1/calendar", headers={"If-None-Match": after.headers["etag"]}).status_code == 304
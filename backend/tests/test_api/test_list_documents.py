@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from app.models.database import Document
+
+
+_DATE = {
+    "date": "2024-03-01T00:00:00",
+    "date_type": "deadline",
+    "confidence_score": 0.9,
+    "source_text": "due March 1",
+    "jurisdiction": None,
+}
+
+
+def _seed(session_factory, n, case_id="c-1"):
+    base = datetime(2024, 1, 1)
+    with session_factory() as db:
+        for i in range(n):
+            db.add(
+                Document(
+                    id=f"doc-{i:03d}",
+                    filename=f"f{i}.txt",
+                    path=f"/tmp/f{i}.txt",
+                    case_id=case_id,
+                    status="completed",
+                    # pairs share a timestamp so the id tiebreak is exercised
+                    created_at=base + timedelta(minutes=i // 2),
+                    extracted_dates=[_DATE] * 3,
+                    document_type="court_order",
+                    confidence_score=0.9,
+                    date_count=3,
+                    obligation_count=1,
+                )
+            )
+        db.commit()
+
+
+def test_keyset_pages_cover_every_document_once(api_client, session_factory):
+    _seed(session_factory, 7)
+    seen, cursor = [], None
+    while True:
+        params = {"case_id": "c-1", "limit": 3, "view": "summary"}
+        if cursor:
+            params["cursor"] = cursor
+        resp = api_client.get("/api/v1/documents", params=params)
+        assert resp.status_code == 200
+        seen.extend(item["document_id"] for item in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [f"doc-{i:03d}" for i in reversed(range(7))]
+
+
+def test_summary_view_returns_counts_without_json_columns(api_client, session_factory):
+    _seed(session_factory, 1)
+    item = api_client.get("/api/v1/documents", params={"view": "summary"}).json()[0]
+    assert item["date_count"] == 3 and item["obligation_count"] == 1
+    assert item["document_type"] == "court_order"
+    assert "extracted_dates" not in item
+
+
+def test_invalid_cursor_is_rejected(api_client):
+    assert api_client.get("/api/v1/documents", params={"cursor": "!!"}).status_code == 400
+
+
+def test_full_view_keeps_result_payload(api_client, session_factory):
+    _seed(session_factory, 1)
+    item = api_client.get("/api/v1/documents").json()[0]
+    assert len(item["extracted_dates"]) == 3 and "classification" in item
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.models.database import Document
+from app.services import artifacts, document_processor
+from app.services.llm_cache import cached_chat_completion
+
+
+def test_pipeline_timings_and_metrics_endpoint(api_client, session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(document_processor, "SessionLocal", session_factory)
+    monkeypatch.setattr(artifacts, "_store", artifacts.ArtifactStore(str(tmp_path / "artifacts")))
+    monkeypatch.setattr(settings, "PIPELINE_MODE", "staged")
+    monkeypatch.setattr(settings, "EXTRACTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_CACHE_BACKEND", "none")
+    monkeypatch.setattr("app.services.metrics._status_cache", None)
+
+    path = tmp_path / "notice.txt"
+    path.write_text("Notice: please respond within 30 days of 03/04/2025.")
+    db = session_factory()
+    db.add(Document(id="doc-m", filename="notice.txt", path=str(path), status="queued"))
+    db.commit()
+    db.close()
+    document_processor.dispatch_document("doc-m")
+
+    db = session_factory()
+    timings = db.get(Document, "doc-m").timings
+    db.close()
+    # The record follows the document through every staged task
+    for key in ("queue_wait_ms", "extract_ms", "classify_ms", "parse_ms", "validate_ms", "calendar_ms", "total_ms"):
+        assert key in timings
+
+    usage = SimpleNamespace(prompt_tokens=1200, completion_tokens=80)
+    message = SimpleNamespace(content="{}")
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create=lambda **kw: SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+    )))
+    cached_chat_completion(client, model="stub-model", messages=[{"role": "user", "content": "x"}])
+
+    res = api_client.get("/metrics")
+    assert res.status_code == 200
+    body = res.text
+    assert 'docproc_stage_duration_seconds_count{stage="extract"}' in body
+    assert "docproc_queue_wait_seconds_count" in body
+    assert 'docproc_llm_tokens_count{kind="prompt",model="stub-model"}' in body
+    assert 'docproc_documents{status="needs_review"} 1.0' in body
+
+
+def test_llm_calls_land_in_the_document_record_across_threads(monkeypatch):
+    from app.agents.parsers.base_parser import BaseParser
+    from app.services.metrics import observe_document, timing_record
+
+    monkeypatch.setattr(settings, "LLM_CACHE_BACKEND", "none")
+    monkeypatch.setattr(settings, "PARSER_MAP_REDUCE", True)
+    monkeypatch.setattr(settings, "PARSER_TEXT_TOKENS", 100)
+    monkeypatch.setattr(settings, "PARSER_CHUNK_TOKENS", 100)
+    monkeypatch.setattr(settings, "PARSER_CHUNK_CONCURRENCY", 3)
+    usage = SimpleNamespace(prompt_tokens=500, completion_tokens=20)
+    message = SimpleNamespace(content='{"dates": []}')
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create=lambda **kw: SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+    )))
+    monkeypatch.setattr("app.agents.parsers.base_parser.get_openai_client", lambda: client)
+
+    text = "\n\n".join(f"Section {i}: the deadline to respond is set by the scheduling order." for i in range(40))
+    with timing_record() as record:
+        BaseParser().parse(text)
+    calls = record["llm_calls"]
+    assert calls > 1  # one per map-reduce chunk, made from pool threads
+    assert record["llm_prompt_tokens"] == 500 * calls and record["llm_ms"] >= 0
+    observe_document("completed", record)
+    assert record["total_ms"] == 0.0  # LLM time is nested in stage spans, never added on top
+
+
+def test_status_gauge_is_cached_between_scrapes(monkeypatch):
+    from app.services import metrics
+
+    monkeypatch.setattr(metrics, "_status_cache", None)
+    loads = []
+    load = lambda: loads.append(1) or {"completed": len(loads)}
+    assert metrics.cached_status_counts(load, ttl=60) == {"completed": 1}
+    assert metrics.cached_status_counts(load, ttl=60) == {"completed": 1}
+    assert metrics.cached_status_counts(load, ttl=0) == {"completed": 2}
@@ -0,0 +1,65 @@
+import json
+
+from app.models.database import Document
+from app.services import status_events
+
+
+def _events(body: str):
+    out = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if lines:
+            out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+def test_document_stream_sends_snapshot_then_stage_events_until_terminal(api_client, session_factory, monkeypatch):
+    with session_factory() as db:
+        db.add(Document(id="d-1", filename="a.txt", path="/tmp/a.txt", status="processing"))
+        db.commit()
+
+    subscribed = []
+
+    async def fake_subscribe(channel, ready=None):
+        subscribed.append(channel)
+        ready.set()
+        for stage in ("classify", "parse"):
+            yield {"document_id": "d-1", "status": "processing", "stage": stage}
+        yield {"document_id": "d-1", "status": "completed", "stage": None}
+        yield {"document_id": "d-1", "status": "never-sent"}
+
+    monkeypatch.setattr(status_events, "subscribe", fake_subscribe)
+    resp = api_client.get("/api/v1/documents/d-1/events")
+
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert subscribed == ["docstatus:doc:d-1"]
+    events = _events(resp.text)
+    assert events[0] == ("snapshot", {"document_id": "d-1", "status": "processing"})
+    assert [e["stage"] for _, e in events[1:]] == ["classify", "parse", None]
+    assert events[-1][1]["status"] == "completed"
+
+
+def test_document_stream_unknown_document_is_404(api_client):
+    assert api_client.get("/api/v1/documents/missing/events").status_code == 404
+
+
+def test_publish_status_fans_out_to_document_batch_and_case(monkeypatch):
+    published = []
+
+    class FakePipe:
+        def publish(self, channel, payload):
+            published.append((channel, json.loads(payload)))
+
+        def execute(self):
+            return None
+
+    class FakeRedis:
+        def pipeline(self, transaction=False):
+            return FakePipe()
+
+    monkeypatch.setattr(status_events, "_get_client", lambda: FakeRedis())
+    monkeypatch.setattr(status_events, "_disabled_until", 0.0)
+    status_events.publish_status("d-1", "processing", stage="parse", batch_id="b-1", case_id="c-1")
+
+    assert [c for c, _ in published] == ["docstatus:doc:d-1", "docstatus:batch:b-1", "docstatus:case:c-1"]
+    assert all(e["stage"] == "parse" for _, e in published)
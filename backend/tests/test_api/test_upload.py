@@ -0,0 +1,64 @@
+import hashlib
+
+from app.api import routes
+from app.core.config import settings
+from app.models.database import Document
+
+
+def test_upload_records_hash_size_and_mime(api_client, session_factory, monkeypatch):
+    monkeypatch.setattr(routes, "dispatch_document", lambda doc_id: None)
+    payload = b"%PDF-1.4\n" + b"0" * 5000
+    resp = api_client.post("/api/v1/documents/upload", files={"file": ("order.pdf", payload, "application/pdf")})
+    assert resp.status_code == 200
+
+    db = session_factory()
+    doc = db.get(Document, resp.json()["document_id"])
+    assert doc.content_sha256 == hashlib.sha256(payload).hexdigest()
+    assert doc.size_bytes == len(payload)
+    assert doc.mime_type == "application/pdf"
+    db.close()
+
+
+def test_upload_over_limit_is_rejected(api_client, monkeypatch):
+    monkeypatch.setattr(routes, "dispatch_document", lambda doc_id: None)
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 1024)
+    resp = api_client.post("/api/v1/documents/upload", files={"file": ("big.txt", b"x" * 4096, "text/plain")})
+    assert resp.status_code == 413
+
+
+def test_status_and_listing_read_through_async_session(api_client, monkeypatch):
+    monkeypatch.setattr(routes, "dispatch_document", lambda doc_id: None)
+    doc_id = api_client.post(
+        "/api/v1/documents/upload", files={"file": ("a.txt", b"hello", "text/plain")}, data={"case_id": "c-9"}
+    ).json()["document_id"]
+
+    assert api_client.get(f"/api/v1/documents/{doc_id}/status").json() == {"document_id": doc_id, "status": "queued"}
+    assert api_client.get(f"/api/v1/documents/{doc_id}/result").status_code == 202
+    listed = api_client.get("/api/v1/documents", params={"case_id": "c-9"}).json()
+    assert [d["document_id"] for d in listed] == [doc_id]
+    assert api_client.get("/api/v1/cases/c-9/calendar").json() == []
+
+
+def test_chunked_upload_over_limit_is_rejected_with_413(api_client, monkeypatch):
+    monkeypatch.setattr(routes, "dispatch_document", lambda doc_id: None)
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BATCH_BYTES", 1024)
+    boundary = "limitboundary"
+    head = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"files\"; filename=\"big.txt\"\r\n"
+        "Content-Type: text/plain\r\n\r\n"
+    ).encode()
+
+    def body():
+        # A generator body is sent with Transfer-Encoding: chunked and no Content-Length
+        yield head
+        for _ in range(8):
+            yield b"x" * 512
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    resp = api_client.post(
+        "/api/v1/documents/batch",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert resp.status_code == 413
+    assert "byte limit" in resp.json()["detail"]
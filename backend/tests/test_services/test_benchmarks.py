@@ -0,0 +1,41 @@
+from benchmarks.run import STAGES, compare, run_benchmark
+
+
+def test_benchmark_suite_reports_every_stage(tmp_path):
+    report = run_benchmark(page_counts=(2,), formats=("pdf", "docx", "text"), work_dir=str(tmp_path))
+    assert report["documents"] == 27  # nine document types x three formats
+    assert set(report["stages"]) == set(STAGES)
+    assert report["stages"]["extract"]["count"] == 27 and report["stages"]["extract"]["errors"] == 0
+    assert report["stages"]["parse"]["p90_ms"] >= report["stages"]["parse"]["p50_ms"]
+    assert report["llm_calls"] > 0 and report["peak_rss_mb"] > 0
+    assert report["no_text"] == {}
+
+    slower = {"stages": {s: dict(v, p50_ms=v["p50_ms"] * 3 + 5) for s, v in report["stages"].items()}}
+    assert compare(report, report) == []
+    assert any(line.startswith("extract p50_ms") for line in compare(slower, report))
+
+
+def test_failures_are_errors_not_samples_and_regress():
+    from benchmarks.run import StageTimer
+
+    def boom():
+        raise RuntimeError("stage broke")
+
+    timer = StageTimer()
+    timer.run("parse", lambda: None)
+    timer.run("parse", boom)
+    stats = timer.summary()["parse"]
+    assert stats["count"] == 1 and stats["errors"] == 1
+
+    baseline = {"stages": {"parse": dict(stats, errors=0, p50_ms=stats["p50_ms"] + 100, p90_ms=stats["p90_ms"] + 100)}}
+    assert compare({"stages": {"parse": stats}}, baseline) == ["parse errors: 0 -> 1"]
+
+
+def test_formats_without_text_are_flagged_and_skipped(tmp_path, monkeypatch):
+    from app.services import document_processor
+
+    real = document_processor.extract_text
+    monkeypatch.setattr(document_processor, "extract_text", lambda path: "" if path.endswith(".docx") else real(path))
+    report = run_benchmark(page_counts=(1,), formats=("docx", "text"), work_dir=str(tmp_path))
+    assert report["no_text"] == {"docx": 9}
+    assert report["stages"]["extract"]["count"] == 18 and report["stages"]["classify"]["count"] == 9
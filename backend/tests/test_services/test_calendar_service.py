@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+from app.models.database import CalendarEvent
+from app.models.schemas import ExtractedDate
+from app.services import calendar_service
+from app.services.calendar_service import ConflictChecker, detect_case_conflicts, detect_conflicts
+
+
+def _event(db, event_id, title, start, case_id="c-1"):
+    db.add(CalendarEvent(id=event_id, case_id=case_id, title=title, start=start, end=start))
+
+
+def _date(when, date_type="deadline"):
+    return ExtractedDate(date=when, date_type=date_type, confidence_score=0.9, source_text="", jurisdiction=None)
+
+
+def test_detect_conflicts_only_reports_events_near_new_dates(session_factory, monkeypatch):
+    monkeypatch.setattr(calendar_service.settings, "CALENDAR_CONFLICT_MINUTES", 60)
+    monkeypatch.setattr(calendar_service.settings, "CALENDAR_CONFLICT_MINUTES_BY_TYPE", "hearing=240")
+    base = datetime(2024, 5, 1, 9)
+    with session_factory() as db:
+        _event(db, "e1", "Deadline", base + timedelta(minutes=30))
+        _event(db, "e2", "Hearing", base + timedelta(hours=3))
+        _event(db, "e3", "Deadline", base + timedelta(days=30))
+        _event(db, "e4", "Deadline", base, case_id="other")
+        db.commit()
+
+        conflicts = detect_conflicts(db, "c-1", [_date(base)])
+
+    assert len(conflicts) == 2
+    assert any("'Deadline'" in c for c in conflicts) and any("'Hearing'" in c for c in conflicts)
+
+
+def test_sweep_finds_pairs_using_larger_type_proximity():
+    checker = ConflictChecker(timedelta(minutes=60), {"trial": timedelta(days=1), "deadline": timedelta(0)})
+    base = datetime(2024, 5, 1)
+    events = [
+        CalendarEvent(id="a", title="Deadline", start=base),
+        CalendarEvent(id="b", title="Deadline", start=base + timedelta(minutes=10)),
+        CalendarEvent(id="c", title="Trial", start=base + timedelta(hours=5)),
+        CalendarEvent(id="d", title="Hearing", start=base + timedelta(days=3)),
+    ]
+    pairs = {(c.event_id, c.other_event_id) for c in checker.sweep(events)}
+    assert pairs == {("a", "c"), ("b", "c")}
+
+
+def test_case_conflicts_endpoint_matches_service(api_client, session_factory):
+    base = datetime(2024, 5, 1, 9)
+    with session_factory() as db:
+        _event(db, "e1", "Hearing", base)
+        _event(db, "e2", "Hearing", base + timedelta(minutes=20))
+        db.commit()
+        expected = [c.model_dump(mode="json") for c in detect_case_conflicts(db, "c-1")]
+
+    body = api_client.get("/api/v1/cases/c-1/calendar/conflicts").json()
+    assert body == expected and len(body) == 1
+
+
+def test_add_calendar_entries_upserts_deterministic_ids_in_caller_transaction(session_factory):
+    when = datetime(2024, 6, 3)
+    dates = [_date(when, "deadline"), _date(when, "hearing"), _date(when, "deadline")]
+    with session_factory() as db:
+        calendar_service.add_calendar_entries(db, "c-1", dates, source_document="doc-1")
+        calendar_service.add_calendar_entries(db, "c-1", [_date(when, "deadline")], source_document="doc-2")
+        db.rollback()
+        assert db.query(CalendarEvent).count() == 0
+
+        calendar_service.add_calendar_entries(db, "c-1", dates, source_document="doc-1")
+        updated = _date(when, "deadline")
+        updated.source_text = "revised"
+        calendar_service.add_calendar_entries(db, "c-1", [updated], source_document="doc-1")
+        db.commit()
+
+        events = {e.id: e for e in db.query(CalendarEvent).all()}
+    # The hearing is no longer produced by doc-1, so its event is removed
+    assert set(events) == {"evt-doc-1-deadline-20240603T000000"}
+    assert events["evt-doc-1-deadline-20240603T000000"].description == "revised"
+
+
+def test_reprocessing_removes_events_for_corrected_dates(session_factory):
+    with session_factory() as db:
+        _event(db, "manual", "Hearing", datetime(2024, 6, 1))
+        calendar_service.add_calendar_entries(db, "c-1", [_date(datetime(2024, 6, 3))], source_document="doc-1")
+        calendar_service.add_calendar_entries(db, "c-1", [_date(datetime(2024, 6, 4))], source_document="doc-2")
+        db.commit()
+
+        calendar_service.add_calendar_entries(db, "c-1", [_date(datetime(2024, 6, 10))], source_document="doc-1")
+        db.commit()
+        ids = {e.id for e in db.query(CalendarEvent).all()}
+        assert ids == {"manual", "evt-doc-2-deadline-20240604T000000", "evt-doc-1-deadline-20240610T000000"}
+
+        calendar_service.add_calendar_entries(db, "c-1", [], source_document="doc-2")
+        db.commit()
+        assert {e.id for e in db.query(CalendarEvent).all()} == {"manual", "evt-doc-1-deadline-20240610T000000"}
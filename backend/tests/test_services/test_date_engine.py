@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from app.services.date_engine import _parse_token, find_dates, parse_date
+
+
+def test_find_dates_formats_spans_and_relative_phrases():
+    text = (
+        "ORDER dated March 5, 2026. Hearing on the 10th day of April. "
+        "Responses due within thirty (30) days. Trial 2026-06-01. Filed 3/4/25 and 5-Mar-2026; "
+        "disclosures 10 days before trial; invalid 02/30/2025."
+    )
+    found = find_dates(text)
+    assert [(d.kind, d.value) for d in found] == [
+        ("month_day", datetime(2026, 3, 5)),
+        ("day_month", datetime(2026, 4, 10)),
+        ("relative", datetime(2026, 4, 4)),
+        ("iso", datetime(2026, 6, 1)),
+        ("numeric", datetime(2025, 3, 4)),
+        ("other", datetime(2026, 3, 5)),
+    ]
+    assert all(text[d.start:d.end] == d.text for d in found)
+    # Anchored phrases need a reference date
+    assert [d.kind for d in find_dates("Respond within 14 days.")] == []
+    assert find_dates("Respond within 14 days.", reference=datetime(2026, 1, 1))[0].value == datetime(2026, 1, 15)
+
+
+def test_parse_date_fast_paths_and_memoization():
+    assert parse_date("2026-03-10T09:30:00") == datetime(2026, 3, 10, 9, 30)
+    assert parse_date("Sept. 9th 2026") == datetime(2026, 9, 9)
+    assert parse_date("None") is None
+    _parse_token.cache_clear()
+    find_dates("Due 03/04/2026 and again 03/04/2026.")
+    assert _parse_token.cache_info().hits == 1
@@ -0,0 +1,71 @@
+from app.services.extraction_cache import ExtractionCache, cache_key, content_digest
+
+
+def test_extraction_cache_roundtrip_and_eviction(tmp_path):
+    doc = tmp_path / "order.txt"
+    doc.write_text("Scheduling Order: hearing set for 01/10/2026")
+    key = cache_key(content_digest(str(doc)))
+    assert key == cache_key(content_digest(str(doc)))
+
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite3"), max_bytes=200)
+    cache.put(key, {"text": "x" * 50})
+    assert cache.get(key) == {"text": "x" * 50}
+
+    # A second large entry pushes the least recently used one out
+    cache.put("other", {"text": "y" * 150})
+    assert cache.get(key) is None
+    assert cache.get("other") is not None
+    assert cache.purge_stale() == 0
+
+
+def test_local_model_identity_is_content_based_and_scoped_to_local_entries(tmp_path, monkeypatch):
+    import os
+
+    from app.agents import local_classifier
+    from app.core.config import settings
+    from app.services.extraction_cache import local_model_stamp, payload_is_current, pipeline_fingerprint
+
+    model = tmp_path / "model.npz"
+    model.write_bytes(b"weights-v1")
+    monkeypatch.setattr(settings, "LOCAL_CLASSIFIER_ENABLED", True)
+    monkeypatch.setattr(settings, "LOCAL_CLASSIFIER_MODEL_PATH", str(model))
+    fingerprint = pipeline_fingerprint()
+    version = local_classifier.model_version()
+
+    # Touching or copying identical weights keeps the identity
+    os.utime(model, ns=(1, 1))
+    assert local_classifier.model_version() == version
+    local = {"classification": {"source": "local"}, "local_model": local_model_stamp("local")}
+    llm = {"classification": {"source": "llm"}, "local_model": local_model_stamp("llm")}
+    assert payload_is_current(local) and payload_is_current(llm)
+
+    # A retrained model invalidates only the entries it classified
+    model.write_bytes(b"weights-v2")
+    assert local_classifier.model_version() != version
+    assert pipeline_fingerprint() == fingerprint
+    assert not payload_is_current(local) and payload_is_current(llm)
+
+
+def test_fingerprint_covers_settings_that_change_the_output(monkeypatch):
+    from app.core.config import settings
+    from app.services.extraction_cache import pipeline_fingerprint
+
+    changes = {
+        "OCR_ENABLED": not settings.OCR_ENABLED,
+        "OCR_DPI": settings.OCR_DPI + 1,
+        "OCR_MIN_TEXT_CHARS": settings.OCR_MIN_TEXT_CHARS + 1,
+        "PARSER_TEXT_TOKENS": settings.PARSER_TEXT_TOKENS + 1,
+        "CLASSIFIER_TEXT_TOKENS": settings.CLASSIFIER_TEXT_TOKENS + 1,
+        "PARSER_MAP_REDUCE": not settings.PARSER_MAP_REDUCE,
+        "PARSER_CHUNK_TOKENS": settings.PARSER_CHUNK_TOKENS + 1,
+        "PARSER_CHUNK_OVERLAP_TOKENS": settings.PARSER_CHUNK_OVERLAP_TOKENS + 1,
+        "PARSER_MAX_CHUNKS": settings.PARSER_MAX_CHUNKS + 1,
+        "PARSER_LLM_STRATEGY_TYPES": "court_order",
+        "PIPELINE_SPECULATIVE_PARSE": not settings.PIPELINE_SPECULATIVE_PARSE,
+        "SPECULATIVE_ACCEPT_TYPES": "court_order",
+    }
+    for name, value in changes.items():
+        before = pipeline_fingerprint()
+        with monkeypatch.context() as m:
+            m.setattr(settings, name, value)
+            assert pipeline_fingerprint() != before, name
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import pytest
+
+from app.agents.obligation_extractor import ObligationExtractorAgent
+from app.models.schemas import DocumentClassification
+from app.services.keyword_index import keyword_index, register_keywords
+
+
+def test_single_pass_index_finds_overlapping_phrases():
+    register_keywords("respond", "respond within", "within", "thin 30 days")
+    index = keyword_index("Defendant shall RESPOND WITHIN 30 days; respondent agrees.")
+    assert index.positions("respond within") == [16]
+    assert index.positions("respond") == [16, 40]  # substring semantics, like `in lower`
+    assert index.positions("within") == [24]
+    assert index.positions("thin 30 days") == [26]  # starts inside a longer match
+    assert not index.has("attend mediation")
+    with pytest.raises(ValueError):
+        index.has("never registered")
+
+
+def test_obligations_anchor_to_following_date():
+    classification = DocumentClassification(document_type="court_order", confidence_score=0.9, sub_type=None, jurisdiction=None)
+    text = (
+        "Order entered January 5, 2026. Plaintiff shall produce documents by February 2, 2026. "
+        + "Filler text. " * 40
+        + "The parties shall attend mediation at a date to be set."
+    )
+    obs = {o.description: o for o in ObligationExtractorAgent().extract(text, classification)}
+    assert obs["Produce Documents"].due_date == datetime(2026, 2, 2)
+    # No date nearby: default period from the document's first date
+    assert obs["Attend Mediation"].due_date == datetime(2026, 1, 5)
+    assert obs["Produce Documents"].source_ref.startswith("chars ")
+
+
+def test_obligation_ignores_order_date_before_the_phrase():
+    classification = DocumentClassification(document_type="court_order", confidence_score=0.9, sub_type=None, jurisdiction=None)
+    text = "Order entered March 1, 2026. Defendant shall file response to the amended complaint."
+    obs = {o.description: o for o in ObligationExtractorAgent().extract(text, classification)}
+    # The entry date is the start of the period, not the deadline
+    assert obs["File Response"].due_date == datetime(2026, 3, 31)
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from app.services import llm_cache
+from app.services.llm_cache import LLMCache, SQLiteLLMCacheBackend, cached_chat_completion, make_cache_key
+
+
+class _FakeClient:
+    def __init__(self, content):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self._content = content
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=self._content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _messages(image_b64):
+    return [
+        {"role": "system", "content": "classify"},
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": "Scheduling Order"},
+                {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}},
+            ],
+        },
+    ]
+
+
+def test_cache_key_tracks_model_and_image_content():
+    base = make_cache_key("gpt-4o-mini", _messages("AAAA"))
+    assert base == make_cache_key("gpt-4o-mini", _messages("AAAA"))
+    assert base != make_cache_key("gpt-4o-mini", _messages("BBBB"))
+    assert base != make_cache_key("gpt-4o", _messages("AAAA"))
+
+
+def test_cached_chat_completion_serves_repeat_calls(tmp_path, monkeypatch):
+    cache = LLMCache(SQLiteLLMCacheBackend(str(tmp_path / "llm.sqlite3"), max_entries=10), ttl=60)
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: cache)
+    client = _FakeClient('{"document_type": "court_order"}')
+
+    first = cached_chat_completion(client, model="m", messages=_messages("AAAA"))
+    second = cached_chat_completion(client, model="m", messages=_messages("AAAA"))
+    assert first == second
+    assert client.calls == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_hits_do_not_write_to_the_backend(tmp_path):
+    backend = SQLiteLLMCacheBackend(str(tmp_path / "llm.sqlite3"), max_entries=10)
+    cache = LLMCache(backend, ttl=60)
+    cache.set("k", "{}")
+    with backend._connect() as conn:
+        conn.execute("UPDATE llm_cache SET last_access = 1000 WHERE key = 'k'")
+    backend.touch_interval = float("inf")
+    writes = []
+    backend.incr = lambda name, amount=1: writes.append((name, amount))
+
+    for _ in range(5):
+        assert cache.get("k") == "{}"
+    assert cache.get("missing") is None
+    # Within the touch interval hits leave last_access alone; counters stay in process until flushed
+    with backend._connect() as conn:
+        assert conn.execute("SELECT last_access FROM llm_cache WHERE key = 'k'").fetchone()[0] == 1000
+    assert writes == []
+    cache.flush()
+    assert sorted(writes) == [("hits", 5), ("misses", 1)]
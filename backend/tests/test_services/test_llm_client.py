@@ -0,0 +1,60 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.agents.parsers.base_parser import BaseParser
+from app.core.config import settings
+from app.services import llm_client
+
+
+class _StubOpenAI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    peers = []
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.peers.append(self.client_address)
+        body = json.dumps(
+            {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "stub",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": '{"dates": [], "obligations": []}'},
+                    }
+                ],
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_parsers_share_one_keep_alive_client(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setattr(settings, "LLM_CACHE_BACKEND", "none")
+    llm_client.reset_openai_client()
+    try:
+        parser = BaseParser()
+        assert parser._llm_json("system", [{"type": "text", "text": "a"}]) == {"dates": [], "obligations": []}
+        assert parser._llm_json("system", [{"type": "text", "text": "b"}]) == {"dates": [], "obligations": []}
+        assert llm_client.get_openai_client() is llm_client.get_openai_client()
+        # Both requests travelled over the same pooled connection
+        assert len(_StubOpenAI.peers) == 2
+        assert _StubOpenAI.peers[0] == _StubOpenAI.peers[1]
+    finally:
+        llm_client.reset_openai_client()
+        server.shutdown()
@@ -0,0 +1,111 @@
+from sqlalchemy import create_engine, inspect, text
+
+from app.models.database import Base
+from app.models.migrations import upgrade_schema
+
+# documents as created before batch uploads and content hashing
+LEGACY_DOCUMENTS = """
+CREATE TABLE documents (
+    id VARCHAR PRIMARY KEY,
+    filename VARCHAR NOT NULL,
+    path VARCHAR NOT NULL,
+    case_id VARCHAR,
+    status VARCHAR,
+    error_messages JSON,
+    classification JSON,
+    extracted_dates JSON,
+    obligations JSON,
+    human_review_required BOOLEAN,
+    created_at DATETIME,
+    updated_at DATETIME
+)
+"""
+
+
+def _legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_DOCUMENTS))
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def test_upgrade_adds_upload_columns_and_is_idempotent(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+
+    inspector = inspect(engine)
+    columns = {c["name"] for c in inspector.get_columns("documents")}
+    assert {"batch_id", "content_sha256", "size_bytes", "mime_type", "timings"} <= columns
+    indexes = {ix["name"] for ix in inspector.get_indexes("documents")}
+    assert {"ix_documents_batch_id", "ix_documents_content_sha256"} <= indexes
+    engine.dispose()
+
+
+def test_upgrade_backfills_summary_columns_for_legacy_rows(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO documents (id, filename, path, status, classification, extracted_dates, obligations) "
+                "VALUES ('doc-1', 'a.pdf', '/a.pdf', 'completed', :c, :d, :o), "
+                "('doc-2', 'b.pdf', '/b.pdf', 'queued', NULL, NULL, NULL)"
+            ),
+            {
+                "c": '{"document_type": "court_order", "confidence_score": 0.9, "source": "llm"}',
+                "d": '[{"date": "2025-03-04"}, {"date": "2025-04-01"}]',
+                "o": '[{"description": "File motion"}]',
+            },
+        )
+    upgrade_schema(engine)
+
+    inspector = inspect(engine)
+    indexes = {ix["name"] for ix in inspector.get_indexes("documents")}
+    assert {"ix_documents_created_id", "ix_documents_case_created_id"} <= indexes
+    with engine.connect() as conn:
+        rows = {
+            r.id: r
+            for r in conn.execute(
+                text(
+                    "SELECT id, document_type, confidence_score, date_count, obligation_count, classification_source "
+                    "FROM documents"
+                )
+            )
+        }
+    assert tuple(rows["doc-1"][1:]) == ("court_order", 0.9, 2, 1, "llm")
+    assert tuple(rows["doc-2"][1:]) == (None, None, 0, 0, None)
+    engine.dispose()
+
+
+def test_upgrade_adds_calendar_window_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE calendar_events (id VARCHAR PRIMARY KEY, case_id VARCHAR NOT NULL, title VARCHAR NOT NULL, "
+                "description VARCHAR, start DATETIME NOT NULL, \"end\" DATETIME NOT NULL, all_day BOOLEAN, "
+                "source_document VARCHAR)"
+            )
+        )
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    assert "ix_calendar_events_case_start" in {ix["name"] for ix in inspect(engine).get_indexes("calendar_events")}
+    engine.dispose()
+
+
+def test_concurrent_upgrades_do_not_race_on_ddl(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    _legacy_engine(tmp_path).dispose()
+    # Separate engines stand in for API and worker processes starting together
+    engines = [create_engine(f"sqlite:///{tmp_path / 'legacy.db'}") for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=len(engines)) as pool:
+        for future in [pool.submit(upgrade_schema, e) for e in engines]:
+            future.result()
+
+    columns = {c["name"] for c in inspect(engines[0]).get_columns("documents")}
+    assert {"batch_id", "classification_source", "timings"} <= columns
+    for e in engines:
+        e.dispose()
@@ -0,0 +1,58 @@
+from PyPDF2 import PageObject, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from app.services.pdf_text import iter_pdf_pages, join_pages, page_for_offset
+
+
+def _write_pdf(path, page_texts):
+    writer = PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    for text in page_texts:
+        page = PageObject.create_blank_page(width=612, height=792)
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1"))
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        writer.add_page(page)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_iter_pdf_pages_keeps_order_with_process_pool(tmp_path):
+    path = tmp_path / "records.pdf"
+    _write_pdf(str(path), [f"Visit note page {i}" for i in range(1, 8)])
+
+    sequential = list(iter_pdf_pages(str(path), workers=1))
+    parallel = list(iter_pdf_pages(str(path), workers=3, pages_per_chunk=2))
+    assert [p.page_number for p in parallel] == list(range(1, 8))
+    assert [p.text for p in parallel] == [p.text for p in sequential]
+    assert "page 5" in parallel[4].text
+
+    text, offsets = join_pages(parallel)
+    assert page_for_offset(offsets, text.index("page 5")) == 5
+
+
+def test_ocr_runs_only_for_pages_without_text_layer(tmp_path, monkeypatch):
+    from app.services import pdf_text
+
+    path = tmp_path / "packet.pdf"
+    _write_pdf(str(path), ["Scheduling order hearing on March 3, 2026", "", "Deposition notice for May 1, 2026"])
+    ocr_calls = []
+
+    def fake_ocr(p, page_number, dpi):
+        ocr_calls.append(page_number)
+        return f"scanned page {page_number}"
+
+    monkeypatch.setattr(pdf_text, "_ocr_pdf_page", fake_ocr)
+    pages = list(pdf_text.iter_pdf_pages_with_ocr(str(path), dpi=150, workers=2))
+    assert ocr_calls == [2]
+    assert [p.ocr for p in pages] == [False, True, False]
+    assert pages[1].text == "scanned page 2"
@@ -0,0 +1,46 @@
+import base64
+import io
+
+from PIL import Image
+
+from app.services.previews import PagePreview, as_data_urls, encode_preview
+
+
+def _decode(data_url):
+    header, b64 = data_url.split(",", 1)
+    return header, Image.open(io.BytesIO(base64.b64decode(b64)))
+
+
+def test_encode_preview_downscales_into_box_and_encodes_once():
+    page = Image.new("RGBA", (2550, 3300), "white")  # letter page at 300 dpi
+    preview = encode_preview(page, 1, max_dimension=1000, fmt="jpeg", quality=60)
+
+    header, img = _decode(preview.data_url)
+    assert header == "data:image/jpeg;base64"
+    assert max(img.size) == 1000 and (preview.width, preview.height) == img.size
+    assert page.size == (2550, 3300)  # caller's image untouched
+
+
+def test_encode_preview_webp_keeps_small_images():
+    preview = encode_preview(Image.new("RGB", (300, 200), "white"), 2, max_dimension=1024, fmt="webp")
+    header, img = _decode(preview.data_url)
+    assert header == "data:image/webp;base64" and img.size == (300, 200)
+
+
+def test_as_data_urls_accepts_previews_urls_and_paths(tmp_path):
+    path = tmp_path / "page.png"
+    Image.new("RGB", (10, 10)).save(path)
+    preview = PagePreview(page_number=1, width=1, height=1, data_url="data:image/jpeg;base64,AAAA")
+
+    urls = as_data_urls([preview, "data:image/webp;base64,BBBB", str(path)], max_images=3)
+    assert urls[:2] == ["data:image/jpeg;base64,AAAA", "data:image/webp;base64,BBBB"]
+    assert urls[2].startswith("data:image/png;base64,")
+    assert as_data_urls([str(tmp_path / "missing.png")]) == []
+
+
+def test_as_data_urls_defaults_to_preview_max_pages(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "PREVIEW_MAX_PAGES", 3)
+    urls = [f"data:image/jpeg;base64,{i}" for i in range(5)]
+    assert as_data_urls(urls) == urls[:3]
@@ -0,0 +1,41 @@
+from app.services.pdf_text import PAGE_BREAK
+from app.services.text_window import estimate_tokens, select_window, split_chunks
+
+
+def _document():
+    filler = "The parties discussed general background matters at length. " * 30
+    pages = [
+        "SUPERIOR COURT OF CALIFORNIA\nSmith v. Jones, Case No. 12-345\n" + filler,
+        filler,
+        filler + "\n\nSCHEDULING ORDER\nThe hearing is set for March 3, 2025. Oppositions are due 02/10/2025 "
+        "and the deposition must be completed on or before April 1, 2025.\n" + filler,
+        filler,
+    ]
+    return ("\n" + PAGE_BREAK).join(pages)
+
+
+def test_short_text_is_returned_whole():
+    window = select_window("Hearing on March 3, 2025.", max_tokens=100)
+    assert window.render() == "Hearing on March 3, 2025." and not window.truncated
+
+
+def test_chunks_never_cross_page_breaks():
+    text = _document()
+    for chunk in split_chunks(text, 500):
+        # a chunk may end with the page break but never contain one
+        assert PAGE_BREAK not in chunk.text[:-1]
+        assert chunk.text == text[chunk.start:chunk.end]
+
+
+def test_window_keeps_caption_and_deadline_page_within_budget():
+    text = _document()
+    window = select_window(text, max_tokens=700, chunk_chars=800)
+    rendered = window.render()
+
+    assert window.truncated
+    assert estimate_tokens(rendered) <= 700 + 40
+    assert "SUPERIOR COURT OF CALIFORNIA" in rendered
+    assert "hearing is set for March 3, 2025" in rendered
+    pages = [c.page for c in window.chunks]
+    assert pages == sorted(pages) and 3 in pages
+    assert "[page 3, chars " in rendered
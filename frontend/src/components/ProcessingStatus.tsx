@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react'
 import { Alert, CircularProgress, Stack, Typography } from '@mui/material'
-import { getStatus, getResult } from '../services/api'
+import { getStatus, getResult, subscribeStatus } from '../services/api'
 import type { ProcessingResult } from '../services/types'
 
 interface Props {
@@ -8,28 +8,54 @@ interface Props {
   onComplete?: (result: ProcessingResult) => void
 }
 
+const TERMINAL = ['completed', 'needs_review', 'failed']
+
 export default function ProcessingStatus({ documentId, onComplete }: Props) {
   const [status, setStatus] = useState<string>('queued')
+  const [stage, setStage] = useState<string | null>(null)
   const [error, setError] = useState<string | null>(null)
 
   useEffect(() => {
     let mounted = true
-    const timer = setInterval(async () => {
-      try {
-        const s = await getStatus(documentId)
-        if (!mounted) return
-        setStatus(s.status)
-        if (['completed', 'needs_review', 'failed'].includes(s.status)) {
-          clearInterval(timer)
-          const result = await getResult(documentId)
-          onComplete && onComplete(result)
+    let finished = false
+    let timer: ReturnType<typeof setInterval> | undefined
+
+    const finish = async () => {
+      finished = true
+      closeStream()
+      if (timer) clearInterval(timer)
+      const result = await getResult(documentId)
+      onComplete && onComplete(result)
+    }
+
+    // Fallback when the event stream is unavailable: poll the status endpoint
+    const poll = () => {
+      timer = setInterval(async () => {
+        try {
+          const s = await getStatus(documentId)
+          if (!mounted) return
+          setStatus(s.status)
+          if (TERMINAL.includes(s.status)) await finish()
+        } catch (e: any) {
+          if (!mounted) return
+          setError(e?.response?.data?.detail || 'Error checking status')
         }
-      } catch (e: any) {
-        if (!mounted) return
-        setError(e?.response?.data?.detail || 'Error checking status')
-      }
-    }, 2000)
-    return () => { mounted = false; clearInterval(timer) }
+      }, 2000)
+    }
+
+    const closeStream = subscribeStatus(
+      `/documents/${documentId}/events`,
+      async (event) => {
+        if (!mounted || finished || !event.status) return
+        setStatus(event.status)
+        setStage(event.stage || null)
+        if (TERMINAL.includes(event.status)) await finish()
+      },
+      () => {
+        if (mounted && !finished) poll()
+      },
+    )
+    return () => { mounted = false; closeStream(); if (timer) clearInterval(timer) }
   }, [documentId, onComplete])
 
   if (error) return <Alert severity="error">{error}</Alert>
@@ -37,7 +63,7 @@ export default function ProcessingStatus({ documentId, onComplete }: Props) {
   return (
     <Stack direction="row" spacing={2} alignItems="center">
       <CircularProgress size={20} />
-      <Typography>Processing status: {status}</Typography>
+      <Typography>Processing status: {status}{stage ? ` (${stage})` : ''}</Typography>
     </Stack>
   )
 }
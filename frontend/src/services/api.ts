@@ -1,5 +1,16 @@
 import axios from 'axios'
-import type { ProcessingResult, CalendarEventOut, CalendarEventCreate, DocumentListItem } from './types'
+import type {
+  ProcessingResult,
+  CalendarEventOut,
+  CalendarEventCreate,
+  DocumentListItem,
+  DocumentSummaryItem,
+  DocumentSummaryPage,
+  BatchUploadResult,
+  BatchStatus,
+  BulkDocumentsRequest,
+  BulkDocumentsResponse,
+} from './types'
 
 const baseURL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api/v1'
 export const api = axios.create({ baseURL })
@@ -14,11 +25,56 @@ export async function uploadDocument(file: File, caseId?: string): Promise<Proce
   return data
 }
 
+export async function uploadBatch(files: File[], caseId?: string): Promise<BatchUploadResult> {
+  const form = new FormData()
+  files.forEach((f) => form.append('files', f))
+  if (caseId) form.append('case_id', caseId)
+  const { data } = await api.post<BatchUploadResult>('/documents/batch', form, {
+    headers: { 'Content-Type': 'multipart/form-data' },
+  })
+  return data
+}
+
+export async function getBatchStatus(batchId: string): Promise<BatchStatus> {
+  const { data } = await api.get<BatchStatus>(`/batches/${batchId}`)
+  return data
+}
+
 export async function getStatus(documentId: string): Promise<{ document_id: string; status: string }> {
   const { data } = await api.get(`/documents/${documentId}/status`)
   return data
 }
 
+export interface StatusEvent {
+  document_id?: string
+  status?: string
+  stage?: string | null
+  [key: string]: unknown
+}
+
+// Server-sent status events ('snapshot' first, then 'status' per stage transition).
+// Returns a function that closes the stream.
+export function subscribeStatus(
+  path: string,
+  onEvent: (event: StatusEvent) => void,
+  onError?: () => void,
+): () => void {
+  const source = new EventSource(`${baseURL}${path}`)
+  const handle = (e: MessageEvent) => onEvent(JSON.parse(e.data))
+  source.addEventListener('snapshot', handle as EventListener)
+  source.addEventListener('status', handle as EventListener)
+  source.onerror = () => {
+    source.close()
+    onError && onError()
+  }
+  return () => source.close()
+}
+
+export async function getDocumentsBulk(req: BulkDocumentsRequest): Promise<BulkDocumentsResponse> {
+  const { data } = await api.post<BulkDocumentsResponse>('/documents/bulk', req)
+  return data
+}
+
 export async function getResult(documentId: string): Promise<ProcessingResult> {
   const { data } = await api.get<ProcessingResult>(`/documents/${documentId}/result`)
   return data
@@ -34,7 +90,12 @@ export async function createCalendarEvent(caseId: string, payload: CalendarEvent
   return data
 }
 
-export async function listDocuments(params?: { case_id?: string; limit?: number; offset?: number }): Promise<DocumentListItem[]> {
+export async function listDocuments(params?: { case_id?: string; limit?: number; offset?: number; cursor?: string }): Promise<DocumentListItem[]> {
   const { data } = await api.get<DocumentListItem[]>(`/documents`, { params })
   return data
 }
+
+export async function listDocumentSummaries(params?: { case_id?: string; limit?: number; cursor?: string }): Promise<DocumentSummaryPage> {
+  const { data, headers } = await api.get<DocumentSummaryItem[]>(`/documents`, { params: { ...params, view: 'summary' } })
+  return { items: data, nextCursor: headers['x-next-cursor'] || undefined }
+}
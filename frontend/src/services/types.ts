@@ -4,6 +4,7 @@ export interface ExtractedDate {
   confidence_score: number
   source_text: string
   jurisdiction?: string | null
+  source_ref?: string | null
 }
 
 export interface LegalObligation {
@@ -13,6 +14,7 @@ export interface LegalObligation {
   priority_level: string
   associated_case: string
   source_document: string
+  source_ref?: string | null
 }
 
 export interface DocumentClassification {
@@ -65,3 +67,49 @@ export interface DocumentListItem {
   human_review_required: boolean
   error_messages: string[]
 }
+
+export interface DocumentSummaryItem {
+  document_id: string
+  filename: string
+  case_id?: string | null
+  created_at: string
+  processing_status: string
+  document_type?: string | null
+  confidence_score?: number | null
+  date_count: number
+  obligation_count: number
+  human_review_required: boolean
+}
+
+export interface DocumentSummaryPage {
+  items: DocumentSummaryItem[]
+  nextCursor?: string
+}
+
+export interface BulkDocumentsRequest {
+  document_ids?: string[]
+  case_id?: string
+  fields?: string[]
+}
+
+export interface BulkDocumentsResponse {
+  items: Array<{ document_id: string } & Partial<ProcessingResult> & Record<string, unknown>>
+  missing: string[]
+}
+
+export interface BatchUploadResult {
+  batch_id: string
+  case_id?: string | null
+  document_ids: string[]
+  total: number
+  processing_status: string
+}
+
+export interface BatchStatus {
+  batch_id: string
+  case_id?: string | null
+  total: number
+  status_counts: Record<string, number>
+  finished: number
+  done: boolean
+}